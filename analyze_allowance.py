@@ -3,14 +3,10 @@
 Break down what's in the "allowance" category
 """
 
-import re
+from plan_parser import load_plan
 
-# Read plan.ts
-with open('cashflow-app/src/data/plan.ts', 'r') as f:
-    content = f.read()
-
-# Extract transactions with allowance category
-matches = re.findall(r'{ id: ("txn-\d+"), date: ("[\d-]+"), label: (".*?"), amount: ([\d.]+), type: ("(?:income|outflow|transfer)"), category: "allowance", notes: (".*?")(, linkedRuleId: )?', content)
+# Allowance transactions from plan.ts
+allowance = [t for t in load_plan().transactions if t.category == 'allowance']
 
 print("ALLOWANCE TRANSACTIONS BREAKDOWN")
 print("=" * 80)
@@ -20,17 +16,16 @@ print()
 by_type = {}
 total = 0
 
-for match in matches:
-    txn_id, date, label, amount, txn_type, notes, _ = match
-    amount = float(amount)
-    notes_str = notes.strip('"')
+for txn in allowance:
+    amount = float(txn.amount)
+    notes_str = txn.notes or ''
     
     if notes_str not in by_type:
         by_type[notes_str] = {'count': 0, 'total': 0, 'examples': []}
     
     by_type[notes_str]['count'] += 1
     by_type[notes_str]['total'] += amount
-    by_type[notes_str]['examples'].append(f"{date.strip('"')} - {label.strip('"')}: £{amount:.2f}")
+    by_type[notes_str]['examples'].append(f"{txn.date} - {txn.label}: £{amount:.2f}")
     
     total += amount
 
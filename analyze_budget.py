@@ -1,15 +1,15 @@
-import openpyxl
 import json
 
+from workbook_cache import load_snapshot
+
 excel_file = "FINAL_2026_Cashflow_System_AppleStyle_v3_Start22Dec2025 - Copy (2).xlsx"
-wb = openpyxl.load_workbook(excel_file, data_only=True)
+snap = load_snapshot(excel_file)
 
 print("="*100)
 print("PERIOD 1 BUDGET ANALYSIS FROM EXCEL")
 print("="*100)
 
 # Read Budget by Period - Period 1 (columns 2-4: Budget, Actuals, Variance)
-ws = wb['Budget by Period']
 
 print("\nBudget by Period Tab - Period 1 Breakdown:")
 print("=" * 100)
@@ -17,7 +17,7 @@ print("=" * 100)
 budget_data = {}
 
 # Read all rows
-for i, row in enumerate(ws.iter_rows(min_row=1, max_row=30, values_only=True), 1):
+for i, row in enumerate(snap.sheet_rows('Budget by Period')[:30], 1):
     if i == 1:  # Header
         print(f"Header: Items={row[1]}, Budget={row[3]}, Actuals={row[4]}, Variance={row[5]}")
         continue
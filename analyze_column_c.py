@@ -1,19 +1,23 @@
-import openpyxl
 import json
 from collections import defaultdict
-from datetime import datetime
+from datetime import date
 
-# Load Excel file with data_only=True to get calculated values
-wb_formulas = openpyxl.load_workbook('FINAL_2026_Cashflow_System_AppleStyle_v3_Start22Dec2025 - Copy.xlsx')
-wb_values = openpyxl.load_workbook('FINAL_2026_Cashflow_System_AppleStyle_v3_Start22Dec2025 - Copy.xlsx', data_only=True)
+from category_mapping import load_category_mapping
+from periods import PeriodIndex, build_periods_2026
+from workbook_cache import load_snapshot
+from workbook_reader import COL_DATE, COL_PERIOD, in_range
+from xlsx_stream import XlsxReader
 
-txn_sheet_formulas = wb_formulas['Transactions']
-txn_sheet_values = wb_values['Transactions']
+WORKBOOK = 'FINAL_2026_Cashflow_System_AppleStyle_v3_Start22Dec2025 - Copy.xlsx'
+
+# One cached parse serves both the header and the calculated values
+snap = load_snapshot(WORKBOOK)
+records = list(snap.iter_transactions())
 
 print("Excel Column Structure:")
 print("="*100)
 for col_num in range(1, 10):
-    cell_val = txn_sheet_formulas.cell(1, col_num).value
+    cell_val = snap.transactions_header[col_num - 1] if col_num <= len(snap.transactions_header) else None
     col_letter = chr(64 + col_num)
     print(f"Column {col_letter}: {cell_val}")
 
@@ -24,9 +28,11 @@ print("="*100)
 # Find date range for Period 1
 min_date = None
 max_date = None
-for row_num in range(2, min(50, txn_sheet_values.max_row)):
-    date_val = txn_sheet_values[f'A{row_num}'].value
-    if date_val and isinstance(date_val, datetime):
+for rec in records:
+    if rec.row >= 50:
+        break
+    date_val = rec.date
+    if date_val:
         if min_date is None or date_val < min_date:
             min_date = date_val
         if max_date is None or date_val > max_date:
@@ -40,32 +46,31 @@ print("\n" + "="*100)
 print("Period 1 Transactions (by Column C Category):")
 print("="*100)
 
-period1_start = datetime(2025, 12, 22)
-period1_end = datetime(2026, 1, 25)
+period1_start = date(2025, 12, 22)
+period1_end = date(2026, 1, 25)
 
 category_counts = defaultdict(int)
 category_samples = defaultdict(list)
 all_period1_txns = []
 
-for row_num in range(2, txn_sheet_values.max_row + 1):
-    date_val = txn_sheet_values[f'A{row_num}'].value
-    col_c_category = txn_sheet_values[f'C{row_num}'].value  # Column C = Category
-    col_d_description = txn_sheet_values[f'D{row_num}'].value  # Column D = Description
-    col_e_amount = txn_sheet_values[f'E{row_num}'].value  # Column E = Amount
+for rec in records:
+    date_val = rec.date
+    col_c_category = rec.category  # Column C = Category
+    col_d_description = rec.description  # Column D = Description
+    col_e_amount = rec.amount  # Column E = Amount
     
     # Check if date is in Period 1
-    if date_val and isinstance(date_val, datetime):
-        if period1_start <= date_val <= period1_end:
-            category_counts[col_c_category] += 1
-            all_period1_txns.append({
-                'date': date_val,
-                'category': col_c_category,
-                'description': col_d_description,
-                'amount': col_e_amount
-            })
-            
-            if len(category_samples[col_c_category]) < 2:
-                category_samples[col_c_category].append((col_d_description, col_e_amount))
+    if in_range(rec, period1_start, period1_end):
+        category_counts[col_c_category] += 1
+        all_period1_txns.append({
+            'date': date_val,
+            'category': col_c_category,
+            'description': col_d_description,
+            'amount': col_e_amount
+        })
+        
+        if len(category_samples[col_c_category]) < 2:
+            category_samples[col_c_category].append((col_d_description, col_e_amount))
 
 print("\nTransaction count by Column C Category:")
 for cat in sorted(category_counts.keys()):
@@ -81,35 +86,39 @@ print("="*100)
 # Show the mapping: Column C category -> App category
 print("\nColumn C Category Mapping to App Categories:")
 print("="*100)
-mapping = {
-    'Income - FM': 'income',
-    'Income - McD': 'income',
-    'Income - Outlier': 'income',
-    'Income - Gifts': 'income',
-    'House Keep': 'bill',
-    'Electricity & Gas': 'bill',
-    'Water Bill': 'bill',
-    'Rent': 'bill',
-    'Insurance': 'bill',
-    'Road Tax': 'bill',
-    'Internet': 'bill',
-    'iPhone Payments': 'bill',
-    'Parents': 'bill',
-    'Credit Card Payment': 'bill',
-    'Fuel': 'bill',
-    'Laptop': 'bill',
-    'One-Off Giving (Christmas)': 'bill',
-    'Tithe': 'giving',
-    'Offerings': 'giving',
-    'Charity - Perez Uni': 'giving',
-    'Charity - JPC Utilities': 'giving',
-    'Donations (Variable)': 'giving',
-    'Others': 'allowance',
-    'Uber - TfL': 'allowance',
-    'Food': 'bill',
-    'Savings Transfer': 'savings',
-}
+mapping = load_category_mapping(WORKBOOK)
 
 for col_c_cat in sorted(category_counts.keys()):
     app_cat = mapping.get(col_c_cat, '???')
     print(f"{col_c_cat:30s} -> {app_cat}")
+
+# Column I: the period formula next to its cached value, from one parse
+print("\n" + "="*100)
+print("Column I (Period) formula vs cached value:")
+print("="*100)
+
+index = PeriodIndex(build_periods_2026())
+with_formula = no_cache = mismatched = 0
+samples = []
+with XlsxReader(WORKBOOK) as xl:
+    for row_num, cells in xl.iter_cells('Transactions', [COL_DATE, COL_PERIOD], min_row=2, formulas=True):
+        date_cell = cells.get(COL_DATE)
+        period_cell = cells.get(COL_PERIOD)
+        if period_cell is None or period_cell.formula is None:
+            continue
+        with_formula += 1
+        txn_date = date_cell.value.date() if date_cell and hasattr(date_cell.value, 'date') else None
+        expected = index.period_id(txn_date) if txn_date else None
+        cached = period_cell.value if isinstance(period_cell.value, (int, float)) else None
+        if cached is None and expected is not None:
+            no_cache += 1
+        elif cached is not None and int(cached) != (expected or 0):
+            mismatched += 1
+        if len(samples) < 3 and expected is not None:
+            samples.append((row_num, period_cell.formula, period_cell.value, expected))
+
+print(f"Rows with a Period formula: {with_formula}")
+print(f"Rows in a period with no cached value (stale cache): {no_cache}")
+print(f"Cached period differs from the date's period: {mismatched}")
+for row_num, formula, cached, expected in samples:
+    print(f"  I{row_num}: {formula}  cached={cached!r}  expected={expected}")
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Differential benchmark: Python variance vs the TS cashflow engine.
+
+getVarianceByCategory, getTotalVariance and getSavingsTransferReconciliation
+in cashflow-app/src/lib/cashflowEngine.ts and their Python counterparts
+(cashflow_engine.category_variance / savings_reconciliation,
+variance.total_variance) compute the same totals independently. This
+generates synthetic plans of increasing size, runs both sides on each
+(the TS engine in a local node process) and diffs every period's results
+per category:
+
+- budgeted/actual/variance must agree within half a penny (TS sums floats,
+  Python sums pence)
+- variancePercent within what half a penny of variance can move it
+- status exactly, except where the variance is exactly £5 and the float
+  sum may land on either side of the threshold ('boundary')
+
+It also times both sides per size, from a parsed plan to all periods'
+results. --json records a run; --baseline compares against a recorded run
+and exits non-zero when results disagree or either side got slower than
+--tolerance allows.
+
+The TS engine is loaded by node_ts. When TypeScript is unavailable
+(node_ts.NO_TS_EXIT), or without node, only the Python side runs; any
+other failure of the TS side fails the run.
+
+Usage:
+    python bench_variance.py [--sizes 10,1000,100000,1000000] [--seed 0]
+    python bench_variance.py --json bench.json
+    python bench_variance.py --baseline bench.json [--tolerance 0.25]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from cashflow_engine import category_variance, savings_reconciliation
+from node_ts import APP_DIR, LIB_DIR, run_driver, write_driver
+from periods import build_periods_2026
+from transaction_table import TransactionTable
+from variance import total_variance
+
+ENGINE_TS = os.path.join(LIB_DIR, 'cashflowEngine.ts')
+DEFAULT_SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+AMOUNT_TOL = 0.005   # half a penny
+STATUS_THRESHOLD = 5.0
+MIN_TIMED = 0.05     # seconds; shorter timings are too noisy to hold against a baseline
+
+# Writes {seconds, results} for every period of a JSON plan
+DRIVER = r"""
+(async () => {
+  const [enginePath, appDir, planPath, outPath] = process.argv.slice(2);
+  const engine = await loadModule(enginePath, appDir);
+  const plan = JSON.parse(fs.readFileSync(planPath, 'utf8'));
+  const started = process.hrtime.bigint();
+  const results = {};
+  for (const p of plan.periods) {
+    results[p.id] = {
+      variance: engine.getVarianceByCategory(plan, p.id),
+      total: engine.getTotalVariance(plan, p.id),
+      savings: engine.getSavingsTransferReconciliation(plan, p.id),
+    };
+  }
+  const seconds = Number(process.hrtime.bigint() - started) / 1e9;
+  fs.writeFileSync(outPath, JSON.stringify({ seconds, results }));
+})();
+"""
+
+
+# -- plans --------------------------------------------------------------------------
+
+CATEGORIES = np.array(['bill', 'giving', 'savings', 'allowance', 'buffer', 'other', 'Groceries', 'Transport'])
+TYPES = np.array(['outflow', 'income', 'transfer'])
+
+
+def synthetic_plan(n_transactions: int, seed: int = 0) -> dict:
+    """A 13-period plan with a typical rule set and n random transactions.
+
+    About 2% of transactions fall just outside the periods; amounts are
+    whole pence.
+    """
+    rng = np.random.default_rng(seed)
+    periods = build_periods_2026()
+    first = np.datetime64(periods[0].start, 'D') - 7
+    span = int((np.datetime64(periods[-1].end, 'D') + 7 - first).astype(int)) + 1
+
+    types = TYPES[rng.choice(3, n_transactions, p=[0.85, 0.08, 0.07])]
+    categories = CATEGORIES[rng.integers(0, len(CATEGORIES), n_transactions)]
+    categories[types == 'income'] = 'income'
+    categories[(types == 'transfer') & (rng.random(n_transactions) < 0.8)] = 'savings'
+    pence = np.maximum(1, rng.lognormal(7.5, 1.2, n_transactions).astype(np.int64))
+    dates = np.datetime_as_string(first + rng.integers(0, span, n_transactions), unit='D')
+    transactions = [
+        {'id': f'txn-{i}', 'date': d, 'label': f'Synthetic {c}', 'amount': p / 100, 'type': t, 'category': c}
+        for i, (d, p, t, c) in enumerate(zip(dates.tolist(), pence.tolist(), types.tolist(), categories.tolist()))
+    ]
+
+    return {
+        'version': 2,
+        'setup': {'selectedPeriodId': 1, 'asOfDate': '2026-01-15', 'windowDays': 30, 'startingBalance': 2500,
+                  'rollForwardBalance': True, 'expectedMinBalance': 500, 'variableCap': 400},
+        'periods': [{'id': p.id, 'label': p.label, 'start': p.start.isoformat(), 'end': p.end.isoformat()}
+                    for p in periods],
+        'incomeRules': [
+            {'id': 'salary', 'label': 'Salary', 'amount': 2800, 'cadence': 'monthly', 'seedDate': '2026-01-01',
+             'enabled': True},
+            {'id': 'freelance', 'label': 'Freelance', 'amount': 450.5, 'cadence': 'biweekly',
+             'seedDate': '2025-11-03', 'enabled': True},
+        ],
+        'outflowRules': [
+            {'id': 'groceries', 'label': 'Groceries', 'amount': 61.37, 'cadence': 'weekly',
+             'seedDate': '2025-12-22', 'category': 'allowance', 'enabled': True},
+            {'id': 'savings', 'label': 'Savings transfer', 'amount': 250, 'cadence': 'monthly',
+             'seedDate': '2025-12-29', 'category': 'savings', 'enabled': True},
+            {'id': 'insurance', 'label': 'Insurance', 'amount': 189.99, 'cadence': 'quarterly',
+             'seedDate': '2025-08-31', 'category': 'bill', 'enabled': True},
+        ],
+        'periodRuleOverrides': [],
+        'bills': [
+            {'id': f'bill-{i}', 'label': label, 'amount': amount, 'dueDay': day, 'category': 'bill', 'enabled': True}
+            for i, (label, amount, day) in enumerate([('Rent', 950, 1), ('Council Tax', 145, 5),
+                                                      ('Energy', 85.4, 12), ('Internet', 35, 15),
+                                                      ('Phone', 25, 18), ('Streaming', 12.99, 31)])
+        ],
+        'periodOverrides': [],
+        'eventOverrides': [],
+        'overrides': [
+            {'id': 'gift', 'date': '2026-03-14', 'label': 'Gift', 'amount': 120, 'type': 'outflow',
+             'category': 'giving'},
+        ],
+        'transactions': transactions,
+    }
+
+
+# -- the two sides ------------------------------------------------------------------
+
+def run_python(plan: dict) -> Tuple[dict, float]:
+    started = time.perf_counter()
+    table = TransactionTable.from_records(plan['transactions'])
+    by_category = category_variance(plan, table=table)
+    savings = savings_reconciliation(plan, table=table)
+    results = {pid: {'variance': v, 'total': total_variance(v), 'savings': savings[pid]}
+               for pid, v in by_category.items()}
+    return results, time.perf_counter() - started
+
+
+def run_ts(plan_path: str, node: str, engine: str, app_dir: str, workdir: str) -> Tuple[Optional[dict], float, str]:
+    """(results, seconds, '') from the TS engine, or (None, 0, reason) when TypeScript is unavailable.
+
+    Any other failure raises RuntimeError (node_ts.run_driver).
+    """
+    driver = write_driver(workdir, 'bench_variance', DRIVER)
+    out_path = os.path.join(workdir, 'ts_results.json')
+    ok, reason = run_driver(node, driver, [engine, app_dir, plan_path, out_path])
+    if not ok:
+        return None, 0.0, reason
+    with open(out_path) as f:
+        out = json.load(f)
+    return {int(k): v for k, v in out['results'].items()}, out['seconds'], ''
+
+
+# -- comparison --------------------------------------------------------------------
+
+def _compare_summary(where: str, py: dict, ts: dict, problems: List[str], boundary: List[str]) -> None:
+    for key in ('budgeted', 'actual', 'variance'):
+        if abs(py[key] - ts[key]) >= AMOUNT_TOL:
+            problems.append(f'{where}: {key} {py[key]!r} (python) != {ts[key]!r} (ts)')
+    percent_tol = 100 * AMOUNT_TOL / max(abs(ts['budgeted']), 0.01)
+    if abs(py['variancePercent'] - ts['variancePercent']) > percent_tol:
+        problems.append(f"{where}: variancePercent {py['variancePercent']!r} != {ts['variancePercent']!r}")
+    if 'status' in py and py['status'] != ts['status']:
+        if abs(abs(py['variance']) - STATUS_THRESHOLD) < AMOUNT_TOL:
+            boundary.append(where)
+        else:
+            problems.append(f"{where}: status {py['status']} != {ts['status']}")
+
+
+def compare(py: Dict[int, dict], ts: Dict[int, dict]) -> Tuple[List[str], List[str]]:
+    """(mismatches, boundary cases) between the two sides' per-period results."""
+    problems, boundary = [], []
+    for pid in sorted(set(py) | set(ts)):
+        if pid not in py or pid not in ts:
+            problems.append(f'P{pid}: only in {"python" if pid in py else "ts"}')
+            continue
+        p, t = py[pid], ts[pid]
+        for cat in sorted(set(p['variance']) | set(t['variance'])):
+            if cat not in p['variance'] or cat not in t['variance']:
+                problems.append(f'P{pid} {cat}: only in {"python" if cat in p["variance"] else "ts"}')
+                continue
+            _compare_summary(f'P{pid} {cat}', p['variance'][cat], t['variance'][cat], problems, boundary)
+        _compare_summary(f'P{pid} total', p['total'], t['total'], problems, boundary)
+        _compare_summary(f'P{pid} savings', p['savings'], t['savings'], problems, boundary)
+    return problems, boundary
+
+
+# -- runs ----------------------------------------------------------------------------
+
+def _rate(n: int, seconds: Optional[float]) -> str:
+    return f'{n / seconds:>12,.0f}' if seconds else f"{'-':>12}"
+
+
+def _regressions(runs: List[dict], baseline_path: str, tolerance: float) -> List[str]:
+    with open(baseline_path) as f:
+        baseline = {r['transactions']: r for r in json.load(f)['runs']}
+    slower = []
+    for run in runs:
+        base = baseline.get(run['transactions'])
+        if not base:
+            continue
+        for side in ('python_s', 'ts_s'):
+            if (run.get(side) and base.get(side) and base[side] >= MIN_TIMED
+                    and run[side] > base[side] * (1 + tolerance)):
+                slower.append(f"{run['transactions']:,} transactions: {side[:-2]} {run[side]:.3f}s "
+                              f"vs {base[side]:.3f}s baseline")
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Python vs TS variance: results and throughput')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='comma-separated transaction counts')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--node', default=shutil.which('node'), help='node executable')
+    parser.add_argument('--engine', default=ENGINE_TS, help='cashflowEngine.ts to run')
+    parser.add_argument('--app-dir', default=APP_DIR, help='where to resolve the typescript package')
+    parser.add_argument('--no-ts', action='store_true', help='time the Python side only')
+    parser.add_argument('--json', metavar='FILE', help='record this run')
+    parser.add_argument('--baseline', metavar='FILE', help='fail on slowdowns against a recorded run')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown vs baseline (0.25 = 25%%)')
+    parser.add_argument('--show', type=int, default=10, help='mismatches to print per size')
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    use_ts = not args.no_ts and bool(args.node)
+    if not args.no_ts and not args.node:
+        print('node not found: timing the Python side only\n')
+
+    print(f"{'Transactions':>12} {'Python s':>9} {'txn/s':>12} {'TS s':>9} {'txn/s':>12} {'Mismatch':>9}")
+    print('-' * 68)
+    runs = []
+    failed = False
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in sizes:
+            plan = synthetic_plan(n, args.seed)
+            py, py_s = run_python(plan)
+
+            ts, ts_s, problems, boundary = None, None, [], []
+            if use_ts:
+                plan_path = os.path.join(workdir, 'plan.json')
+                with open(plan_path, 'w') as f:
+                    json.dump(plan, f)
+                ts, ts_s, reason = run_ts(plan_path, args.node, args.engine, args.app_dir, workdir)
+                if ts is None:
+                    print(f'TS side unavailable, timing the Python side only: {reason}\n')
+                    use_ts, ts_s = False, None
+                else:
+                    problems, boundary = compare(py, ts)
+            del plan
+
+            print(f"{n:>12,} {py_s:>9.3f} {_rate(n, py_s)} "
+                  f"{(f'{ts_s:.3f}' if ts_s else '-'):>9} {_rate(n, ts_s)} "
+                  f"{(len(problems) if ts is not None else '-'):>9}")
+            for line in problems[:args.show]:
+                print(f'    {line}')
+            if boundary:
+                print(f'    {len(boundary)} at the ±£5 status threshold (float vs pence), e.g. {boundary[0]}')
+            failed |= bool(problems)
+            runs.append({'transactions': n, 'python_s': py_s, 'ts_s': ts_s,
+                         'mismatches': len(problems) if ts is not None else None,
+                         'boundary': len(boundary)})
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'recorded': time.strftime('%Y-%m-%dT%H:%M:%S'), 'seed': args.seed,
+                       'python': sys.version.split()[0], 'runs': runs}, f, indent=2)
+        print(f'\nRecorded {len(runs)} sizes to {args.json}')
+
+    if args.baseline:
+        slower = _regressions(runs, args.baseline, args.tolerance)
+        for line in slower:
+            print(f'slower: {line}')
+        failed |= bool(slower)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Benchmark reading the Transactions sheet.
+
+Compares the access pattern extract_all_period1.py and
+gen_final_transactions.py were written against (load_workbook(...) followed
+by ws.cell(row, col) per field), openpyxl's read_only iter_rows, and
+xlsx_stream.XlsxReader (zip + iterparse, requested columns only). Reports
+best-of wall time and peak traced memory for each, and checks that all
+three return the same rows.
+
+Runs on the real workbook, then on a synthetic Transactions sheet of
+--rows rows to show how each reader scales.
+
+Usage:
+    python bench_xlsx.py [--rows 100000] [--repeat 3] [--skip-full]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import openpyxl
+
+from workbook_reader import TRANSACTION_COLUMNS, TRANSACTIONS_SHEET, WORKBOOK_PATH
+from xlsx_stream import XlsxReader
+
+HEADER = ['Date', 'Type', 'Category', 'Description', 'Amount (£)', 'One-off?',
+          'Payment Method', 'Notes', 'Period (auto)']
+
+
+def best_of(repeat, fn):
+    best = None
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def peak_memory(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def read_full(path):
+    wb = openpyxl.load_workbook(path, data_only=True)
+    ws = wb[TRANSACTIONS_SHEET]
+    rows = [tuple(ws.cell(row=r, column=c + 1).value for c in TRANSACTION_COLUMNS)
+            for r in range(2, ws.max_row + 1)]
+    wb.close()
+    return rows
+
+
+def read_only(path):
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        return [tuple(row[c] if c < len(row) else None for c in TRANSACTION_COLUMNS)
+                for row in wb[TRANSACTIONS_SHEET].iter_rows(min_row=2, values_only=True)]
+    finally:
+        wb.close()
+
+
+def read_stream(path):
+    with XlsxReader(path) as xl:
+        return list(xl.iter_rows(TRANSACTIONS_SHEET, TRANSACTION_COLUMNS, min_row=2))
+
+
+def count_stream(path):
+    # Consume without keeping rows: what a streaming caller actually holds
+    with XlsxReader(path) as xl:
+        return sum(1 for _ in xl.iter_rows(TRANSACTIONS_SHEET, TRANSACTION_COLUMNS, min_row=2))
+
+
+def write_synthetic(path, rows, seed=0):
+    rng = random.Random(seed)
+    categories = ['Bills', 'Groceries', 'Fuel', 'Giving', 'Allowance', 'Savings', 'Salary']
+    notes = ['Electricity & Gas', 'Council Tax', 'House Keep', 'Tithe', '', 'Phone']
+    start = datetime(2025, 12, 22)
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(TRANSACTIONS_SHEET)
+    ws.append(HEADER)
+    for i in range(rows):
+        kind = rng.choice(['Expense', 'Expense', 'Expense', 'Income', 'Transfer'])
+        ws.append([
+            start + timedelta(days=rng.randrange(400)),
+            kind,
+            rng.choice(categories),
+            f'Transaction {i}',
+            round(rng.uniform(1, 900), 2),
+            rng.choice(['Yes', 'No']),
+            rng.choice(['Card', 'DD', 'Cash']),
+            rng.choice(notes),
+            rng.randrange(1, 14),
+        ])
+    wb.save(path)
+
+
+def run(label, path, repeat, skip_full):
+    print(f'\n{label}: {path} ({os.path.getsize(path) / 1024:,.0f} KiB)')
+    readers = [('load_workbook + ws.cell', read_full), ('read_only iter_rows', read_only),
+               ('xlsx_stream', read_stream)]
+    if skip_full:
+        readers = readers[1:]
+
+    results = {}
+    for name, fn in readers:
+        elapsed, rows = best_of(repeat, lambda: fn(path))
+        results[name] = (elapsed, rows)
+
+    reference = results['xlsx_stream'][1]
+    baseline = results[readers[0][0]][0]
+    print(f"{'reader':<26} {'time':>10} {'speedup':>9} {'peak MiB':>10}")
+    for name, fn in readers:
+        elapsed, rows = results[name]
+        assert rows == reference, f'{name} disagrees with xlsx_stream'
+        peak = peak_memory(lambda: fn(path)) / 2 ** 20
+        print(f'{name:<26} {elapsed * 1000:>8.1f}ms {baseline / elapsed:>8.1f}x {peak:>10.1f}')
+    peak = peak_memory(lambda: count_stream(path)) / 2 ** 20
+    print(f"{'xlsx_stream (not kept)':<26} {'':>10} {'':>9} {peak:>10.1f}")
+    print(f'{len(reference):,} rows, all readers agree')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Transactions sheet readers')
+    parser.add_argument('--workbook', default=WORKBOOK_PATH)
+    parser.add_argument('--rows', type=int, default=100_000, help='synthetic sheet size (0: skip)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--skip-full', action='store_true',
+                        help='skip the non-read-only load_workbook reader (slow on large sheets)')
+    args = parser.parse_args()
+
+    run('Workbook', args.workbook, args.repeat, args.skip_full)
+    if args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'synthetic.xlsx')
+            write_synthetic(path, args.rows)
+            run(f'Synthetic {args.rows:,} rows', path, args.repeat, args.skip_full)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Recurring-bill detection over a whole transaction history.
+
+Batch counterpart of detectRecurringBills in
+cashflow-app/src/lib/billDetection.ts, which groups outflows by
+normalizeMerchant(label) and then, group by group, runs detectFrequency,
+checkAmountConsistency, getMostCommonDueDay and inferCategory over Maps and
+Date objects. Here every group is scored at once:
+
+- merchant keys are normalised once per distinct label and coded in
+  first-seen order (the Map's insertion order)
+- one sort by (merchant, date) puts each group's gaps side by side;
+  average gap is last - first over n - 1, and the gap variance, amount
+  sums and within-tolerance counts are segment reductions
+- due day and category are the most frequent (group, value) pair, ties
+  going to the value seen first, as the Map iteration does
+
+Float sums run left to right within each segment like the TS reduce, one
+NumPy step per position rather than per group, so averages, confidences and
+their rounding agree with the app exactly. Amounts come from
+TransactionTable pence, which equal the plan's 2-decimal amounts.
+
+Results are DetectedBill-shaped dicts, highest confidence first. Ids use
+one Date.now()-style base-36 stamp per run (stamp= makes them repeatable).
+
+Usage:
+    bills = detect_recurring_bills(plan['transactions'], plan['bills'])
+    python bill_detection.py plan.json [--json detected.json]
+"""
+
+import argparse
+import json
+import re
+import time
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+
+from transaction_table import Categorical, TransactionTable
+
+AMOUNT_TOLERANCE = 0.15
+MIN_AMOUNT_CONFIDENCE = 70   # checkAmountConsistency: consistent
+MIN_FREQUENCY_CONFIDENCE = 50
+MIN_CONFIDENCE = 60
+MIN_KEY_LENGTH = 3
+MIN_OCCURRENCES = 2
+
+# detectFrequency's average-gap windows in days, checked in this order
+FREQUENCY_GAPS = (('monthly', 26, 35), ('biweekly', 12, 16), ('weekly', 5, 9))
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]')
+_SPACES = re.compile(r'\s+')
+_PREFIX = re.compile(r'^(payment to|transfer to|direct debit|dd)\s+')
+_SUFFIX = re.compile(r'\s+(ltd|limited|uk|co|plc|inc)$')
+_BASE36 = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+
+def normalize_merchant(label) -> str:
+    """textUtils.normalizeMerchant: lower-case words, payment prefixes and legal suffixes dropped."""
+    key = _SPACES.sub(' ', _NON_ALNUM.sub(' ', str(label or '').lower())).strip()
+    return _SUFFIX.sub('', _PREFIX.sub('', key)).strip()
+
+
+def _base36(n: int) -> str:
+    digits = ''
+    while True:
+        n, d = divmod(n, 36)
+        digits = _BASE36[d] + digits
+        if not n:
+            return digits
+
+
+def bill_id(merchant_key: str, stamp: str) -> str:
+    """generateBillId with a fixed stamp."""
+    return f"detected-{re.sub('[^a-z0-9]', '-', merchant_key)[:20]}-{stamp}"
+
+
+def display_name(merchant_key: str) -> str:
+    return ' '.join(w[:1].upper() + w[1:] for w in merchant_key.split(' '))
+
+
+def _js_round(x: np.ndarray) -> np.ndarray:
+    """Math.round: halves go up."""
+    floor = np.floor(x)
+    return floor + (x - floor >= 0.5)
+
+
+def _segment_sums(values: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Left-to-right float sum of each consecutive segment, as Array.reduce adds.
+
+    The first k positions are added one position at a time across every
+    segment (longest first, so the segments still running are a prefix);
+    the few segments longer than k finish with their own cumsum, which is
+    sequential too. k minimises the Python-level steps, at most ~2*sqrt(n).
+    """
+    starts = np.cumsum(lengths) - lengths
+    order = np.argsort(-lengths, kind='stable')
+    starts, lengths = starts[order], lengths[order]
+    # live[k]: segments longer than k
+    live = np.searchsorted(-lengths, -np.arange(int(lengths.max(initial=0)) + 1), side='left')
+    split = int(np.argmin(np.arange(live.size) + live))
+    total = np.zeros(len(lengths))
+    for k, m in enumerate(live[:split].tolist()):
+        total[:m] += values[starts[:m] + k]
+    for i in range(int(live[split])):
+        tail = values[starts[i] + split:starts[i] + lengths[i]]
+        total[i] = np.cumsum(np.concatenate(([total[i]], tail)))[-1]
+    out = np.empty_like(total)
+    out[order] = total
+    return out
+
+
+def _most_common(group: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+    """Per group, the value with the highest count, ties to the first seen.
+
+    group and values are in first-seen order within each group.
+    """
+    width = int(values.max(initial=0)) + 1
+    pairs, first, counts = np.unique(group.astype(np.int64) * width + values, return_index=True,
+                                     return_counts=True)
+    order = np.lexsort((first, -counts, pairs // width))
+    winners = order[np.r_[True, np.diff(pairs[order] // width) != 0]]
+    out = np.zeros(n_groups, dtype=np.int64)
+    out[pairs[winners] // width] = pairs[winners] % width
+    return out
+
+
+def merchant_keys(labels: np.ndarray) -> Categorical:
+    """normalize_merchant of every label, coded in first-seen order; each distinct label is normalised once."""
+    by_label = Categorical.encode(labels.tolist())
+    index: dict = {}
+    key_of = np.array([index.setdefault(normalize_merchant(label), len(index)) for label in by_label.levels],
+                      dtype=np.int32)
+    return Categorical(key_of[by_label.codes] if key_of.size else by_label.codes, list(index))
+
+
+def detect_recurring_bills(transactions: Union[TransactionTable, Iterable[dict]],
+                           existing_bills: Iterable[dict] = (),
+                           stamp: Optional[str] = None) -> List[dict]:
+    """detectRecurringBills(transactions, existingBills) as DetectedBill dicts."""
+    table = transactions if isinstance(transactions, TransactionTable) else \
+        TransactionTable.from_records(transactions)
+    if stamp is None:
+        stamp = _base36(int(time.time() * 1000))
+    existing = {normalize_merchant(b.get('label')) for b in existing_bills}
+
+    # Outflows with a usable merchant key, coded in first-seen order
+    rows = np.flatnonzero(table.where(type='outflow'))
+    merchants = merchant_keys(table.labels[rows])
+    usable = np.array([len(k) >= MIN_KEY_LENGTH and k not in existing for k in merchants.levels], dtype=bool)
+    counts = np.bincount(merchants.codes, minlength=len(merchants.levels))
+    keep = (usable & (counts >= MIN_OCCURRENCES))[merchants.codes]
+    rows, group = rows[keep], merchants.codes[keep]
+    if not rows.size:
+        return []
+
+    # Input order within each group: amounts, due day, category, occurrences
+    by_input = np.argsort(group, kind='stable')
+    rows_in, group_in = rows[by_input], group[by_input]
+    groups, lengths = np.unique(group_in, return_counts=True)
+    segment = np.repeat(np.arange(groups.size), lengths)
+    first = np.cumsum(lengths) - lengths
+    last = first + lengths - 1
+    n = lengths.astype(np.float64)
+    dates_in = table.dates[rows_in]
+
+    amounts = table.pence[rows_in] / 100
+    average = _segment_sums(amounts, lengths) / n
+    with np.errstate(divide='ignore', invalid='ignore'):
+        within = np.abs(amounts - average[segment]) / average[segment] <= AMOUNT_TOLERANCE
+    amount_confidence = np.add.reduceat(within.astype(np.int64), first) / n * 100
+
+    # Date order within each group: gaps (a group with a missing date has none)
+    undated = np.add.reduceat(np.isnat(dates_in), first) > 0
+    days = dates_in.astype(np.int64)[np.lexsort((dates_in.astype(np.int64), segment))]
+    gaps = np.delete(np.diff(days), last[:-1]).astype(np.float64)  # drop each step into the next group
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        avg_gap = (days[last] - days[first]) / (n - 1)
+        deviation = gaps - np.repeat(avg_gap, lengths - 1)
+        cv = np.sqrt(_segment_sums(deviation * deviation, lengths - 1) / (n - 1)) / avg_gap
+        frequency_confidence = np.maximum(0, 100 - cv * 100)
+
+    frequency = np.full(groups.size, '', dtype=object)
+    for name, lo, hi in reversed(FREQUENCY_GAPS):
+        frequency[(avg_gap >= lo) & (avg_gap <= hi) & ~undated] = name
+    overall = (frequency_confidence + amount_confidence) / 2
+    detected = ((frequency != '') & (frequency_confidence >= MIN_FREQUENCY_CONFIDENCE)
+                & (amount_confidence >= MIN_AMOUNT_CONFIDENCE) & (overall >= MIN_CONFIDENCE))
+
+    confidence = _js_round(np.where(detected, overall, 0)).astype(np.int64)
+    average = _js_round(average * 100) / 100
+    day_of_month = (dates_in - dates_in.astype('datetime64[M]')).astype(np.int64) + 1
+    due_day = _most_common(segment, np.where(np.isnat(dates_in), 0, day_of_month), groups.size)
+    categories = table.coded['category']
+    category = _most_common(segment, categories.codes[rows_in].astype(np.int64), groups.size)
+
+    # Highest confidence first; equal confidence keeps first-seen merchant order
+    winners = np.flatnonzero(detected)
+    winners = winners[np.lexsort((groups[winners], -confidence[winners]))]
+    bills = []
+    for g in winners.tolist():
+        key = merchants.levels[groups[g]]
+        name = display_name(key)
+        span = slice(first[g], first[g] + lengths[g])
+        amount = float(average[g])
+        day = int(due_day[g])
+        cat = categories.levels[category[g]]
+        bills.append({
+            'id': bill_id(key, stamp),
+            'merchantName': name,
+            'averageAmount': amount,
+            'frequency': frequency[g],
+            'confidence': int(confidence[g]),
+            'occurrences': [{'date': d, 'amount': a} for d, a in
+                            zip(np.datetime_as_string(dates_in[span], unit='D').tolist(), amounts[span].tolist())],
+            'suggestedDueDay': day,
+            'suggestedCategory': cat,
+            'suggestedBillTemplate': {'id': bill_id(key, stamp), 'label': name, 'amount': amount,
+                                      'dueDay': day, 'category': cat, 'enabled': True},
+        })
+    return bills
+
+
+def confidence_label(confidence: float) -> str:
+    """getBillConfidenceLabel."""
+    if confidence >= 80:
+        return 'high'
+    if confidence >= 60:
+        return 'medium'
+    return 'low'
+
+
+def load_history(path: str):
+    """(transactions, existing bills) from a Plan JSON, a transaction list or {period: [...]}."""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict) and 'transactions' in data:
+        return data['transactions'], data.get('bills') or []
+    if isinstance(data, dict):
+        return [t for txns in data.values() for t in txns], []
+    return data, []
+
+
+def print_bills(bills: List[dict]) -> None:
+    print(f"{'Merchant':28} {'Frequency':>9} {'Average':>10} {'Due':>4} {'Seen':>5} {'Confidence':>12}")
+    for b in bills:
+        print(f"{b['merchantName'][:28]:28} {b['frequency']:>9} {b['averageAmount']:>10,.2f} "
+              f"{b['suggestedDueDay']:>4} {len(b['occurrences']):>5} "
+              f"{b['confidence']:>5} {confidence_label(b['confidence']):>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('input', help='Plan JSON, JSON list of transactions, or {period: [...]}')
+    parser.add_argument('--json', metavar='FILE', help='write the DetectedBill list')
+    parser.add_argument('--stamp', help='id suffix instead of the current time in base 36')
+    args = parser.parse_args()
+
+    transactions, existing = load_history(args.input)
+    table = TransactionTable.from_records(transactions)
+    started = time.perf_counter()
+    bills = detect_recurring_bills(table, existing, args.stamp)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    print_bills(bills)
+    print(f'\n{len(bills)} recurring bills in {len(table):,} transactions ({elapsed:.1f} ms)')
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(bills, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
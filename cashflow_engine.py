@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Python reference for the planning side of cashflow-app/src/lib/
+cashflowEngine.ts, for batch jobs and reconciliation scripts.
+
+Reads a Plan as the app exports it (jsonExport.ts writes the Plan object
+as JSON) and projects every period in one go instead of one Node call per
+period:
+
+- rules and bills are expanded once over the span of all periods
+  (recurrence.py, closed form and cached) and then sliced per period; a
+  rule is only re-expanded for a period whose periodRuleOverrides change
+  its cadence or seed date
+- each day's income and outflow are summed with np.add.at in generateEvents
+  order, then rounded like money()
+- balances for all periods come from a single np.cumsum over the day grid;
+  starting balances chain forward in one pass over the periods, where
+  getStartingBalance rebuilds every earlier period's timeline (O(P^2))
+
+Balances are int pence and every rounding step matches money(), so rows
+are equal to buildTimeline(plan, id, getStartingBalance(plan, id)) to the
+penny.
+
+Usage:
+    plan = load_plan_json('plan.json')
+    timeline = project(plan)             # every period
+    timeline.rows(3)                     # TimelineRow dicts for period 3
+    timeline.starts                      # {period_id: starting balance}
+    generate_events(plan, 3)             # CashflowEvent dicts
+    category_variance(plan)[3]           # getVarianceByCategory(plan, 3)
+
+    python cashflow_engine.py plan.json [--period N] [--json FILE]
+"""
+
+import argparse
+import json
+import unicodedata
+from itertools import groupby
+from operator import itemgetter
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from money import format_pounds, group_sum, pence_array, pounds, to_pence
+from recurrence import monthly_occurrences, occurrences
+from transaction_table import TransactionTable
+from variance import category_summary
+
+RULE_OVERRIDE_FIELDS = ('enabled', 'amount', 'cadence', 'seedDate')
+
+# String.prototype.localeCompare order for ASCII (ICU root collation):
+# punctuation and symbols, then digits, then letters with case as a tie-break
+_COLLATION = " _-,;:!?.'\"()[]{}@*/\\&#%`^+<=>|~$0123456789abcdefghijklmnopqrstuvwxyz"
+_PRIMARY = str.maketrans({c: chr(0x20 + i) for i, c in enumerate(_COLLATION)} |
+                         {c.upper(): chr(0x20 + i) for i, c in enumerate(_COLLATION) if c.isalpha()})
+_CASE = str.maketrans({c: '0' for c in _COLLATION if c.isalpha()} |
+                      {c.upper(): '1' for c in _COLLATION if c.isalpha()})
+
+
+def _locale_key(s) -> tuple:
+    """Sort key approximating a.localeCompare(b) for event ids."""
+    s = str(s)
+    if s.isascii():
+        return s.translate(_PRIMARY), '', s.translate(_CASE)
+    # Accents sort after the bare letter, before the next one
+    bases = [unicodedata.normalize('NFD', c)[0] for c in s]
+    return (''.join(bases).translate(_PRIMARY), ''.join('1' if b != c else '0' for b, c in zip(bases, s)),
+            ''.join(bases).translate(_CASE))
+
+
+def _day(iso: str) -> np.datetime64:
+    return np.datetime64(str(iso)[:10], 'D')
+
+
+def _iso(days: np.ndarray) -> List[str]:
+    return np.datetime_as_string(days, unit='D').tolist()
+
+
+def _bounds(period):
+    """(id, start, end) of a plan period dict or a periods.Period."""
+    if isinstance(period, dict):
+        return period['id'], _day(period['start']), _day(period['end'])
+    return period.id, np.datetime64(period.start, 'D'), np.datetime64(period.end, 'D')
+
+
+def _between(dates: np.ndarray, start, end) -> np.ndarray:
+    return dates[np.searchsorted(dates, start):np.searchsorted(dates, end, 'right')]
+
+
+# -- events -----------------------------------------------------------------------
+
+def _override_event(o: dict) -> dict:
+    return {'id': o.get('id'), 'date': o.get('date'), 'label': o.get('label'), 'amount': o.get('amount'),
+            'type': o.get('type'), 'category': o.get('category'), 'sourceId': o.get('ruleId')}
+
+
+def _dated_events(dates: np.ndarray, source: dict, amount, type_: str, category) -> List[dict]:
+    return [{'id': f"{source['id']}-{d}", 'date': d, 'label': source.get('label'), 'amount': amount,
+             'type': type_, 'category': category, 'sourceId': source['id']}
+            for d in _iso(dates)]
+
+
+def _apply_event_overrides(events: List[dict], by_event: Dict[str, dict], start: str, end: str) -> List[dict]:
+    if not by_event:
+        return events
+    adjusted = []
+    for ev in events:
+        override = by_event.get(ev['id'])
+        if override is None:
+            adjusted.append(ev)
+            continue
+        if override.get('disabled'):
+            continue
+        next_date = override.get('date') if override.get('date') is not None else ev['date']
+        if next_date < start or next_date > end:
+            continue
+        amount = override.get('amount')
+        adjusted.append({**ev, 'date': next_date,
+                         'amount': amount if _is_number(amount) else ev['amount']})
+    return adjusted
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _period_events(plan: dict, period, span: tuple, by_event: Dict[str, dict]) -> List[dict]:
+    period_id, first, last = _bounds(period)
+    start, end = str(first), str(last)
+    overrides = [o for o in plan.get('overrides') or [] if start <= o['date'] <= end]
+    rule_overrides = {pro['ruleId']: pro for pro in plan.get('periodRuleOverrides') or []
+                      if pro.get('periodId') == period_id}
+
+    events = []
+    for key, type_ in (('incomeRules', 'income'), ('outflowRules', 'outflow')):
+        for rule in plan.get(key) or []:
+            pro = rule_overrides.get(rule['id'])
+            if pro:
+                rule = {**rule, **{f: pro[f] for f in RULE_OVERRIDE_FIELDS if pro.get(f) is not None}}
+            replaced = [o for o in overrides if o.get('ruleId') == rule['id']]
+            if replaced:
+                events.extend(_override_event(o) for o in replaced)
+                continue
+            if not rule.get('enabled'):
+                continue
+            category = 'income' if type_ == 'income' else rule.get('category')
+            dates = _between(occurrences(rule['cadence'], rule['seedDate'], *span), first, last)
+            events.extend(_dated_events(dates, rule, rule['amount'], type_, category))
+
+    disabled = next((set(o.get('disabledBills') or []) for o in plan.get('periodOverrides') or []
+                     if o.get('periodId') == period_id), set())
+    for bill in plan.get('bills') or []:
+        if not bill.get('enabled') or bill['id'] in disabled:
+            continue
+        dates = _between(monthly_occurrences(int(bill['dueDay']), *span), first, last)
+        events.extend(_dated_events(dates, bill, bill['amount'], 'outflow', bill.get('category')))
+
+    events.extend(_override_event(o) for o in overrides if not o.get('ruleId'))
+
+    events = _apply_event_overrides(events, by_event, start, end)
+    events.sort(key=lambda e: (e['date'], _locale_key(e['id'])))
+    return events
+
+
+def _ordered_periods(plan: dict, periods=None) -> list:
+    # Stable sort by id, as getStartingBalance orders them
+    return sorted(plan.get('periods') or [] if periods is None else periods, key=lambda p: _bounds(p)[0])
+
+
+def events_by_period(plan: dict, periods=None) -> Dict[int, List[dict]]:
+    """{period_id: generateEvents(plan, period_id)} for every period, in id order.
+
+    periods replaces plan['periods'] (plan-style dicts or periods.Period),
+    e.g. to project a plan over more years than it was saved with.
+    """
+    ordered = _ordered_periods(plan, periods)
+    if not ordered:
+        return {}
+    bounds = [_bounds(p) for p in ordered]
+    # Occurrences are expanded (and cached) once over the whole span
+    span = (min(b[1] for b in bounds), max(b[2] for b in bounds))
+    by_event = {o['eventId']: o for o in plan.get('eventOverrides') or []}
+    result: Dict[int, List[dict]] = {}
+    for period in ordered:
+        result.setdefault(_bounds(period)[0], _period_events(plan, period, span, by_event))
+    return result
+
+
+def get_period(plan: dict, period_id: int):
+    """getPeriod: the period with this id, else the plan's first period."""
+    periods = plan.get('periods') or []
+    return next((p for p in periods if p['id'] == period_id), periods[0] if periods else None)
+
+
+def generate_events(plan: dict, period_id: int) -> List[dict]:
+    """generateEvents(plan, period_id): one period's events, sorted by date then id."""
+    period = get_period(plan, period_id)
+    if period is None:
+        return []
+    return events_by_period(plan, [period])[period['id']]
+
+
+# -- timelines ------------------------------------------------------------------
+
+def _join_labels(events: List[dict]) -> Optional[str]:
+    if len(events) == 1:
+        return events[0].get('label')
+    return ' + '.join('' if e.get('label') is None else str(e['label']) for e in events)
+
+
+class Timeline(NamedTuple):
+    """Day rows of one or more periods, concatenated in period id order."""
+    period_ids: np.ndarray  # int64 per row
+    dates: np.ndarray       # datetime64[D]
+    income: np.ndarray      # int64 pence
+    outflow: np.ndarray     # int64 pence
+    net: np.ndarray         # int64 pence
+    balance: np.ndarray     # int64 pence
+    warning: np.ndarray     # bool: balance below setup.expectedMinBalance
+    labels: List[Optional[str]]
+    starts: Dict[int, float]  # starting balance per period id
+
+    def _rows_of(self, period_id: Optional[int]) -> np.ndarray:
+        if period_id is None:
+            return np.arange(len(self.dates))
+        return np.flatnonzero(self.period_ids == period_id)
+
+    def rows(self, period_id: Optional[int] = None) -> List[dict]:
+        """TimelineRow dicts (amounts in pounds), for one period or all."""
+        idx = self._rows_of(period_id)
+        return [{'date': d, 'label': self.labels[i] if self.labels[i] is not None else '',
+                 'income': pounds(inc), 'outflow': pounds(out), 'net': pounds(net),
+                 'balance': pounds(bal), 'warning': bool(warn)}
+                for i, d, inc, out, net, bal, warn in zip(
+                    idx.tolist(), _iso(self.dates[idx]), self.income[idx].tolist(),
+                    self.outflow[idx].tolist(), self.net[idx].tolist(),
+                    self.balance[idx].tolist(), self.warning[idx].tolist())]
+
+    def ending_balance(self, period_id: int) -> float:
+        idx = self._rows_of(period_id)
+        return pounds(self.balance[idx[-1]]) if len(idx) else self.starts[period_id]
+
+    def min_point(self, period_id: Optional[int] = None) -> Optional[dict]:
+        """minPoint: the first row with the lowest balance."""
+        idx = self._rows_of(period_id)
+        if not len(idx):
+            return None
+        return self.rows(period_id)[int(np.argmin(self.balance[idx]))]
+
+
+def _starting_balance_overrides(plan: dict) -> Dict[int, float]:
+    return {o['periodId']: o['startingBalance'] for o in plan.get('periodOverrides') or []
+            if _is_number(o.get('startingBalance'))}
+
+
+def _timeline(plan: dict, ordered: list, events: Dict[int, List[dict]],
+              start_for: Callable[[int, int, Optional[float]], float]) -> Timeline:
+    """Day grid for `ordered` periods; start_for(index, id, previous end) gives each start."""
+    bounds = [_bounds(p) for p in ordered]
+    ids = np.array([b[0] for b in bounds], dtype=np.int64)
+    firsts = np.array([b[1] for b in bounds], dtype='datetime64[D]')
+    lengths = np.maximum((np.array([b[2] for b in bounds], dtype='datetime64[D]') - firsts)
+                         .astype(np.int64) + 1, 0)
+    offsets = np.cumsum(lengths) - lengths
+    n = int(lengths.sum())
+    dates = np.repeat(firsts, lengths) + (np.arange(n) - np.repeat(offsets, lengths))
+
+    # Flatten events to grid rows; period and generateEvents order is kept,
+    # so np.add.at sums each day's amounts in the same order as the TS reduce
+    flat = [ev for pid in ids.tolist() for ev in events.get(pid, [])]
+    counts = [len(events.get(pid, [])) for pid in ids.tolist()]
+    event_days = np.array([ev['date'] for ev in flat], dtype='datetime64[D]')
+    rows = np.repeat(offsets, counts) + (event_days - np.repeat(firsts, counts)).astype(np.int64)
+    amounts = np.array([ev['amount'] for ev in flat], dtype=np.float64)
+    kinds = np.array([ev['type'] for ev in flat], dtype=object)
+    labels: List[Optional[str]] = [None] * n
+    for row, todays in groupby(zip(rows.tolist(), flat), key=itemgetter(0)):
+        labels[row] = _join_labels([ev for _, ev in todays])
+
+    income_f = np.zeros(n)
+    outflow_f = np.zeros(n)
+    is_income = kinds == 'income'
+    is_outflow = kinds == 'outflow'
+    np.add.at(income_f, rows[is_income], amounts[is_income])
+    np.add.at(outflow_f, rows[is_outflow], amounts[is_outflow])
+    income = pence_array(income_f)
+    outflow = pence_array(outflow_f)
+    net = income - outflow
+    running = np.cumsum(net)
+
+    # One pass over periods: the first row rounds start + net like money(),
+    # every later row is the running total shifted to that start
+    base = np.zeros(len(bounds), dtype=np.int64)
+    starts: Dict[int, float] = {}
+    end = None
+    for i, (pid, offset, length) in enumerate(zip(ids.tolist(), offsets.tolist(), lengths.tolist())):
+        start = start_for(i, pid, end)
+        starts.setdefault(pid, start)
+        if not length:
+            end = start
+            continue
+        first_balance = to_pence(start + pounds(net[offset]))
+        base[i] = first_balance - running[offset]
+        end = pounds(base[i] + running[offset + length - 1])
+    balance = np.repeat(base, lengths) + running
+
+    expected_min = (plan.get('setup') or {}).get('expectedMinBalance') or 0
+    warning = (balance / 100 < expected_min) if expected_min > 0 else np.zeros(n, dtype=bool)
+    return Timeline(np.repeat(ids, lengths), dates, income, outflow, net, balance, warning, labels, starts)
+
+
+def project(plan: dict, periods=None) -> Timeline:
+    """Timelines for every period, each from getStartingBalance(plan, id).
+
+    With setup.rollForwardBalance each period starts from its
+    periodOverrides startingBalance or the previous period's closing
+    balance; without it every period starts from setup.startingBalance.
+    """
+    ordered = _ordered_periods(plan, periods)
+    setup = plan.get('setup') or {}
+    opening = setup.get('startingBalance', 0)
+    overrides = _starting_balance_overrides(plan)
+    roll_forward = setup.get('rollForwardBalance')
+
+    def start_for(i, period_id, previous_end):
+        if not roll_forward:
+            return opening
+        return overrides.get(period_id, opening if i == 0 else previous_end)
+
+    return _timeline(plan, ordered, events_by_period(plan, ordered), start_for)
+
+
+def build_timeline(plan: dict, period_id: int, starting_balance: float) -> List[dict]:
+    """buildTimeline(plan, period_id, starting_balance)."""
+    period = get_period(plan, period_id)
+    if period is None:
+        return []
+    timeline = _timeline(plan, [period], events_by_period(plan, [period]),
+                         lambda i, pid, end: starting_balance)
+    return timeline.rows()
+
+
+def starting_balances(plan: dict, periods=None) -> Dict[int, float]:
+    """getStartingBalance for every period id."""
+    return project(plan, periods).starts
+
+
+def get_starting_balance(plan: dict, period_id: int) -> float:
+    """getStartingBalance(plan, period_id); an unknown id gets the last period's start."""
+    starts = starting_balances(plan)
+    if period_id in starts:
+        return starts[period_id]
+    return list(starts.values())[-1] if starts else (plan.get('setup') or {}).get('startingBalance', 0)
+
+
+# -- variance ---------------------------------------------------------------------
+
+def _signed(pence: np.ndarray, types: np.ndarray) -> np.ndarray:
+    """Outflows count positive, income negative and transfers not at all."""
+    return np.where(types == 'outflow', pence, np.where(types == 'transfer', 0, -pence))
+
+
+def category_variance(plan: dict, periods=None,
+                      table: Optional[TransactionTable] = None) -> Dict[int, Dict[str, dict]]:
+    """getVarianceByCategory for every period: {period_id: {category: summary}}.
+
+    Planned events are the budget and plan['transactions'] in the period the
+    actuals; both are summed in pence per (period, category). table
+    replaces plan['transactions'] when the caller already has one.
+    """
+    events = events_by_period(plan, periods)
+    bounds = {_bounds(p)[0]: _bounds(p)[1:] for p in reversed(_ordered_periods(plan, periods))}
+    if table is None:
+        table = TransactionTable.from_records(plan.get('transactions') or [])
+
+    txn_categories = table.coded['category']
+    categories = {c: i for i, c in enumerate(txn_categories.levels)}
+    for period_events in events.values():
+        for ev in period_events:
+            categories.setdefault(ev['category'], len(categories))
+    n_cats = len(categories)
+    names = list(categories)
+
+    flat = [(slot, ev) for slot, pid in enumerate(events) for ev in events[pid]]
+    b_flat = np.array([slot * n_cats + categories[ev['category']] for slot, ev in flat], dtype=np.int64)
+    b_signed = _signed(pence_array(np.array([ev['amount'] for _, ev in flat], dtype=np.float64)),
+                       np.array([ev['type'] for _, ev in flat], dtype=object))
+    budgeted = group_sum(b_flat, b_signed, len(events) * n_cats).reshape(len(events), n_cats)
+    planned = np.bincount(b_flat, minlength=len(events) * n_cats).reshape(len(events), n_cats) > 0
+
+    a_code = txn_categories.codes.astype(np.int64)
+    a_signed = _signed(table.pence, table.coded['type'].decode())
+    result = {}
+    for slot, pid in enumerate(events):
+        in_period = table.between(*bounds[pid]) if len(table) else np.zeros(0, dtype=bool)
+        actual = group_sum(a_code[in_period], a_signed[in_period], n_cats)
+        present = planned[slot] | (np.bincount(a_code[in_period], minlength=n_cats) > 0)
+        result[pid] = {names[j]: category_summary(names[j], int(budgeted[slot, j]), int(actual[j]))
+                       for j in np.flatnonzero(present)}
+    return result
+
+
+def savings_reconciliation(plan: dict, periods=None,
+                           table: Optional[TransactionTable] = None) -> Dict[int, dict]:
+    """getSavingsTransferReconciliation for every period.
+
+    Budgeted is every planned event in the savings category, actual every
+    savings transfer transaction in the period.
+    """
+    events = events_by_period(plan, periods)
+    bounds = {_bounds(p)[0]: _bounds(p)[1:] for p in reversed(_ordered_periods(plan, periods))}
+    if table is None:
+        table = TransactionTable.from_records(plan.get('transactions') or [])
+    transfers = table.where(type='transfer', category='savings') if len(table) else np.zeros(0, dtype=bool)
+
+    result = {}
+    for pid, period_events in events.items():
+        budgeted = int(pence_array(np.array([e['amount'] for e in period_events if e['category'] == 'savings'],
+                                            dtype=np.float64)).sum())
+        actual = table.total(transfers & table.between(*bounds[pid])) if len(table) else 0
+        variance = actual - budgeted
+        result[pid] = {
+            'budgeted': pounds(budgeted),
+            'actual': pounds(actual),
+            'variance': pounds(variance),
+            'variancePercent': (variance / budgeted) * 100 if budgeted != 0 else 0,
+            'status': 'under' if variance < -500 else 'over' if variance > 500 else 'neutral',
+        }
+    return result
+
+
+def load_plan_json(path: str) -> dict:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('plan', help='Plan JSON as exported by the app')
+    parser.add_argument('--period', type=int, help='print this period day by day')
+    parser.add_argument('--json', metavar='FILE', help='write {period_id: [TimelineRow]}')
+    args = parser.parse_args()
+
+    plan = load_plan_json(args.plan)
+    timeline = project(plan)
+
+    if args.period is not None:
+        for row in timeline.rows(args.period):
+            flag = '  !' if row['warning'] else ''
+            print(f"{row['date']}  {format_pounds(to_pence(row['net'])):>11}  "
+                  f"{format_pounds(to_pence(row['balance'])):>11}{flag}  {row['label']}")
+    else:
+        print(f"{'Period':>6} {'Start':>12} {'Income':>12} {'Outflow':>12} {'End':>12} {'Lowest':>12}  Date")
+        for period_id, start in timeline.starts.items():
+            idx = timeline.period_ids == period_id
+            low = timeline.min_point(period_id)
+            print(f'{period_id:>6} {format_pounds(to_pence(start)):>12} '
+                  f'{format_pounds(timeline.income[idx].sum()):>12} '
+                  f'{format_pounds(timeline.outflow[idx].sum()):>12} '
+                  f'{format_pounds(to_pence(timeline.ending_balance(period_id))):>12} '
+                  f"{format_pounds(to_pence(low['balance'])) if low else '-':>12}  "
+                  f"{low['date'] if low else ''}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({str(pid): timeline.rows(pid) for pid in timeline.starts}, f, indent=2)
+        print(f'\nSaved {len(timeline.starts)} periods to {args.json}')
+
+
+if __name__ == '__main__':
+    main()
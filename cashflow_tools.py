@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+One entry point for the workbook pipeline.
+
+    python cashflow_tools.py [--workbook PATH] COMMAND [options] [+ COMMAND [options] ...]
+
+Commands:
+    extract     transactions by period (extract_periods, or ingest with --incremental)
+    categorize  re-apply the workbook's Column C mapping to transactions or plan.ts
+    emit-ts     write transactions as a .ts fragment or a .json sidecar
+    variance    budget vs actual by period and category
+    diff        compare another workbook revision with this one
+    bills       recurring bills detected in the transactions (bill_detection)
+    inspect     sheets, used ranges and periods, without NumPy or openpyxl
+
+Commands joined with '+' run in one process and share state: the workbook
+snapshot (workbook_cache) is opened once, and the transactions extract
+produces feed categorize, emit-ts, variance and bills without a JSON
+round trip. A later stage with --input reads that file instead.
+
+    python cashflow_tools.py extract + variance --period 1 + emit-ts out.ts
+
+Each command imports what it needs when it runs (NumPy, openpyxl and the
+pipeline modules are never loaded for --help or inspect), so cheap
+invocations start in tens of milliseconds.
+"""
+
+import argparse
+import os
+import sys
+from typing import Dict, List, Optional
+
+CHAIN_SEPARATOR = '+'
+
+
+class Context:
+    """State shared by the stages of one invocation."""
+
+    def __init__(self, workbook: str):
+        self.workbook = workbook
+        self.by_period: Optional[Dict[int, List[dict]]] = None
+        self.unassigned = 0
+        self._snapshot = None
+        self._mapping = None
+
+    @property
+    def snapshot(self):
+        if self._snapshot is None:
+            from workbook_cache import load_snapshot
+
+            self._snapshot = load_snapshot(self.workbook)
+        return self._snapshot
+
+    @property
+    def mapping(self):
+        if self._mapping is None:
+            from category_mapping import load_category_mapping
+
+            self._mapping = load_category_mapping(self.workbook)
+        return self._mapping
+
+    def transactions(self, input_path: Optional[str] = None) -> Dict[int, List[dict]]:
+        """{period_id: [txn]}: from input_path, an earlier stage, or a fresh extract."""
+        if input_path:
+            self.by_period = load_transactions(input_path)
+        elif self.by_period is None:
+            self.by_period, self.unassigned = self._extract()
+        return self.by_period
+
+    def _extract(self, incremental: bool = False):
+        if incremental:
+            from ingest import ingest
+
+            return ingest(self.workbook)[:2]
+        from extract_periods import partition_transactions
+
+        return partition_transactions(self.workbook, records=self.snapshot.iter_transactions())
+
+
+def load_transactions(path: str) -> Dict[int, List[dict]]:
+    """A {period: [txn]} JSON (extract --partitioned) or a plain list, split by date."""
+    import json
+
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        return {int(k): v for k, v in data.items()}
+
+    from periods import PeriodIndex, build_periods_2026
+
+    index = PeriodIndex(build_periods_2026())
+    by_period: Dict[int, List[dict]] = {}
+    for txn in data:
+        by_period.setdefault(index.period_id(_as_date(txn.get('date'))) or 0, []).append(txn)
+    return dict(sorted(by_period.items()))
+
+
+def _as_date(value):
+    from datetime import date
+
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def _flatten(by_period: Dict[int, List[dict]], period: Optional[int] = None) -> List[dict]:
+    if period is not None:
+        return list(by_period.get(period, []))
+    return [txn for txns in by_period.values() for txn in txns]
+
+
+def _write_json(data, path: str) -> None:
+    import json
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+
+# -- commands -----------------------------------------------------------------
+
+def cmd_extract(ctx: Context, args) -> None:
+    ctx.by_period, ctx.unassigned = ctx._extract(args.incremental)
+    if not args.quiet:
+        from extract_periods import print_period_totals
+
+        print_period_totals(ctx.by_period, ctx.unassigned)
+    if args.partitioned:
+        _write_json({str(k): v for k, v in ctx.by_period.items()}, args.partitioned)
+        print(f'Saved {len(ctx.by_period)} periods to {args.partitioned}')
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        for period_id, txns in ctx.by_period.items():
+            _write_json(txns, os.path.join(args.out_dir, f'period{period_id}_transactions.json'))
+        print(f'Saved {len(ctx.by_period)} period files to {args.out_dir}')
+
+
+def app_category(txn: dict, mapping) -> str:
+    """The category extract_periods.to_plan_transaction gives a txn of this type and notes."""
+    if txn.get('type') == 'income':
+        return 'income'
+    if txn.get('type') == 'transfer':
+        return 'savings'
+    return mapping.get(txn.get('notes') or '', 'other')
+
+
+def cmd_categorize(ctx: Context, args) -> None:
+    from collections import Counter
+
+    mapping = ctx.mapping
+    if args.plan:
+        from plan_patcher import PlanPatcher
+
+        patch = PlanPatcher(args.plan)
+        changed = 0
+        for txn in patch.transactions:
+            if txn.type == 'outflow' and txn.notes in mapping:
+                changed += patch.update_by_id(txn.id, category=mapping[txn.notes])
+        for cat, (was, now, delta) in sorted(patch.category_deltas().items()):
+            if delta:
+                print(f'  {cat:12} {was:4} -> {now:4} ({delta:+d})')
+        if args.dry_run:
+            print(f'{changed} plan transactions would be recategorised (dry run)')
+        else:
+            patch.write()
+            print(f'Recategorised {changed} transactions in {args.plan}')
+        return
+
+    moves: Counter = Counter()
+    for txns in ctx.transactions(args.input).values():
+        for txn in txns:
+            category = app_category(txn, mapping)
+            if category != txn.get('category'):
+                moves[(txn.get('category'), category)] += 1
+                txn['category'] = category
+                txn['linkedRuleId'] = 'savings' if category == 'savings' else None
+    for (was, now), n in sorted(moves.items(), key=lambda kv: -kv[1]):
+        print(f'  {str(was):12} -> {now:12} {n:4}')
+    print(f'{sum(moves.values())} transactions recategorised from the {mapping.source} mapping')
+    if args.output:
+        _write_json({str(k): v for k, v in ctx.by_period.items()}, args.output)
+        print(f'Saved to {args.output}')
+
+
+def cmd_emit_ts(ctx: Context, args) -> None:
+    from ts_emitter import emit_json_sidecar, emit_ts, with_ids
+
+    records = with_ids(_flatten(ctx.transactions(args.input), args.period))
+    if args.output.endswith('.json'):
+        count = emit_json_sidecar(records, args.output, args.minify, args.sidecar_module)
+    else:
+        count = emit_ts(records, args.output, minify=args.minify)
+    print(f'Wrote {count} transactions to {args.output}')
+
+
+def cmd_variance(ctx: Context, args) -> None:
+    from variance import BUDGET_SHEET, print_variance, read_budgets, variance_by_period
+
+    budgets = read_budgets(ctx.snapshot.sheet_rows(BUDGET_SHEET))
+    result = variance_by_period(budgets, _flatten(ctx.transactions(args.input)), ctx.mapping)
+    print_variance(result, args.period)
+    if args.json:
+        _write_json({str(k): v for k, v in result.items()}, args.json)
+
+
+def cmd_diff(ctx: Context, args) -> None:
+    from workbook_diff import diff_workbooks, make_patch, print_diff
+
+    diff = diff_workbooks(args.old, ctx.workbook)
+    print_diff(diff)
+    if args.patch:
+        _write_json(make_patch(diff.transactions, args.old, ctx.workbook), args.patch)
+        print(f'Wrote transaction patch to {args.patch}')
+
+
+def cmd_bills(ctx: Context, args) -> None:
+    from bill_detection import detect_recurring_bills, print_bills
+
+    bills = detect_recurring_bills(_flatten(ctx.transactions(args.input)), stamp=args.stamp)
+    print_bills(bills)
+    print(f'{len(bills)} recurring bills detected')
+    if args.json:
+        _write_json(bills, args.json)
+
+
+def cmd_inspect(ctx: Context, args) -> None:
+    from file_cache import sha256_file
+    from xlsx_stream import XlsxReader
+
+    print(f'{ctx.workbook}')
+    print(f'  {os.path.getsize(ctx.workbook):,} bytes, sha256 {sha256_file(ctx.workbook)[:16]}')
+    with XlsxReader(ctx.workbook) as xl:
+        for name in xl.sheetnames:
+            print(f'  {name:24} {xl.dimension(name) or "-"}')
+    if args.periods:
+        from periods import build_periods_2026
+
+        print()
+        for p in build_periods_2026():
+            print(f'  P{p.id:<3} {p.start} .. {p.end}')
+
+
+COMMANDS = {
+    'extract': cmd_extract,
+    'categorize': cmd_categorize,
+    'emit-ts': cmd_emit_ts,
+    'variance': cmd_variance,
+    'diff': cmd_diff,
+    'bills': cmd_bills,
+    'inspect': cmd_inspect,
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='cashflow_tools.py', description=__doc__.strip().splitlines()[0],
+        epilog=f"Chain commands with a standalone '{CHAIN_SEPARATOR}': extract + variance + emit-ts out.ts")
+    parser.add_argument('--workbook', help='workbook to read (default: workbook_reader.WORKBOOK_PATH)')
+    sub = parser.add_subparsers(dest='command', required=True, metavar='COMMAND')
+
+    p = sub.add_parser('extract', help='transactions by period')
+    p.add_argument('--incremental', action='store_true', help='convert only rows appended since the last run')
+    p.add_argument('--partitioned', metavar='FILE', help='write one JSON keyed by period id')
+    p.add_argument('--out-dir', metavar='DIR', help='write period{N}_transactions.json files')
+    p.add_argument('--quiet', action='store_true', help='skip the per-period totals')
+
+    p = sub.add_parser('categorize', help="re-apply the workbook's Column C mapping")
+    p.add_argument('--input', metavar='JSON', help='transactions to recategorise (default: extract)')
+    p.add_argument('--output', metavar='JSON', help='write the recategorised transactions')
+    p.add_argument('--plan', nargs='?', const='cashflow-app/src/data/plan.ts', metavar='PLAN_TS',
+                   help='recategorise plan.ts outflows in place instead')
+    p.add_argument('--dry-run', action='store_true', help='with --plan: report without writing')
+
+    p = sub.add_parser('emit-ts', help='write transactions as TypeScript or a JSON sidecar')
+    p.add_argument('output', help='.ts fragment, or .json sidecar')
+    p.add_argument('--input', metavar='JSON', help='transactions to emit (default: extract)')
+    p.add_argument('--period', type=int, help='only this period')
+    p.add_argument('--minify', action='store_true')
+    p.add_argument('--sidecar-module', metavar='TS', help='with a .json output, also write a .ts module')
+
+    p = sub.add_parser('variance', help='budget vs actual by period and category')
+    p.add_argument('--input', metavar='JSON', help='transactions to compare (default: extract)')
+    p.add_argument('--period', type=int, help='only print this period')
+    p.add_argument('--json', metavar='FILE', help='write {period: {category: summary}}')
+
+    p = sub.add_parser('diff', help='compare another workbook revision with this one')
+    p.add_argument('old', help='older workbook')
+    p.add_argument('--patch', metavar='FILE', help='write the transaction patch')
+
+    p = sub.add_parser('bills', help='recurring bills detected in the transactions')
+    p.add_argument('--input', metavar='JSON', help='transactions to scan (default: extract)')
+    p.add_argument('--json', metavar='FILE', help='write the DetectedBill list')
+    p.add_argument('--stamp', help='id suffix instead of the current time in base 36')
+
+    p = sub.add_parser('inspect', help='sheets and used ranges (no NumPy/openpyxl)')
+    p.add_argument('--periods', action='store_true', help='also list the budget periods')
+    return parser
+
+
+def split_chain(argv: List[str]) -> List[List[str]]:
+    stages, current = [], []
+    for arg in argv:
+        if arg == CHAIN_SEPARATOR:
+            stages.append(current)
+            current = []
+        else:
+            current.append(arg)
+    stages.append(current)
+    return stages
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    stages = [parser.parse_args(stage) for stage in split_chain(sys.argv[1:] if argv is None else argv)]
+
+    workbook = next((s.workbook for s in stages if s.workbook), None)
+    if workbook is None:
+        from workbook_reader import WORKBOOK_PATH
+
+        workbook = WORKBOOK_PATH
+    if not os.path.exists(workbook):
+        parser.error(f'workbook not found: {workbook}')
+
+    ctx = Context(workbook)
+    for i, args in enumerate(stages):
+        if len(stages) > 1:
+            print(f"{'' if i == 0 else chr(10)}== {args.command}")
+        COMMANDS[args.command](ctx, args)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Substring rule categorizer with first-match priority.
+
+Replaces loops of the form
+
+    for key, cat in rules.items():
+        if key.lower() in label.lower():
+            return cat
+
+which cost O(rules) substring searches per label, with one precompiled regex.
+
+The rule keys are folded into a trie and emitted as a single nested
+alternation (shared prefixes are matched once), wrapped in a lookahead so
+finditer reports the longest key starting at every position of the
+lowercased label. Every other key that matches at that position is a prefix
+of the longest one, so each key carries the best (lowest) rule index among
+its key-prefixes; the minimum over all positions is exactly the rule the
+loop above would have returned. Results are memoised per label, so repeated
+merchant strings cost a dict lookup.
+"""
+
+import re
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+Rules = Union[Mapping[str, str], Iterable[Tuple[str, str]]]
+
+_END = ''  # trie terminal marker; never a real character
+
+
+def _trie_pattern(node: dict) -> str:
+    branches = [re.escape(ch) + _trie_pattern(child)
+                for ch, child in sorted(node.items()) if ch != _END]
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if _END in node:
+        # Greedy optional: prefer the longer key, fall back to this one
+        return ('(?:' + body + ')?') if len(branches) == 1 else body + '?'
+    return body
+
+
+class Categorizer:
+    def __init__(self, rules: Rules, default: Optional[str] = None):
+        items = list(rules.items()) if isinstance(rules, Mapping) else list(rules)
+
+        self.default = default
+        self._categories: List[str] = [category for _, category in items]
+
+        # First occurrence wins when a key is repeated
+        priority: Dict[str, int] = {}
+        for i, (key, _) in enumerate(items):
+            priority.setdefault(key.lower(), i)
+
+        trie: dict = {}
+        for key in priority:
+            node = trie
+            for ch in key:
+                node = node.setdefault(ch, {})
+            node[_END] = {}
+
+        self._best: Dict[str, int] = {
+            key: min(priority[key[:n]] for n in range(len(key) + 1) if key[:n] in priority)
+            for key in priority
+        }
+        self._pattern = re.compile('(?=(' + _trie_pattern(trie) + '))') if priority else None
+        self._memo: Dict[str, Optional[str]] = {}
+
+    def __len__(self):
+        return len(self._categories)
+
+    def match(self, label: Optional[str]) -> Optional[str]:
+        """Category of the first rule whose key occurs in label, else default."""
+        if label is None:
+            return self.default
+        try:
+            return self._memo[label]
+        except KeyError:
+            pass
+
+        best = None
+        if self._pattern is not None:
+            for m in self._pattern.finditer(label.lower()):
+                rule = self._best[m.group(1)]
+                if best is None or rule < best:
+                    best = rule
+                    if best == 0:
+                        break
+
+        result = self._categories[best] if best is not None else self.default
+        self._memo[label] = result
+        return result
+
+    def categorize_many(self, labels: Iterable[Optional[str]]) -> List[Optional[str]]:
+        """Categorise a batch; each distinct label is matched only once."""
+        match = self.match
+        return [match(label) for label in labels]
+
+    def clear_cache(self):
+        self._memo.clear()
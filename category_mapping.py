@@ -0,0 +1,163 @@
+"""
+Column C category -> app category mapping, read from the workbook itself.
+
+The scripts used to carry their own copy of this table, and the copies
+disagreed (House Keep was 'bill' in some and 'allowance' in others). The
+workbook is the source of truth, in order of preference:
+
+1. a 'Category Mapping' sheet (Column C category, then app category or group)
+2. the Setup sheet's "Category list (dropdown source)" Group/Category table
+3. the Group/Items columns of 'Budget by Period'
+
+Groups translate to app categories via GROUP_TO_APP. Keys are normalised
+(trimmed, inner whitespace collapsed, case-folded) so 'Tithe ' and 'Tithe'
+are the same category. The compiled table is cached under .cache/ and
+reused until the workbook changes.
+
+Column C values the workbook does not list fall back to CATEGORY_ALIASES,
+which keeps what the scripts' own tables said for them ('Uber - TfL' is
+typed in Transactions but missing from Setup's dropdown list). The
+workbook's own entry wins when it has one.
+"""
+
+from collections.abc import Mapping
+from typing import Dict, Iterator, Optional
+
+from file_cache import load_cached, store_cached
+from workbook_reader import WORKBOOK_PATH
+
+CACHE_NAMESPACE = 'category_mapping'
+CACHE_VERSION = 2
+
+APP_CATEGORIES = ('income', 'bill', 'giving', 'savings', 'allowance', 'buffer', 'other')
+
+# Workbook group (Setup / Budget by Period column A) -> app category
+GROUP_TO_APP = {
+    'INCOME': 'income',
+    'GIVING': 'giving',
+    'FIXED': 'bill',
+    'ONE-OFF': 'bill',
+    'VARIABLE': 'allowance',
+    'SAVINGS': 'savings',
+    'POT': 'buffer',
+}
+
+
+# Column C categories used in Transactions but absent from the workbook's lists
+CATEGORY_ALIASES = {
+    'Uber - TfL': 'allowance',
+}
+
+
+def normalise(name) -> str:
+    return ' '.join(str(name).split()).casefold()
+
+
+def _to_app(value) -> Optional[str]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    if text.lower() in APP_CATEGORIES:
+        return text.lower()
+    return GROUP_TO_APP.get(text.upper())
+
+
+class CategoryMapping(Mapping):
+    """Read-only Column C -> app category table with normalised lookups."""
+
+    def __init__(self, table: Dict[str, str], names: Dict[str, str], source: str):
+        self._table = table   # normalised key -> app category
+        self.names = names    # normalised key -> name as written in the workbook
+        self.source = source  # which sheet the table came from
+
+    def __getitem__(self, column_c):
+        return self._table[normalise(column_c)]
+
+    def __contains__(self, column_c):
+        return column_c is not None and normalise(column_c) in self._table
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names.values())
+
+    def __len__(self):
+        return len(self._table)
+
+    def get(self, column_c, default=None):
+        if column_c is None:
+            return default
+        return self._table.get(normalise(column_c), default)
+
+
+def _pairs_from_mapping_sheet(ws):
+    for row in ws.iter_rows(min_row=2, values_only=True):
+        cells = [v for v in row if v not in (None, '')]
+        if len(cells) >= 2:
+            yield cells[0], cells[1]
+
+
+def _pairs_from_setup(ws):
+    in_table = False
+    for row in ws.iter_rows(values_only=True):
+        group, name = (tuple(row) + (None, None))[:2]
+        if not in_table:
+            in_table = group == 'Group' and name == 'Category'
+            continue
+        if group is None and name is None:
+            break
+        if group is not None and name is not None:
+            yield name, group
+
+
+def _pairs_from_budget(ws):
+    for row in ws.iter_rows(min_row=2, values_only=True):
+        group, name = (tuple(row) + (None, None))[:2]
+        if group is not None and name is not None:
+            yield name, group
+
+
+SOURCES = (
+    ('Category Mapping', _pairs_from_mapping_sheet),
+    ('Setup', _pairs_from_setup),
+    ('Budget by Period', _pairs_from_budget),
+)
+
+
+def build_category_mapping(path: str = WORKBOOK_PATH) -> CategoryMapping:
+    """Read the mapping straight from the workbook, bypassing the cache."""
+    import openpyxl
+
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        for sheet_name, read_pairs in SOURCES:
+            if sheet_name not in wb.sheetnames:
+                continue
+            table, names = {}, {}
+            for name, target in read_pairs(wb[sheet_name]):
+                app = _to_app(target)
+                key = normalise(name)
+                if app is None or not key or key in table:
+                    continue
+                table[key] = app
+                names[key] = str(name).strip()
+            if table:
+                for name, app in CATEGORY_ALIASES.items():
+                    key = normalise(name)
+                    if key not in table:
+                        table[key] = app
+                        names[key] = name
+                return CategoryMapping(table, names, sheet_name)
+    finally:
+        wb.close()
+    raise ValueError(f'No category mapping found in {path}')
+
+
+def load_category_mapping(path: str = WORKBOOK_PATH) -> CategoryMapping:
+    """The workbook's mapping, from the on-disk cache when still valid."""
+    cached = load_cached(CACHE_NAMESPACE, path, CACHE_VERSION)
+    if cached is not None:
+        return CategoryMapping(cached['table'], cached['names'], cached['source'])
+
+    mapping = build_category_mapping(path)
+    store_cached(CACHE_NAMESPACE, path, CACHE_VERSION,
+                 {'table': mapping._table, 'names': mapping.names, 'source': mapping.source})
+    return mapping
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Differential check: bill_detection vs billDetection.ts.
+
+Generates random transaction histories and runs detectRecurringBills on
+each in a local node process (see node_ts) and detect_recurring_bills in
+Python, with Date.now pinned so both sides build the same ids. The
+DetectedBill lists must be equal as JSON: same merchants in the same
+order, same frequencies, confidences, averages, due days, categories and
+occurrences.
+
+Histories mix merchants on weekly to quarterly steps with jittered dates,
+amounts that drift or spike, labels that normalise to the same key
+('Tesco', 'TESCO UK'), prefixes and legal suffixes, keys under three
+characters, non-outflows and existing bills. Exit status is 1 on any
+mismatch and node_ts.NO_TS_EXIT when TypeScript is unavailable.
+
+Usage:
+    python check_bills_parity.py [--histories 300] [--seed 0]
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+from datetime import date, timedelta
+
+from bill_detection import _base36, detect_recurring_bills
+from node_ts import APP_DIR, LIB_DIR, NO_TS_EXIT, run_driver, write_driver
+
+BILL_DETECTION_TS = os.path.join(LIB_DIR, 'billDetection.ts')
+NOW_MS = 1_760_000_000_000   # Date.now() on both sides, for generateBillId
+
+# Writes [DetectedBill[]] for a JSON list of {transactions, bills}
+DRIVER = r"""
+(async () => {
+  const [modulePath, appDir, nowMs, historiesPath, outPath] = process.argv.slice(2);
+  const detection = await loadModule(modulePath, appDir);
+  Date.now = () => Number(nowMs);
+  const histories = JSON.parse(fs.readFileSync(historiesPath, 'utf8'));
+  const out = histories.map((h) => detection.detectRecurringBills(h.transactions, h.bills));
+  fs.writeFileSync(outPath, JSON.stringify(out));
+})();
+"""
+
+MERCHANTS = ('Netflix', 'DD Thames Water', 'Payment to Octopus Energy Ltd', 'Tesco', 'tesco', 'TESCO UK', 'Gym Co',
+             'Spotify', 'ab', 'x!', 'Council Tax', 'Vodafone plc', 'Landlord', 'Coffee #1', 'Transfer to Mum',
+             'Direct Debit BT', 'EE Limited', 'Amazon Prime Inc', 'Ring', 'Parking')
+STEPS = (7, 14, 30, 31, 28, 91, 1, 3, 10, 20, 35, 26, 12, 16, 5, 9)
+
+
+def random_history(seed: int) -> dict:
+    """{transactions, bills}: 20-50 merchants, each paid 1-25 times on a (jittered) step."""
+    r = random.Random(seed)
+    names = list(MERCHANTS) + [f'Shop {i}' for i in range(r.randint(0, 30))]
+    transactions = []
+    start = date(2024, 1, 1)
+    for name in names:
+        drifting = r.random() < 0.3
+        step = r.choice(STEPS)
+        base = round(r.uniform(1, 300), 2)
+        day = start + timedelta(days=r.randint(0, 60))
+        for _ in range(r.randint(1, 25)):
+            jitter = r.choice([0, 0, 0, 1, -1, 2, -3]) if r.random() < 0.5 else 0
+            amount = base if r.random() < 0.7 else round(base * r.uniform(0.5, 1.5), 2)
+            if r.random() < 0.1:
+                amount = round(r.uniform(0.01, 5), 2)
+            transactions.append({
+                'id': f't{len(transactions)}', 'date': (day + timedelta(days=jitter)).isoformat(),
+                'label': name, 'amount': amount,
+                'type': r.choices(['outflow', 'income', 'transfer'], [0.9, 0.05, 0.05])[0],
+                'category': r.choice(['bill', 'bill', 'allowance', 'giving', 'other']),
+            })
+            day += timedelta(days=step + (r.randint(-2, 2) if drifting else 0))
+    r.shuffle(transactions)
+    bills = [{'label': 'Spotify'}] if r.random() < 0.5 else []
+    return {'transactions': transactions, 'bills': bills}
+
+
+def compare(py: list, ts: list) -> list:
+    """Mismatch descriptions between two DetectedBill lists (occurrences elided)."""
+    py = json.loads(json.dumps(py))
+    if py == ts:
+        return []
+    if len(py) != len(ts):
+        return [f'{len(py)} bills (python) != {len(ts)} (ts): '
+                f'{sorted({b["id"] for b in py} ^ {b["id"] for b in ts})[:5]}']
+    problems = []
+    for a, b in zip(py, ts):
+        if a != b:
+            keys = [k for k in a if a.get(k) != b.get(k)]
+            problems.append(f"{a['id']}: " + ', '.join(
+                f'{k} {a.get(k)!r} != {b.get(k)!r}' if k != 'occurrences' else 'occurrences' for k in keys))
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Python vs TS recurring-bill detection on random histories')
+    parser.add_argument('--histories', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=0, help='first history seed')
+    parser.add_argument('--node', default=shutil.which('node'), help='node executable')
+    parser.add_argument('--module', default=BILL_DETECTION_TS, help='billDetection.ts to run')
+    parser.add_argument('--app-dir', default=APP_DIR, help='where to resolve the typescript package')
+    parser.add_argument('--show', type=int, default=10, help='mismatches to print')
+    args = parser.parse_args()
+
+    if not args.node:
+        print('node not found: nothing to compare against')
+        sys.exit(NO_TS_EXIT)
+
+    seeds = range(args.seed, args.seed + args.histories)
+    histories = [random_history(seed) for seed in seeds]
+    with tempfile.TemporaryDirectory() as workdir:
+        histories_path = os.path.join(workdir, 'histories.json')
+        out_path = os.path.join(workdir, 'ts_bills.json')
+        with open(histories_path, 'w') as f:
+            json.dump(histories, f)
+        driver = write_driver(workdir, 'bills_parity', DRIVER)
+        ok, reason = run_driver(args.node, driver,
+                                [args.module, args.app_dir, str(NOW_MS), histories_path, out_path])
+        if not ok:
+            print(f'TS side unavailable: {reason}')
+            sys.exit(NO_TS_EXIT)
+        with open(out_path) as f:
+            results = json.load(f)
+
+    stamp = _base36(NOW_MS)
+    failed = shown = bills = 0
+    for seed, history, ts in zip(seeds, histories, results):
+        bills += len(ts)
+        problems = compare(detect_recurring_bills(history['transactions'], history['bills'], stamp), ts)
+        failed += bool(problems)
+        for line in problems[:args.show - shown]:
+            print(f'history {seed}: {line}')
+        shown += len(problems[:args.show - shown])
+    print(f'{args.histories} histories, {bills} detected bills: {failed} histories with mismatches')
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
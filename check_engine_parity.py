@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Differential check: cashflow_engine.project vs cashflowEngine.ts.
+
+Generates random plans and, for every period, compares what the Python
+port and the app's engine (in a local node process, see node_ts) make of
+them:
+
+- the starting balance (getStartingBalance)
+- the events, in order (generateEvents: event ids sort by localeCompare,
+  which _locale_key has to reproduce)
+- the timeline rows (buildTimeline from that starting balance)
+
+Plans mix every cadence, seeds years before the periods, month-end and
+leap-day seeds, bills with out-of-range due days, rule/period/event
+overrides, shuffled periods, and ids that differ only in case, digits,
+punctuation or accents. Everything must match exactly. Exit status is 1
+on any mismatch and node_ts.NO_TS_EXIT when TypeScript is unavailable.
+
+Usage:
+    python check_engine_parity.py [--plans 300] [--seed 0]
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+from datetime import date, timedelta
+
+import cashflow_engine
+from node_ts import APP_DIR, LIB_DIR, NO_TS_EXIT, run_driver, write_driver
+from periods import build_periods_2026
+
+ENGINE_TS = os.path.join(LIB_DIR, 'cashflowEngine.ts')
+
+# Writes [{period id: {start, events, rows}}] for a JSON list of plans
+DRIVER = r"""
+(async () => {
+  const [enginePath, appDir, plansPath, outPath] = process.argv.slice(2);
+  const engine = await loadModule(enginePath, appDir);
+  const plans = JSON.parse(fs.readFileSync(plansPath, 'utf8'));
+  const out = plans.map((plan) => {
+    const results = {};
+    for (const p of plan.periods) {
+      const start = engine.getStartingBalance(plan, p.id);
+      results[p.id] = {
+        start,
+        events: engine.generateEvents(plan, p.id),
+        rows: engine.buildTimeline(plan, p.id, start),
+      };
+    }
+    return results;
+  });
+  fs.writeFileSync(outPath, JSON.stringify(out));
+})();
+"""
+
+CADENCES = ('weekly', 'biweekly', 'monthly', 'quarterly', 'annual')
+# localeCompare cases: case, digit runs, punctuation, accents
+RULE_IDS = ('salary', 'Salary', 'rent', 'rent_2', 'rent-2', 'a.b', 'Zeta', 'fuel', 'gym', 'x1', 'x10', 'x2',
+            'Éclair')
+
+
+# -- plans ------------------------------------------------------------------------
+
+def _amount(r: random.Random):
+    return r.choice([round(r.uniform(1, 3000), 2), round(r.uniform(0, 50), 2), r.randint(1, 900),
+                     round(r.uniform(0, 100), 3), 0.1, 0.2, 12.99])
+
+
+def _date(r: random.Random, lo=date(2023, 1, 1), hi=date(2027, 3, 1)) -> str:
+    return (lo + timedelta(days=r.randint(0, (hi - lo).days))).isoformat()
+
+
+def random_plan(seed: int) -> dict:
+    """A 13-period plan with random rules, bills and overrides (no transactions)."""
+    r = random.Random(seed)
+    periods = [{'id': p.id, 'label': p.label, 'start': p.start.isoformat(), 'end': p.end.isoformat()}
+               for p in build_periods_2026()]
+    if r.random() < 0.3:
+        r.shuffle(periods)
+
+    def rule_id():
+        return r.choice(RULE_IDS) + str(r.randint(0, 3))
+
+    income = [{'id': rule_id(), 'label': f'Inc{i}', 'amount': _amount(r), 'cadence': r.choice(CADENCES),
+               'seedDate': _date(r), 'enabled': r.random() < 0.9} for i in range(r.randint(0, 4))]
+    outflow = [{'id': rule_id(), 'label': f'Out{i}', 'amount': _amount(r), 'cadence': r.choice(CADENCES),
+                'seedDate': _date(r), 'category': r.choice(['bill', 'allowance', 'savings']),
+                'enabled': r.random() < 0.9} for i in range(r.randint(0, 6))]
+    bills = [{'id': rule_id(), 'label': f'Bill{i}', 'amount': _amount(r), 'dueDay': r.randint(-1, 33),
+              'category': 'bill', 'enabled': r.random() < 0.9} for i in range(r.randint(0, 8))]
+    rules = income + outflow
+
+    rule_overrides = []
+    for _ in range(r.randint(0, 4) if rules else 0):
+        override = {'periodId': r.randint(1, 13), 'ruleId': r.choice(rules)['id'], 'type': 'income'}
+        for key, value in (('enabled', r.choice([True, False, None])), ('amount', r.choice([None, _amount(r)])),
+                           ('cadence', r.choice((None,) + CADENCES)), ('seedDate', r.choice([None, _date(r)]))):
+            if value is not None:
+                override[key] = value
+        rule_overrides.append(override)
+
+    period_overrides = []
+    for _ in range(r.randint(0, 4)):
+        override = {'periodId': r.randint(1, 13)}
+        if r.random() < 0.5:
+            override['disabledBills'] = [b['id'] for b in bills if r.random() < 0.5]
+        if r.random() < 0.5:
+            override['startingBalance'] = _amount(r) - 500
+        period_overrides.append(override)
+
+    overrides = []
+    for i in range(r.randint(0, 6)):
+        override = {'id': f'ov{i}'}
+        if rules and r.random() < 0.5:
+            override['ruleId'] = r.choice(rules)['id']
+        override.update({'date': _date(r, date(2025, 12, 1), date(2027, 2, 1)), 'label': f'Ov{i}',
+                         'amount': _amount(r), 'type': r.choice(['income', 'outflow', 'transfer']),
+                         'category': 'other'})
+        overrides.append(override)
+
+    plan = {
+        'setup': {'selectedPeriodId': 1, 'asOfDate': '2026-01-15', 'windowDays': 30,
+                  'startingBalance': r.choice([2500, 1234.567, -300, 0.1]),
+                  'rollForwardBalance': r.random() < 0.8, 'expectedMinBalance': r.choice([0, 500, 1000.5]),
+                  'variableCap': 400},
+        'periods': periods, 'incomeRules': income, 'outflowRules': outflow,
+        'periodRuleOverrides': rule_overrides, 'bills': bills, 'periodOverrides': period_overrides,
+        'eventOverrides': [], 'overrides': overrides, 'transactions': [],
+    }
+
+    # Event overrides need the generated event ids
+    events = [e for es in cashflow_engine.events_by_period(plan).values() for e in es]
+    event_overrides = []
+    for i, event in enumerate(r.sample(events, min(len(events), r.randint(0, 8)))):
+        override = {'id': f'eo{i}', 'eventId': event['id']}
+        if r.random() < 0.5:
+            override['date'] = _date(r, date(2025, 12, 10), date(2027, 2, 1))
+        if r.random() < 0.5:
+            override['amount'] = _amount(r)
+        if r.random() < 0.2:
+            override['disabled'] = True
+        event_overrides.append(override)
+    plan['eventOverrides'] = event_overrides
+    return plan
+
+
+# -- comparison ---------------------------------------------------------------------
+
+def _defined(event: dict) -> dict:
+    # JSON drops undefined fields on the TS side
+    return {k: v for k, v in event.items() if v is not None}
+
+
+def compare(plan: dict, ts: dict) -> list:
+    """Mismatch descriptions for one plan; ts is the driver's {period id: results}."""
+    timeline = cashflow_engine.project(plan)
+    events = cashflow_engine.events_by_period(plan)
+    problems = []
+    for key, result in ts.items():
+        pid = int(key)
+        if timeline.starts.get(pid) != result['start']:
+            problems.append(f"P{pid} start {timeline.starts.get(pid)!r} != {result['start']!r}")
+        py_events = [_defined(e) for e in events.get(pid, [])]
+        ts_events = [_defined(e) for e in result['events']]
+        if py_events != ts_events:
+            at = next((i for i, (a, b) in enumerate(zip(py_events, ts_events)) if a != b),
+                      min(len(py_events), len(ts_events)))
+            problems.append(f'P{pid} events differ from #{at}: '
+                            f'{py_events[at:at + 1]} != {ts_events[at:at + 1]}')
+        rows = timeline.rows(pid)
+        if rows != result['rows']:
+            at = next((i for i, (a, b) in enumerate(zip(rows, result['rows'])) if a != b),
+                      min(len(rows), len(result['rows'])))
+            problems.append(f"P{pid} rows differ from #{at}: {rows[at:at + 1]} != {result['rows'][at:at + 1]}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Python vs TS cashflow engine on random plans')
+    parser.add_argument('--plans', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=0, help='first plan seed')
+    parser.add_argument('--node', default=shutil.which('node'), help='node executable')
+    parser.add_argument('--engine', default=ENGINE_TS, help='cashflowEngine.ts to run')
+    parser.add_argument('--app-dir', default=APP_DIR, help='where to resolve the typescript package')
+    parser.add_argument('--show', type=int, default=10, help='mismatches to print')
+    args = parser.parse_args()
+
+    if not args.node:
+        print('node not found: nothing to compare against')
+        sys.exit(NO_TS_EXIT)
+
+    plans = [random_plan(seed) for seed in range(args.seed, args.seed + args.plans)]
+    with tempfile.TemporaryDirectory() as workdir:
+        plans_path = os.path.join(workdir, 'plans.json')
+        out_path = os.path.join(workdir, 'ts_results.json')
+        with open(plans_path, 'w') as f:
+            json.dump(plans, f)
+        driver = write_driver(workdir, 'engine_parity', DRIVER)
+        ok, reason = run_driver(args.node, driver, [args.engine, args.app_dir, plans_path, out_path])
+        if not ok:
+            print(f'TS side unavailable: {reason}')
+            sys.exit(NO_TS_EXIT)
+        with open(out_path) as f:
+            results = json.load(f)
+
+    failed = shown = periods = 0
+    for seed, plan, ts in zip(range(args.seed, args.seed + args.plans), plans, results):
+        periods += len(ts)
+        problems = compare(plan, ts)
+        failed += bool(problems)
+        for line in problems[:args.show - shown]:
+            print(f'plan {seed}: {line}')
+        shown += len(problems[:args.show - shown])
+    print(f'{args.plans} plans, {periods} periods: {failed} plans with mismatches')
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
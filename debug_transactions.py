@@ -1,37 +1,26 @@
-import openpyxl
-from datetime import datetime
+from datetime import date
 from collections import defaultdict
 
-wb = openpyxl.load_workbook('FINAL_2026_Cashflow_System_AppleStyle_v3_Start22Dec2025 - Copy (2).xlsx', data_only=True)
-ws = wb['Transactions']
+from workbook_cache import load_snapshot
+from workbook_reader import in_range
 
 # Extract all Period 1 transactions
-p1_start = datetime(2025, 12, 22)
-p1_end = datetime(2026, 1, 25)
+p1_start = date(2025, 12, 22)
+p1_end = date(2026, 1, 25)
 
 transactions_by_col_c = defaultdict(lambda: {'count': 0, 'total': 0})
 
-for i in range(2, ws.max_row + 1):
-    date_val = ws.cell(i, 1).value
-    type_val = ws.cell(i, 2).value
-    cat_val = ws.cell(i, 3).value  # Column C - The categorization
-    desc_val = ws.cell(i, 4).value
-    amount_val = ws.cell(i, 5).value
+for rec in load_snapshot().iter_transactions():
+    cat_val = rec.category  # Column C - The categorization
     
-    if not date_val or not amount_val:
-        continue
-    
-    if not isinstance(date_val, datetime):
+    # Skip missing or zero amounts
+    if not rec.amount:
         continue
         
-    if not (p1_start <= date_val <= p1_end):
-        continue
-    
-    # Skip if amount is 0
-    if amount_val == 0:
+    if not in_range(rec, p1_start, p1_end):
         continue
     
-    amount = abs(float(amount_val))
+    amount = abs(rec.amount)
     transactions_by_col_c[cat_val]['count'] += 1
     transactions_by_col_c[cat_val]['total'] += amount
 
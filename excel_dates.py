@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Vectorised decoding of a date column as it comes out of the workbook.
+
+Column A of the Transactions sheet holds a mix of real dates (datetime
+from openpyxl/xlsx_stream), bare serial numbers (a date typed into an
+unformatted cell, or read without styles) and text such as '22/12/2025'.
+Scripts handled these one cell at a time with isinstance checks and
+datetime.strptime, which dominates ingest time on multi-year sheets and
+silently dropped whatever did not parse.
+
+decode_dates() converts a whole column to datetime64[D] at once:
+
+- datetime/date objects: one array conversion
+- serials: millisecond-rounded like openpyxl's from_excel, 1900 (with the
+  phantom 29 Feb 1900) or 1904 epoch
+- text: dd/mm/yyyy is parsed from the string's code points with array
+  arithmetic; other spellings (d/m/yyyy, dd-mm-yyyy, ISO, a trailing
+  time) by regex, once per distinct string
+
+Blank cells become NaT. Anything else that is not a date (bad text,
+impossible days like 31/02/2026, booleans, time-only serials) also becomes
+NaT and its position is reported in .failed.
+
+Usage:
+    decoded = decode_dates(column_a_values)
+    decoded.dates            # datetime64[D]
+    decoded.failed_rows(2)   # sheet rows that did not parse
+    decoded.as_dates()       # [date | None, ...]
+"""
+
+import re
+from datetime import date, datetime
+from itertools import repeat
+from typing import Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+EPOCH_1900 = np.datetime64('1899-12-30', 'D')
+EPOCH_1904 = np.datetime64('1904-01-01', 'D')
+MS_PER_DAY = 86_400_000
+
+_NAT = np.datetime64('NaT', 'D')
+# Day-first UK dates with any of / . - and an optional time part; or ISO
+_DMY = re.compile(r'(\d{1,2})[/.\-](\d{1,2})[/.\-](\d{4})(?:[ T].*)?$')
+_YMD = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})(?:[ T].*)?$')
+
+_BLANK, _DATE, _NUMBER, _TEXT, _OTHER = range(5)
+_KIND_BY_TYPE = {type(None): _BLANK, datetime: _DATE, date: _DATE, int: _NUMBER,
+                 float: _NUMBER, str: _TEXT, bool: _OTHER}
+
+
+class DecodedDates(NamedTuple):
+    dates: np.ndarray   # datetime64[D]; NaT for blank and failed cells
+    failed: np.ndarray  # int64 positions of non-blank cells that are not dates
+
+    def failed_rows(self, first_row: int = 1) -> List[int]:
+        """Failed positions as sheet row numbers, given the first value's row."""
+        return (self.failed + first_row).tolist()
+
+    def as_dates(self) -> list:
+        """datetime.date per value, None for NaT."""
+        return self.dates.astype(object).tolist()
+
+
+def _kind(value) -> int:
+    """Kind of a value whose exact type is not in _KIND_BY_TYPE (subclasses, NumPy scalars)."""
+    if value is None:
+        return _BLANK
+    if isinstance(value, (datetime, date)):
+        return _DATE
+    if isinstance(value, bool):
+        return _OTHER
+    if isinstance(value, (int, float, np.number)):
+        return _NUMBER
+    if isinstance(value, str):
+        return _TEXT
+    return _OTHER
+
+
+def _from_ymd(years: np.ndarray, months: np.ndarray, days: np.ndarray):
+    """datetime64[D] from integer y/m/d arrays, and which were real dates."""
+    ok = (months >= 1) & (months <= 12) & (days >= 1) & (days <= 31) & (years >= 1)
+    month_start = np.where(ok, (years - 1970) * 12 + (months - 1), 0).astype('datetime64[M]')
+    dates = month_start.astype('datetime64[D]') + np.where(ok, days - 1, 0)
+    # 31/02 rolls into March: the month no longer matches
+    ok &= dates.astype('datetime64[M]') == month_start
+    return np.where(ok, dates, _NAT), ok
+
+
+def _decode_dmy_fixed(text: np.ndarray):
+    """Fast path for exactly 'dd/mm/yyyy' (already stripped, length 10)."""
+    codes = np.ascontiguousarray(text, dtype='U10').view(np.uint32).reshape(-1, 10).astype(np.int64)
+    digits = codes - ord('0')
+    digit_cols = [0, 1, 3, 4, 6, 7, 8, 9]
+    shape_ok = ((codes[:, 2] == ord('/')) & (codes[:, 5] == ord('/')) &
+                ((digits[:, digit_cols] >= 0) & (digits[:, digit_cols] <= 9)).all(axis=1))
+    days = digits[:, 0] * 10 + digits[:, 1]
+    months = digits[:, 3] * 10 + digits[:, 4]
+    years = digits[:, 6] * 1000 + digits[:, 7] * 100 + digits[:, 8] * 10 + digits[:, 9]
+    dates, ok = _from_ymd(years, months, days)
+    return dates, ok & shape_ok
+
+
+def _decode_text_slow(text: np.ndarray):
+    """Other date spellings, parsed once per distinct string."""
+    uniques, inverse = np.unique(text, return_inverse=True)
+    ymd = np.zeros((len(uniques), 3), dtype=np.int64)
+    for i, s in enumerate(uniques):
+        m = _DMY.match(s)
+        if m:
+            ymd[i] = int(m.group(3)), int(m.group(2)), int(m.group(1))
+            continue
+        m = _YMD.match(s)
+        if m:
+            ymd[i] = int(m.group(1)), int(m.group(2)), int(m.group(3))
+    dates, ok = _from_ymd(ymd[:, 0], ymd[:, 1], ymd[:, 2])
+    inverse = inverse.reshape(-1)
+    return dates[inverse], ok[inverse]
+
+
+def _decode_text(text: np.ndarray):
+    text = np.char.strip(text.astype(str))
+    dates = np.full(text.shape, _NAT)
+    ok = np.zeros(text.shape, dtype=bool)
+    blank = text == ''
+    fixed = np.char.str_len(text) == 10
+    if fixed.any():
+        dates[fixed], ok[fixed] = _decode_dmy_fixed(text[fixed])
+    rest = ~ok & ~blank
+    if rest.any():
+        dates[rest], ok[rest] = _decode_text_slow(text[rest])
+    return dates, ok, blank
+
+
+def _decode_serials(serials: np.ndarray, epoch: np.datetime64):
+    serials = serials.astype(np.float64)
+    ok = np.isfinite(serials) & (serials >= 1)
+    ms = np.rint(np.where(ok, serials, 0) * MS_PER_DAY)
+    days = np.floor(ms / MS_PER_DAY).astype(np.int64)
+    if epoch == EPOCH_1900:
+        # Serials 1-59 predate Excel's phantom 29 Feb 1900
+        days += (serials > 0) & (serials < 60)
+    return np.where(ok, epoch + days, _NAT), ok
+
+
+def decode_dates(values: Iterable, epoch: np.datetime64 = EPOCH_1900) -> DecodedDates:
+    """Decode a column of mixed Excel date values to datetime64[D]."""
+    column = np.fromiter(values, dtype=object) if not isinstance(values, np.ndarray) else values.astype(object)
+    n = len(column)
+    dates = np.full(n, _NAT)
+    ok = np.zeros(n, dtype=bool)
+    blank = np.zeros(n, dtype=bool)
+
+    # Classify by exact type in C (map), isinstance only for the odd ones out
+    kind = np.fromiter(map(_KIND_BY_TYPE.get, map(type, column), repeat(-1)), dtype=np.int8, count=n)
+    for i in np.flatnonzero(kind < 0):
+        kind[i] = _kind(column[i])
+    blank[kind == _BLANK] = True
+
+    is_date = kind == _DATE
+    if is_date.any():
+        dates[is_date] = np.array(column[is_date].tolist(), dtype='datetime64[us]').astype('datetime64[D]')
+        ok[is_date] = True
+
+    is_number = kind == _NUMBER
+    if is_number.any():
+        dates[is_number], ok[is_number] = _decode_serials(column[is_number], epoch)
+
+    is_text = kind == _TEXT
+    if is_text.any():
+        text_dates, text_ok, text_blank = _decode_text(column[is_text])
+        dates[is_text], ok[is_text] = text_dates, text_ok
+        blank[is_text] = text_blank
+
+    return DecodedDates(dates, np.flatnonzero(~ok & ~blank))
+
+
+def to_date(value, epoch: np.datetime64 = EPOCH_1900) -> Optional[date]:
+    """decode_dates for a single value."""
+    return decode_dates([value], epoch).as_dates()[0]
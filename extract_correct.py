@@ -1,53 +1,24 @@
-import openpyxl
 import json
 from datetime import datetime
 from collections import defaultdict
 
+from category_mapping import load_category_mapping
+from formula_eval import evaluated_rows
+from money import pounds, to_pence
+from txn_ids import assign_ids
+
 excel_file = "FINAL_2026_Cashflow_System_AppleStyle_v3_Start22Dec2025 - Copy (2).xlsx"
-wb = openpyxl.load_workbook(excel_file, data_only=True)
-
-# Complete mapping based on Bills Schedule and Budget by Period
-category_to_app = {
-    # FIXED/Bills
-    'Rent': 'bill',
-    'Insurance': 'bill',
-    'Road Tax': 'bill',
-    'Water Bill': 'bill',
-    'Electricity & Gas': 'bill',
-    'Community Fibre / Internet': 'bill',
-    'iPhone Payments': 'bill',
-    'Parents': 'bill',
-    'Credit Card Payment': 'bill',
-    'Fuel': 'bill',
-    'Laptop': 'bill',
-    
-    # GIVING
-    'Tithe': 'giving',
-    'Offerings': 'giving',
-    'Charity - Perez Uni': 'giving',
-    'Charity - JPC Utilities': 'giving',
-    'Donations (Variable)': 'giving',
-    
-    # VARIABLE (Food + Others)
-    'House Keep': 'allowance',
-    'Others': 'allowance',
-    'Uber - TfL': 'allowance',
-    
-    # One-off
-    'One-Off Giving (Christmas)': 'other',
-    
-    # Savings
-    'Savings Transfer': 'savings',
-}
+
+# Column C -> app category, from the workbook's own category list
+category_to_app = load_category_mapping(excel_file)
 
 # Extract transactions
 transactions = []
 app_category_totals = defaultdict(lambda: {'count': 0, 'amount': 0})
 unmapped = defaultdict(lambda: {'count': 0, 'amount': 0})
 
-ws_txn = wb['Transactions']
 
-for i, row in enumerate(ws_txn.iter_rows(min_row=2, max_row=1200, values_only=True), 2):
+for i, row in enumerate(evaluated_rows(excel_file, 'Transactions', min_row=2, max_row=1200), 2):
     date = row[0]
     txn_type = row[1]
     category = row[2]
@@ -66,6 +37,7 @@ for i, row in enumerate(ws_txn.iter_rows(min_row=2, max_row=1200, values_only=Tr
     
     # Determine transaction type and app category
     category_str = str(category) if category else ''
+    pence = abs(to_pence(amount))
     
     if txn_type == 'Income':
         final_type = 'income'
@@ -81,15 +53,14 @@ for i, row in enumerate(ws_txn.iter_rows(min_row=2, max_row=1200, values_only=Tr
         else:
             app_cat = 'other'
             unmapped[category_str]['count'] += 1
-            unmapped[category_str]['amount'] += abs(float(amount))
+            unmapped[category_str]['amount'] += pence
     
     label = str(description or category or '')
     
     transactions.append({
-        'id': f"txn-{len(transactions)+1}",
         'date': date_str,
         'label': label,
-        'amount': abs(float(amount)),
+        'amount': pounds(pence),
         'type': final_type,
         'category': app_cat,
         'notes': category_str,
@@ -97,7 +68,10 @@ for i, row in enumerate(ws_txn.iter_rows(min_row=2, max_row=1200, values_only=Tr
     })
     
     app_category_totals[app_cat]['count'] += 1
-    app_category_totals[app_cat]['amount'] += abs(float(amount))
+    app_category_totals[app_cat]['amount'] += pence
+
+# Content-addressed ids, occurrences counted in sheet order
+transactions = assign_ids(transactions)
 
 # Sort by date descending
 transactions.sort(key=lambda x: x['date'], reverse=True)
@@ -110,7 +84,7 @@ print("\nApp Category Totals:")
 for cat in ['income', 'bill', 'giving', 'allowance', 'savings', 'other']:
     if cat in app_category_totals:
         data = app_category_totals[cat]
-        print(f"  {cat:12} Count: {data['count']:3}  Amount: £{data['amount']:8.2f}")
+        print(f"  {cat:12} Count: {data['count']:3}  Amount: £{pounds(data['amount']):8.2f}")
 
 total_outflow = (app_category_totals.get('bill', {'amount': 0})['amount'] +
                 app_category_totals.get('giving', {'amount': 0})['amount'] +
@@ -118,15 +92,15 @@ total_outflow = (app_category_totals.get('bill', {'amount': 0})['amount'] +
                 app_category_totals.get('savings', {'amount': 0})['amount'] +
                 app_category_totals.get('other', {'amount': 0})['amount'])
 
-print(f"\n  INCOME         £{app_category_totals['income']['amount']:8.2f}")
-print(f"  EXPENSES       £{total_outflow:8.2f}")
-print(f"  NET            £{app_category_totals['income']['amount'] - total_outflow:8.2f}")
+print(f"\n  INCOME         £{pounds(app_category_totals['income']['amount']):8.2f}")
+print(f"  EXPENSES       £{pounds(total_outflow):8.2f}")
+print(f"  NET            £{pounds(app_category_totals['income']['amount'] - total_outflow):8.2f}")
 
 if unmapped:
     print(f"\n\nUnmapped items ({len(unmapped)}):")
     for cat in sorted(unmapped.keys()):
         data = unmapped[cat]
-        print(f"  '{cat}' - Count: {data['count']}, Amount: £{data['amount']:.2f}")
+        print(f"  '{cat}' - Count: {data['count']}, Amount: £{pounds(data['amount']):.2f}")
 
 # Save to JSON
 output_file = 'period1_transactions_final.json'
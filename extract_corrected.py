@@ -1,9 +1,13 @@
-import openpyxl
 import json
 from datetime import datetime
 
+from categorizer import Categorizer
+from formula_eval import evaluated_rows
+from money import pounds, to_pence
+from transaction_table import TransactionTable
+from txn_ids import assign_ids
+
 excel_file = "FINAL_2026_Cashflow_System_AppleStyle_v3_Start22Dec2025 - Copy (2).xlsx"
-wb = openpyxl.load_workbook(excel_file, data_only=True)
 
 # First, map Excel items to correct app categories using Bills Schedule as reference
 bills_schedule_map = {
@@ -98,30 +102,26 @@ bills_schedule_map = {
     'Cake': 'allowance',
 }
 
+# Income markers, checked after the bills schedule keys
+excel_cat_map = {
+    'income': 'income',
+    'Income - FM': 'income',
+    'Income - McD': 'income',
+    'Income - Outlier': 'income',
+    'Income - Gifts': 'income',
+    'Outlier': 'income',
+    'December Salary': 'income',
+    'Interest': 'income',
+}
+
+# Both tables compiled once, bills schedule keys taking priority
+label_categorizer = Categorizer(list(bills_schedule_map.items()) + list(excel_cat_map.items()))
+
 def map_category(label, category_from_excel):
     """Map transaction label to correct app category"""
-    label_lower = label.lower()
-    
-    # Check exact word matches first
-    for key, cat in bills_schedule_map.items():
-        if key.lower() in label_lower:
-            return cat
-    
-    # Fallback to Excel category with mappings
-    excel_cat_map = {
-        'income': 'income',
-        'Income - FM': 'income',
-        'Income - McD': 'income',
-        'Income - Outlier': 'income',
-        'Income - Gifts': 'income',
-        'Outlier': 'income',
-        'December Salary': 'income',
-        'Interest': 'income',
-    }
-    
-    for key, cat in excel_cat_map.items():
-        if key.lower() in label_lower:
-            return cat
+    cat = label_categorizer.match(label)
+    if cat:
+        return cat
     
     # If it's marked as expense in Excel but we don't know the category
     if category_from_excel:
@@ -130,10 +130,9 @@ def map_category(label, category_from_excel):
     return 'other'
 
 # Read transactions from Transactions sheet
-ws_txn = wb['Transactions']
 
 transactions = []
-for i, row in enumerate(ws_txn.iter_rows(min_row=2, max_row=1200, values_only=True), 1):
+for i, row in enumerate(evaluated_rows(excel_file, 'Transactions', min_row=2, max_row=1200), 1):
     date = row[0]
     type_val = row[1]
     category = row[2]
@@ -165,16 +164,18 @@ for i, row in enumerate(ws_txn.iter_rows(min_row=2, max_row=1200, values_only=Tr
     label = str(description or category or '')
     
     transactions.append({
-        'id': f"txn-{len(transactions)+1}",
         'date': date_str,
         'label': label,
-        'amount': abs(float(amount)),
+        'amount': pounds(abs(to_pence(amount))),
         'type': txn_type,
         'category': app_cat,
         'notes': category,
         'linkedRuleId': 'savings' if app_cat == 'savings' else None
     })
 
+# Content-addressed ids, occurrences counted in sheet order
+transactions = assign_ids(transactions)
+
 # Sort by date descending (newest first)
 transactions.sort(key=lambda x: x['date'], reverse=True)
 
@@ -183,27 +184,22 @@ print("="*100)
 print(f"EXTRACTED {len(transactions)} Period 1 TRANSACTIONS")
 print("="*100)
 
-# Group by category
-from collections import defaultdict
-by_cat = defaultdict(list)
-by_type = defaultdict(lambda: {'count': 0, 'amount': 0})
-
-for txn in transactions:
-    by_cat[txn['category']].append(txn)
-    by_type[txn['type']]['count'] += 1
-    by_type[txn['type']]['amount'] += txn['amount']
+# Group by category and type: (count, pence) per group
+table = TransactionTable.from_records(transactions)
+by_cat = table.summarise('category')
+by_type = table.summarise('type')
 
 print("\nBy Category:")
 for cat in ['income', 'bill', 'giving', 'allowance', 'savings', 'other']:
     if cat in by_cat:
-        items = by_cat[cat]
-        total = sum(t['amount'] for t in items)
-        print(f"  {cat:12} {len(items):3} items  £{total:8.2f}")
+        count, total = by_cat[cat]
+        print(f"  {cat:12} {count:3} items  £{pounds(total):8.2f}")
 
 print("\nBy Type:")
 for typ in ['income', 'outflow', 'transfer']:
     if typ in by_type:
-        print(f"  {typ:12} {by_type[typ]['count']:3} items  £{by_type[typ]['amount']:8.2f}")
+        count, total = by_type[typ]
+        print(f"  {typ:12} {count:3} items  £{pounds(total):8.2f}")
 
 # Save to JSON
 output_file = 'period1_transactions_corrected.json'
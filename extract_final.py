@@ -1,6 +1,10 @@
-from openpyxl import load_workbook
 import json
-from datetime import datetime
+import sys
+from collections import Counter
+
+from excel_dates import decode_dates
+from formula_eval import evaluated_rows
+from txn_ids import content_key, transaction_id
 
 excel_path = r'c:\Users\josho\OneDrive\Documents\Finance-Apps\FINAL_2026_Cashflow_System_AppleStyle_v3_Start22Dec2025 - Copy (2).xlsx'
 
@@ -36,36 +40,33 @@ def map_to_type_and_category(excel_type, excel_category):
     return "outflow", "other"
 
 try:
-    wb = load_workbook(excel_path)
-    transactions_sheet = wb['Transactions']
-    
+    # Formula cells come back recomputed rather than as their "=..." source
     transactions = []
-    txn_id = 1
+    # Notes here are column H, so ids are keyed on column C directly
+    occurrences = Counter()
     
-    for i, row in enumerate(transactions_sheet.iter_rows(values_only=True), 1):
-        if i == 1:  # Skip header row
-            continue
-        
+    rows = list(evaluated_rows(excel_path, 'Transactions', min_row=2))
+    # Column A in one pass: datetimes, serials and dd/mm/yyyy text
+    decoded = decode_dates(row[0] if row else None for row in rows)
+    dates = decoded.as_dates()
+    
+    for i, row in enumerate(rows):
         if not any(row):  # Skip empty rows
             continue
         
         # Extract columns
-        date_val = row[0]
+        date_val = dates[i]
         type_val = row[1]
         category_val = row[2]
         description = row[3]
         amount = row[4]
-        notes = row[7] if row[7] and not str(row[7]).startswith("=") else ""
+        notes = row[7] or ""
         
         # Skip if no date or amount
         if not date_val or amount is None:
             continue
         
-        # Format date
-        if isinstance(date_val, datetime):
-            date_str = date_val.strftime("%Y-%m-%d")
-        else:
-            date_str = str(date_val)
+        date_str = date_val.isoformat()
         
         # Map type and category
         mapped_type, mapped_category = map_to_type_and_category(type_val, category_val)
@@ -77,8 +78,9 @@ try:
             continue
         
         # Create transaction
+        key = content_key(date_str, amount_float, description, category_val)
         txn = {
-            "id": f"txn-{txn_id}",
+            "id": transaction_id(date_str, amount_float, description, category_val, occurrences[key]),
             "date": date_str,
             "label": str(description) if description else "",
             "amount": amount_float,
@@ -88,7 +90,7 @@ try:
         }
         
         transactions.append(txn)
-        txn_id += 1
+        occurrences[key] += 1
     
     # Output as JSON
     json_output = json.dumps(transactions, indent=2)
@@ -98,7 +100,9 @@ try:
     with open(r'c:\Users\josho\OneDrive\Documents\Finance-Apps\transactions_extracted.json', 'w') as f:
         f.write(json_output)
     
-    print(f"\n\n// Successfully extracted {len(transactions)} transactions", file=__import__('sys').stderr)
+    print(f"\n\n// Successfully extracted {len(transactions)} transactions", file=sys.stderr)
+    if len(decoded.failed):
+        print(f"// Skipped rows with unreadable dates: {decoded.failed_rows(2)}", file=sys.stderr)
 
 except Exception as e:
     print(f"Error: {e}")
@@ -1,20 +1,23 @@
-import openpyxl
 import json
 from datetime import datetime
 from collections import defaultdict
 
+from formula_eval import WorkbookEvaluator
+from money import pounds, to_pence
+from txn_ids import assign_ids
+
 excel_file = "FINAL_2026_Cashflow_System_AppleStyle_v3_Start22Dec2025 - Copy (2).xlsx"
-wb = openpyxl.load_workbook(excel_file, data_only=True)
+# Formulas (Period in column I) are recomputed, not read from Excel's cache
+wb = WorkbookEvaluator(excel_file)
 
 # Read Bills Schedule to understand the category mapping
 print("="*100)
 print("BILLS SCHEDULE - DEFINES THE CATEGORY NAMES")
 print("="*100)
 
-ws_bills = wb['Bills Schedule']
 bills_schedule_names = []
 
-for i, row in enumerate(ws_bills.iter_rows(min_row=3, max_row=25, values_only=True), 1):
+for i, row in enumerate(wb.rows('Bills Schedule', min_row=3, max_row=25), 1):
     bill_name = row[0]
     if bill_name and bill_name.strip() and i < 23:  # Skip the summary rows at bottom
         bills_schedule_names.append(bill_name)
@@ -27,11 +30,10 @@ print("\n" + "="*100)
 print("TRANSACTIONS BY CATEGORY (Column C) - PERIOD 1")
 print("="*100)
 
-ws_txn = wb['Transactions']
 
 categories_in_transactions = defaultdict(lambda: {'count': 0, 'amount': 0, 'examples': []})
 
-for i, row in enumerate(ws_txn.iter_rows(min_row=2, max_row=1200, values_only=True), 2):
+for i, row in enumerate(wb.rows('Transactions', min_row=2, max_row=1200), 2):
     date = row[0]
     txn_type = row[1]
     category = row[2]
@@ -44,14 +46,14 @@ for i, row in enumerate(ws_txn.iter_rows(min_row=2, max_row=1200, values_only=Tr
     
     cat_name = str(category) if category else 'None'
     categories_in_transactions[cat_name]['count'] += 1
-    categories_in_transactions[cat_name]['amount'] += abs(float(amount)) if amount else 0
+    categories_in_transactions[cat_name]['amount'] += abs(to_pence(amount))
     if len(categories_in_transactions[cat_name]['examples']) < 2:
         categories_in_transactions[cat_name]['examples'].append(description)
 
 print("\nCategories in Transactions sheet (Period 1):")
 for cat in sorted(categories_in_transactions.keys()):
     data = categories_in_transactions[cat]
-    print(f"  '{cat:35}' Count: {data['count']:3}  Amount: £{data['amount']:8.2f}  Examples: {data['examples']}")
+    print(f"  '{cat:35}' Count: {data['count']:3}  Amount: £{pounds(data['amount']):8.2f}  Examples: {data['examples']}")
 
 # Now map them to app categories based on Bills Schedule
 print("\n" + "="*100)
@@ -92,7 +94,7 @@ transactions = []
 app_category_totals = defaultdict(lambda: {'count': 0, 'amount': 0})
 unmapped = set()
 
-for i, row in enumerate(ws_txn.iter_rows(min_row=2, max_row=1200, values_only=True), 2):
+for i, row in enumerate(wb.rows('Transactions', min_row=2, max_row=1200), 2):
     date = row[0]
     txn_type = row[1]
     category = row[2]
@@ -132,12 +134,12 @@ for i, row in enumerate(ws_txn.iter_rows(min_row=2, max_row=1200, values_only=Tr
         final_type = 'outflow'
     
     label = str(description or category or '')
+    pence = abs(to_pence(amount))
     
     transactions.append({
-        'id': f"txn-{len(transactions)+1}",
         'date': date_str,
         'label': label,
-        'amount': abs(float(amount)),
+        'amount': pounds(pence),
         'type': final_type,
         'category': app_cat,
         'notes': str(category) if category else '',
@@ -145,7 +147,10 @@ for i, row in enumerate(ws_txn.iter_rows(min_row=2, max_row=1200, values_only=Tr
     })
     
     app_category_totals[app_cat]['count'] += 1
-    app_category_totals[app_cat]['amount'] += abs(float(amount))
+    app_category_totals[app_cat]['amount'] += pence
+
+# Content-addressed ids, occurrences counted in sheet order
+transactions = assign_ids(transactions)
 
 # Sort by date
 transactions.sort(key=lambda x: x['date'], reverse=True)
@@ -154,14 +159,14 @@ print("\nApp Category Totals:")
 for cat in ['income', 'bill', 'giving', 'allowance', 'savings', 'other']:
     if cat in app_category_totals:
         data = app_category_totals[cat]
-        print(f"  {cat:12} Count: {data['count']:3}  Amount: £{data['amount']:8.2f}")
+        print(f"  {cat:12} Count: {data['count']:3}  Amount: £{pounds(data['amount']):8.2f}")
 
 if unmapped:
     print(f"\nUnmapped categories ({len(unmapped)}):")
     for cat in sorted(unmapped):
         count = categories_in_transactions[cat]['count']
         amt = categories_in_transactions[cat]['amount']
-        print(f"  '{cat:30}' Count: {count:3}  Amount: £{amt:8.2f}")
+        print(f"  '{cat:30}' Count: {count:3}  Amount: £{pounds(amt):8.2f}")
 
 # Save to JSON
 output_file = 'period1_transactions_final.json'
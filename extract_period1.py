@@ -1,13 +1,19 @@
 import openpyxl
-from datetime import datetime
+from collections import Counter
 import json
 
+from excel_dates import decode_dates
+from money import pounds
+from transaction_table import TransactionTable
+from txn_ids import content_key, transaction_id
+
 file_path = 'FINAL_2026_Cashflow_System_AppleStyle_v3_Start22Dec2025 - Copy (2).xlsx'
 wb = openpyxl.load_workbook(file_path, data_only=True)
 ws = wb['Transactions']
 
 transactions = []
-txn_id = 1
+# Notes here are column H, so ids are keyed on column C directly
+occurrences = Counter()
 
 # Map Excel categories to app categories
 category_map = {
@@ -38,6 +44,10 @@ type_map = {
 }
 
 print("Extracting Period 1 transactions...")
+# Column A in one pass: datetimes, serials and dd/mm/yyyy text
+decoded = decode_dates(ws.cell(row_idx, 1).value for row_idx in range(2, ws.max_row + 1))
+dates = decoded.as_dates()
+
 for row_idx in range(2, ws.max_row + 1):
     period = ws.cell(row_idx, 9).value
     
@@ -45,7 +55,7 @@ for row_idx in range(2, ws.max_row + 1):
     if period != 1:
         continue
     
-    date_val = ws.cell(row_idx, 1).value
+    date_val = dates[row_idx - 2]
     type_val = ws.cell(row_idx, 2).value
     category_val = ws.cell(row_idx, 3).value
     desc_val = ws.cell(row_idx, 4).value
@@ -56,11 +66,7 @@ for row_idx in range(2, ws.max_row + 1):
     if not date_val or amount_val is None:
         continue
     
-    # Convert date
-    if isinstance(date_val, datetime):
-        date_str = date_val.strftime('%Y-%m-%d')
-    else:
-        date_str = str(date_val)[:10]
+    date_str = date_val.isoformat()
     
     # Map category
     app_category = category_map.get(category_val, 'other')
@@ -75,8 +81,9 @@ for row_idx in range(2, ws.max_row + 1):
         app_category = 'savings'
     
     # Build transaction
+    key = content_key(date_str, amount_val, desc_val, category_val)
     txn = {
-        'id': f'txn-{txn_id}',
+        'id': transaction_id(date_str, amount_val, desc_val, category_val, occurrences[key]),
         'date': date_str,
         'label': desc_val if desc_val else 'Transaction',
         'amount': amount_val,
@@ -90,14 +97,17 @@ for row_idx in range(2, ws.max_row + 1):
         txn['linkedRuleId'] = 'savings'
     
     transactions.append(txn)
-    txn_id += 1
+    occurrences[key] += 1
 
 print(f"Extracted {len(transactions)} Period 1 transactions")
+if len(decoded.failed):
+    print(f"Rows with unreadable dates: {decoded.failed_rows(2)}")
 
 # Summary stats
-income_total = sum(t['amount'] for t in transactions if t['type'] == 'income')
-expense_total = sum(t['amount'] for t in transactions if t['type'] == 'outflow')
-transfer_total = sum(t['amount'] for t in transactions if t['type'] == 'transfer')
+by_type = TransactionTable.from_records(transactions).sum_by('type')
+income_total = pounds(by_type.get('income', 0))
+expense_total = pounds(by_type.get('outflow', 0))
+transfer_total = pounds(by_type.get('transfer', 0))
 
 print(f"\nSummary:")
 print(f"  Income: £{income_total:.2f}")
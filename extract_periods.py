@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Extract every period's transactions from the workbook in a single pass.
+
+Each Transactions row is read once and assigned to its period, using the
+cached column I value when present and the buildPeriods2026 boundaries
+otherwise. Writes one period{N}_transactions.json per period, or a single
+partitioned JSON keyed by period id with --partitioned.
+
+Usage:
+    python extract_periods.py [--workbook PATH] [--out-dir DIR]
+    python extract_periods.py --partitioned all_periods.json
+    python extract_periods.py --incremental   # only rows added since last run (ingest.py)
+"""
+
+import argparse
+import json
+import os
+import warnings
+from collections import defaultdict
+
+from category_mapping import load_category_mapping
+from money import format_pounds, pounds, to_pence
+from periods import PeriodIndex, build_periods_2026
+from txn_ids import assign_ids
+from workbook_reader import WORKBOOK_PATH, iter_transactions
+
+
+def to_plan_transaction(rec, category_mapping):
+    """Convert a TransactionRecord into the plan.ts Transaction shape (minus id)."""
+    category_str = rec.category or ''
+
+    if rec.type == 'Income':
+        txn_type = 'income'
+        app_cat = 'income'
+    elif rec.type == 'Transfer':
+        txn_type = 'transfer'
+        app_cat = 'savings'
+    else:
+        txn_type = 'outflow'
+        app_cat = category_mapping.get(category_str, 'other')
+
+    return {
+        'date': rec.date.strftime('%Y-%m-%d'),
+        'label': rec.description or category_str,
+        'amount': pounds(abs(to_pence(rec.amount))),
+        'type': txn_type,
+        'category': app_cat,
+        'notes': category_str,
+        'linkedRuleId': 'savings' if app_cat == 'savings' else None,
+    }
+
+
+def partition_transactions(path=WORKBOOK_PATH, periods=None, records=None):
+    """Read the Transactions sheet once and bucket rows by period id.
+
+    Returns ({period_id: [transaction, ...]}, unassigned_count). Rows without
+    a date or a non-zero amount are ignored; dated rows outside every period
+    are counted as unassigned. records replaces the sheet read with already
+    loaded TransactionRecords (e.g. WorkbookSnapshot.iter_transactions()).
+    """
+    index = PeriodIndex(periods if periods is not None else build_periods_2026())
+    category_mapping = load_category_mapping(path)
+
+    by_period = defaultdict(list)
+    unassigned = 0
+    unmapped = set()
+
+    for rec in (iter_transactions(path) if records is None else records):
+        if rec.date is None or not rec.amount:
+            continue
+
+        period_id = rec.period
+        if period_id is None:
+            period_id = index.period_id(rec.date)
+        if period_id is None:
+            unassigned += 1
+            continue
+
+        txn = to_plan_transaction(rec, category_mapping)
+        if txn['type'] == 'outflow' and txn['notes'] and txn['notes'] not in category_mapping:
+            unmapped.add(txn['notes'])
+        by_period[period_id].append(txn)
+
+    if unmapped:
+        warnings.warn(f"Column C categories not in the workbook's mapping, extracted as 'other': "
+                      f"{', '.join(sorted(unmapped))}", stacklevel=2)
+
+    for period_id, txns in by_period.items():
+        txns[:] = assign_ids(txns)
+        txns.sort(key=lambda t: t['date'])
+
+    return dict(sorted(by_period.items())), unassigned
+
+
+def print_period_totals(by_period, unassigned: int = 0) -> None:
+    print(f"{'Period':>6} {'Txns':>5} {'Income':>11} {'Outflow':>11} {'Transfer':>11}")
+    print('-' * 48)
+    for period_id, txns in by_period.items():
+        totals = defaultdict(int)
+        for t in txns:
+            totals[t['type']] += to_pence(t['amount'])
+        print(f"{period_id:>6} {len(txns):>5} {format_pounds(totals['income']):>11} "
+              f"{format_pounds(totals['outflow']):>11} {format_pounds(totals['transfer']):>11}")
+    if unassigned:
+        print(f'\n{unassigned} dated rows fall outside every period')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workbook', default=WORKBOOK_PATH)
+    parser.add_argument('--out-dir', default='.', help='directory for period{N}_transactions.json files')
+    parser.add_argument('--partitioned', metavar='FILE', help='write a single JSON keyed by period id instead')
+    parser.add_argument('--incremental', action='store_true',
+                        help='convert only rows appended since the last run (see ingest.py)')
+    args = parser.parse_args()
+
+    if args.incremental:
+        from ingest import ingest
+
+        by_period, unassigned = ingest(args.workbook)[:2]
+    else:
+        by_period, unassigned = partition_transactions(args.workbook)
+
+    print_period_totals(by_period, unassigned)
+
+    if args.partitioned:
+        with open(args.partitioned, 'w') as f:
+            json.dump({str(k): v for k, v in by_period.items()}, f, indent=2)
+        print(f'\nSaved {len(by_period)} periods to {args.partitioned}')
+    else:
+        os.makedirs(args.out_dir, exist_ok=True)
+        for period_id, txns in by_period.items():
+            out = os.path.join(args.out_dir, f'period{period_id}_transactions.json')
+            with open(out, 'w') as f:
+                json.dump(txns, f, indent=2)
+        print(f'\nSaved {len(by_period)} period files to {args.out_dir}')
+
+
+if __name__ == '__main__':
+    main()
@@ -5,74 +5,32 @@ Re-extract and categorize all transactions using Excel Column C as source of tru
 
 import openpyxl
 import re
-from datetime import datetime
+
+from category_mapping import load_category_mapping
+from excel_dates import decode_dates
+from txn_ids import assign_ids
 
 wb = openpyxl.load_workbook('FINAL_2026_Cashflow_System_AppleStyle_v3_Start22Dec2025 - Copy (2).xlsx', data_only=True)
 trans_sheet = wb['Transactions']
 
-# Mapping from Excel Bills Schedule / Budget by Period to app categories
-category_mapping = {
-    # Bills/Fixed
-    'Rent': 'bill',
-    'Insurance': 'bill',
-    'Road Tax': 'bill',
-    'Water Bill': 'bill',
-    'Community Fibre / Internet': 'bill',
-    'Electricity & Gas': 'bill',
-    'iPhone Payments': 'bill',
-    'Parents': 'bill',
-    'Credit Card Payment': 'bill',
-    'Fuel': 'bill',
-    'House Keep': 'bill',
-    'Laptop': 'bill',
-    'One-Off Giving (Christmas)': 'bill',
-    
-    # Giving
-    'Tithe': 'giving',
-    'Tithe ': 'giving',  # with trailing space
-    'Offerings': 'giving',
-    'Charity - Perez Uni': 'giving',
-    'Charity - JPC Utilities': 'giving',
-    'Donations (Variable)': 'giving',
-    
-    # Allowance/Variable
-    'Others': 'allowance',
-    'Uber - TfL': 'allowance',
-    
-    # Savings
-    'Savings Transfer': 'savings',
-    
-    # Income
-    'Income - FM': 'income',
-    'Income - McD': 'income',
-    'Income - Outlier': 'income',
-    'Income - Gifts': 'income',
-}
+# Mapping from the workbook's category list to app categories
+category_mapping = load_category_mapping()
 
 transactions = []
-txn_count = 0
+
+# Column A in one pass: datetimes, serials and dd/mm/yyyy text
+decoded = decode_dates(trans_sheet[f'A{row}'].value for row in range(2, 2000))
+dates = decoded.as_dates()
 
 for row in range(2, 2000):
     period = trans_sheet[f'I{row}'].value
     if period != 1:  # Only Period 1
         continue
     
-    date_val = trans_sheet[f'A{row}'].value
+    date_val = dates[row - 2]
     if not date_val:
         continue
-    
-    # Parse date
-    if isinstance(date_val, str):
-        try:
-            date_obj = datetime.strptime(date_val, '%d/%m/%Y')
-            date_str = date_obj.strftime('%Y-%m-%d')
-        except:
-            continue
-    else:
-        date_str = date_val.strftime('%Y-%m-%d') if date_val else None
-    
-    if not date_str:
-        continue
+    date_str = date_val.isoformat()
     
     description = trans_sheet[f'D{row}'].value or ''
     category_col = trans_sheet[f'C{row}'].value or 'Others'
@@ -96,9 +54,7 @@ for row in range(2, 2000):
     category = category_mapping.get(category_col, 'allowance')
     
     # Create transaction
-    txn_count += 1
     txn = {
-        'id': f'txn-{txn_count}',
         'date': date_str,
         'label': str(description)[:60],
         'amount': amount,
@@ -110,7 +66,12 @@ for row in range(2, 2000):
     
     transactions.append(txn)
 
+# Content-addressed ids, occurrences counted in sheet order
+transactions = assign_ids(transactions)
+
 print(f"Extracted {len(transactions)} transactions from Excel Period 1")
+if len(decoded.failed):
+    print(f"Rows with unreadable dates: {decoded.failed_rows(2)}")
 print()
 
 # Count by category
@@ -0,0 +1,69 @@
+"""
+On-disk cache entries keyed by a source file's identity.
+
+An entry stores the source's mtime, size and SHA-256 alongside its payload.
+It is reused when mtime and size still match, or, when only the metadata
+moved (a copy, a touch, a re-save without edits), when the content hash is
+unchanged. Anything else is a miss and the caller rebuilds.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Optional
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+
+
+def sha256_file(path: str, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def cache_path(namespace: str, source_path: str) -> str:
+    """Cache file for source_path within namespace (one entry per source path)."""
+    key = hashlib.sha1(os.path.abspath(source_path).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, namespace, key + '.json')
+
+
+def load_cached(namespace: str, source_path: str, version: int) -> Optional[Any]:
+    """Payload cached for source_path, or None if missing or stale."""
+    entry_path = cache_path(namespace, source_path)
+    try:
+        with open(entry_path) as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if entry.get('version') != version:
+        return None
+
+    st = os.stat(source_path)
+    if entry.get('mtime_ns') == st.st_mtime_ns and entry.get('size') == st.st_size:
+        return entry['payload']
+    if entry.get('size') == st.st_size and entry.get('sha256') == sha256_file(source_path):
+        # Same content, new metadata: refresh so the next check is cheap again
+        store_cached(namespace, source_path, version, entry['payload'], entry['sha256'])
+        return entry['payload']
+    return None
+
+
+def store_cached(namespace: str, source_path: str, version: int, payload: Any,
+                 sha256: Optional[str] = None) -> None:
+    st = os.stat(source_path)
+    entry = {
+        'version': version,
+        'source': os.path.abspath(source_path),
+        'mtime_ns': st.st_mtime_ns,
+        'size': st.st_size,
+        'sha256': sha256 or sha256_file(source_path),
+        'payload': payload,
+    }
+    entry_path = cache_path(namespace, source_path)
+    os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+    tmp_path = entry_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, entry_path)
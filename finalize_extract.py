@@ -1,43 +1,22 @@
-import openpyxl
 import json
 from datetime import datetime
 
+from category_mapping import load_category_mapping
+from formula_eval import evaluated_rows
+from money import pounds, to_pence
+from txn_ids import assign_ids
+
 excel_file = "FINAL_2026_Cashflow_System_AppleStyle_v3_Start22Dec2025 - Copy (2).xlsx"
-wb = openpyxl.load_workbook(excel_file, data_only=True)
-
-# Complete mapping with handling for trailing spaces
-category_to_app = {
-    'Rent': 'bill',
-    'Insurance': 'bill',
-    'Road Tax': 'bill',
-    'Water Bill': 'bill',
-    'Electricity & Gas': 'bill',
-    'Community Fibre / Internet': 'bill',
-    'iPhone Payments': 'bill',
-    'Parents': 'bill',
-    'Credit Card Payment': 'bill',
-    'Fuel': 'bill',
-    'Laptop': 'bill',
-    'Tithe': 'giving',
-    'Tithe ': 'giving',  # With trailing space
-    'Offerings': 'giving',
-    'Charity - Perez Uni': 'giving',
-    'Charity - JPC Utilities': 'giving',
-    'Donations (Variable)': 'giving',
-    'House Keep': 'allowance',
-    'Others': 'allowance',
-    'Uber - TfL': 'allowance',
-    'One-Off Giving (Christmas)': 'other',
-    'Savings Transfer': 'savings',
-}
+
+# Column C -> app category; lookups ignore trailing spaces ('Tithe ')
+category_to_app = load_category_mapping(excel_file)
 
 # Extract transactions
 transactions = []
 app_category_totals = {'income': 0, 'bill': 0, 'giving': 0, 'allowance': 0, 'savings': 0, 'other': 0}
 
-ws_txn = wb['Transactions']
 
-for i, row in enumerate(ws_txn.iter_rows(min_row=2, max_row=1200, values_only=True), 2):
+for i, row in enumerate(evaluated_rows(excel_file, 'Transactions', min_row=2, max_row=1200), 2):
     date = row[0]
     txn_type = row[1]
     category = row[2]
@@ -66,12 +45,12 @@ for i, row in enumerate(ws_txn.iter_rows(min_row=2, max_row=1200, values_only=Tr
         app_cat = category_to_app.get(category_str, 'other')
     
     label = str(description or category or '')
+    pence = abs(to_pence(amount))
     
     transactions.append({
-        'id': f"txn-{len(transactions)+1}",
         'date': date_str,
         'label': label,
-        'amount': abs(float(amount)),
+        'amount': pounds(pence),
         'type': final_type,
         'category': app_cat,
         'notes': category_str,
@@ -79,11 +58,14 @@ for i, row in enumerate(ws_txn.iter_rows(min_row=2, max_row=1200, values_only=Tr
     })
     
     if app_cat == 'income':
-        app_category_totals['income'] += abs(float(amount))
+        app_category_totals['income'] += pence
     elif final_type == 'transfer':
-        app_category_totals['savings'] += abs(float(amount))
+        app_category_totals['savings'] += pence
     else:
-        app_category_totals[app_cat] += abs(float(amount))
+        app_category_totals[app_cat] += pence
+
+# Content-addressed ids, occurrences counted in sheet order
+transactions = assign_ids(transactions)
 
 # Sort by date descending
 transactions.sort(key=lambda x: x['date'], reverse=True)
@@ -95,16 +77,16 @@ with open(output_file, 'w') as f:
 
 print(f"✓ Extracted {len(transactions)} transactions")
 print(f"\nBreakdown:")
-print(f"  Income:    £{app_category_totals['income']:8.2f}")
-print(f"  Bills:     £{app_category_totals['bill']:8.2f}")
-print(f"  Giving:    £{app_category_totals['giving']:8.2f}")
-print(f"  Allowance: £{app_category_totals['allowance']:8.2f}")
-print(f"  Savings:   £{app_category_totals['savings']:8.2f}")
-print(f"  Other:     £{app_category_totals['other']:8.2f}")
+print(f"  Income:    £{pounds(app_category_totals['income']):8.2f}")
+print(f"  Bills:     £{pounds(app_category_totals['bill']):8.2f}")
+print(f"  Giving:    £{pounds(app_category_totals['giving']):8.2f}")
+print(f"  Allowance: £{pounds(app_category_totals['allowance']):8.2f}")
+print(f"  Savings:   £{pounds(app_category_totals['savings']):8.2f}")
+print(f"  Other:     £{pounds(app_category_totals['other']):8.2f}")
 
 total_expenses = sum([app_category_totals[k] for k in ['bill', 'giving', 'allowance', 'savings', 'other']])
-print(f"\nTotal Expenses: £{total_expenses:.2f}")
-print(f"Net: £{app_category_totals['income'] - total_expenses:.2f}")
+print(f"\nTotal Expenses: £{pounds(total_expenses):.2f}")
+print(f"Net: £{pounds(app_category_totals['income'] - total_expenses):.2f}")
 
 # Print corrected budgets
 print(f"\n" + "="*80)
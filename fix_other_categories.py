@@ -3,110 +3,50 @@
 Map all "other" category transactions to their proper categories based on notes
 """
 
-# Read the file
-with open('cashflow-app/src/data/plan.ts', 'r') as f:
-    content = f.read()
-
-# Define mapping of notes patterns to correct categories
-mappings = [
-    # Giving-related
-    ("Utility Sacrifices", "giving"),
-    ("Mummy J and Mummy R", "giving"),  # Allowance/support for parents
-    ("December contribution", "giving"),
-    ("Tithe on McD", "giving"),
-    ("Sacrifice for", "giving"),
-    ("contribution", "giving"),
-    ("Donation", "giving"),
-    
-    # Bill-related  
-    ("One-Off Giving (Christmas)", "bill"),
-    ("Monzo payment", "bill"),
-    ("Laptop for December", "bill"),
-    ("Rent for December", "bill"),
-    ("Car insurance", "bill"),
-    ("insurance", "bill"),
-    ("Iphone payment", "bill"),
-    ("Iphone", "bill"),
-    ("iPhone", "bill"),
-    ("Fuel for", "bill"),
-    ("Fuel", "bill"),
-    ("Road tax", "bill"),
-    ("Community fibre", "bill"),
-    ("SkyMobile", "bill"),
-    ("Water", "bill"),
-    ("Electricity", "bill"),
-    ("Gas", "bill"),
-    ("Credit Card", "bill"),
-    ("Capital one", "bill"),
-]
-
-# Process each mapping
-changes = 0
-for pattern, new_category in mappings:
-    # Find transactions with this pattern in notes and category "other"
-    import re
-    
-    # Match pattern like: category: "other", notes: "..."
-    # But we need to be careful to only change if the note contains this pattern
-    
-    # Use a more sophisticated approach - find the transactions and update them
-    pattern_regex = f'(, notes: "[^"]*{re.escape(pattern)}[^"]*")'
-    
-    # Find all matches with category "other" before this notes field
-    matches = list(re.finditer(f'category: "other"(.*?{re.escape(pattern)}[^"]*")', content, re.DOTALL))
-    
-    # This is getting complicated. Let's just do targeted replacements
-    
-# Actually, let's be more direct and replace based on exact note values
-replacements = [
-    ('category: "other", notes: "One-Off Giving (Christmas)"', 'category: "bill", notes: "One-Off Giving (Christmas)"'),
-    ('category: "other", notes: "Utility sacrifice for December"', 'category: "giving", notes: "Utility sacrifice for December"'),
-    ('category: "other", notes: "Allowance for December"', 'category: "bill", notes: "Allowance for December"'),  # Actually Mummy J is in FIXED
-    ('category: "other", notes: "Monzo payment - Dec"', 'category: "bill", notes: "Monzo payment - Dec"'),
-    ('category: "other", notes: "December contribution"', 'category: "giving", notes: "December contribution"'),
-    ('category: "other", notes: "Gift for the Christmas Season"', 'category: "bill", notes: "Gift for the Christmas Season"'),  # Should be One-Off
-    ('category: "other", notes: "Fuel for Renault Scenic"', 'category: "bill", notes: "Fuel for Renault Scenic"'),
-    ('category: "other", notes: "last payment for iphone 13"', 'category: "bill", notes: "last payment for iphone 13"'),
-    ('category: "other", notes: "Capital one for Dec"', 'category: "bill", notes: "Capital one for Dec"'),
-    ('category: "other", notes: "Community fibre/ internet for December"', 'category: "bill", notes: "Community fibre/ internet for December"'),
-    ('category: "other", notes: "Laptop for December"', 'category: "bill", notes: "Laptop for December"'),
-    ('category: "other", notes: "Iphone payment"', 'category: "bill", notes: "Iphone payment"'),
-    ('category: "other", notes: "Support for lisence"', 'category: "bill", notes: "Support for lisence"'),
-    ('category: "other", notes: "Rent for December"', 'category: "bill", notes: "Rent for December"'),
-    ('category: "other", notes: "SkyMobile"', 'category: "bill", notes: "SkyMobile"'),
-    ('category: "other", notes: "EUI Ltd - insurance for the car"', 'category: "bill", notes: "EUI Ltd - insurance for the car"'),
-    ('category: "other", notes: "Fuel to Georges Kablan for 31st Night"', 'category: "bill", notes: "Fuel to Georges Kablan for 31st Night"'),
-    ('category: "other", notes: "on the 24/12 - Fuel"', 'category: "bill", notes: "on the 24/12 - Fuel"'),
-    ('category: "other", notes: "Tithe on McD"', 'category: "giving", notes: "Tithe on McD"'),
-    ('category: "other", notes: "Road tax for Dec"', 'category: "bill", notes: "Road tax for Dec"'),
-]
-
-for old, new in replacements:
-    if old in content:
-        content = content.replace(old, new)
-        changes += 1
+from plan_patcher import PlanPatcher
+
+# Exact note values of "other" transactions -> correct category
+NOTES_TO_CATEGORY = {
+    "One-Off Giving (Christmas)": "bill",
+    "Utility sacrifice for December": "giving",
+    "Allowance for December": "bill",  # Actually Mummy J is in FIXED
+    "Monzo payment - Dec": "bill",
+    "December contribution": "giving",
+    "Gift for the Christmas Season": "bill",  # Should be One-Off
+    "Fuel for Renault Scenic": "bill",
+    "last payment for iphone 13": "bill",
+    "Capital one for Dec": "bill",
+    "Community fibre/ internet for December": "bill",
+    "Laptop for December": "bill",
+    "Iphone payment": "bill",
+    "Support for lisence": "bill",
+    "Rent for December": "bill",
+    "SkyMobile": "bill",
+    "EUI Ltd - insurance for the car": "bill",
+    "Fuel to Georges Kablan for 31st Night": "bill",
+    "on the 24/12 - Fuel": "bill",
+    "Tithe on McD": "giving",
+    "Road tax for Dec": "bill",
+}
+
+# Parse once, apply every remap in one pass over the records
+patch = PlanPatcher()
+changes = patch.update(
+    lambda t: t.category == "other" and t.notes in NOTES_TO_CATEGORY,
+    category=lambda t: NOTES_TO_CATEGORY[t.notes],
+)
 
 print(f"Applied {changes} category updates")
 
-# Verify final state
-import re
-giving_count = len(re.findall(r'category: "giving"', content))
-bill_count = len(re.findall(r'category: "bill"', content))
-allowance_count = len(re.findall(r'category: "allowance"', content))
-other_count = len(re.findall(r'category: "other"', content))
-income_count = len(re.findall(r'category: "income"', content))
-savings_count = len(re.findall(r'category: "savings"', content))
-
+# Verify final state from the in-memory records
+deltas = patch.category_deltas()
 print()
 print("Final category distribution:")
-print(f"  income:   {income_count}")
-print(f"  bill:     {bill_count}")
-print(f"  giving:   {giving_count}")
-print(f"  allowance: {allowance_count}")
-print(f"  savings:  {savings_count}")
-print(f"  other:    {other_count} (should be 0)")
+for cat in ['income', 'bill', 'giving', 'allowance', 'savings', 'other']:
+    was, now, delta = deltas.get(cat, (0, 0, 0))
+    suffix = " (should be 0)" if cat == 'other' else ""
+    print(f"  {cat + ':':10} {now} ({delta:+d}){suffix}")
 
-with open('cashflow-app/src/data/plan.ts', 'w') as f:
-    f.write(content)
+patch.write()
 
 print("\n✓ File updated")
@@ -3,67 +3,40 @@
 Update transactions in plan.ts to recategorize based on notes field
 """
 
-# Read the file
-with open('cashflow-app/src/data/plan.ts', 'r') as f:
-    content = f.read()
+from plan_patcher import PlanPatcher
 
-# Count before
-import re
-allowance_count = len(re.findall(r'category: "allowance"', content))
-bill_count = len(re.findall(r'category: "bill"', content))
-other_count = len(re.findall(r'category: "other"', content))
-giving_count = len(re.findall(r'category: "giving"', content))
+patch = PlanPatcher()
 
+# Count before
+before = patch.category_counts()
 print(f"BEFORE:")
-print(f"  allowance: {allowance_count}")
-print(f"  bill: {bill_count}")
-print(f"  other: {other_count}")
-print(f"  giving: {giving_count}")
+for cat in ['allowance', 'bill', 'other', 'giving']:
+    print(f"  {cat}: {before[cat]}")
 print()
 
-# Replacements for transactions with House Keep notes (allowance -> bill)
-content = content.replace(
-    'category: "allowance", notes: "House Keep"',
-    'category: "bill", notes: "House Keep"'
-)
-
-# Count House Keep bills before this change
-house_keep_trans = len(re.findall(r'notes: "House Keep"', content))
-print(f"House Keep transactions to recategorize: {house_keep_trans} (should all be bill)")
+# Transactions with House Keep notes (allowance -> bill)
+house_keep = sum(1 for t in patch.transactions if t.notes == 'House Keep')
+patch.update(lambda t: t.category == 'allowance' and t.notes == 'House Keep', category='bill')
+print(f"House Keep transactions to recategorize: {house_keep} (should all be bill)")
 
-# Replacements for "One-Off Giving" and related (other -> bill)
-# Search for any "One-Off" references in transactions
-one_off_patterns = [
-    ('category: "other", notes: "One-Off Giving"', 'category: "bill", notes: "One-Off Giving"'),
-    # Also check for Christmas gift items
-]
+# "One-Off Giving" (other -> bill)
+count = patch.update(lambda t: t.category == 'other' and t.notes == 'One-Off Giving', category='bill')
+if count > 0:
+    print(f"Recategorized {count} One-Off Giving transactions: other -> bill")
 
-for old, new in one_off_patterns:
-    count = content.count(old)
-    if count > 0:
-        print(f"Replacing {count} occurrences of: {old[:50]}...")
-        content = content.replace(old, new)
-
-# Check for Donations - these might be labeled something else in transactions
-# Looking for transaction notes that map to "Donations (Variable)"
+# Donations might be labeled something else in transactions
 # From Excel, Donations appear as a category in GIVING
 
-# Count after
-allowance_count_after = len(re.findall(r'category: "allowance"', content))
-bill_count_after = len(re.findall(r'category: "bill"', content))
-other_count_after = len(re.findall(r'category: "other"', content))
-giving_count_after = len(re.findall(r'category: "giving"', content))
-
+# Count after, from the in-memory records
+deltas = patch.category_deltas()
 print()
 print(f"AFTER:")
-print(f"  allowance: {allowance_count_after} (was {allowance_count}, changed: {allowance_count - allowance_count_after})")
-print(f"  bill: {bill_count_after} (was {bill_count}, changed: {bill_count_after - bill_count})")
-print(f"  other: {other_count_after} (was {other_count}, changed: {other_count - other_count_after})")
-print(f"  giving: {giving_count_after} (was {giving_count}, changed: {giving_count_after - giving_count})")
+for cat in ['allowance', 'bill', 'other', 'giving']:
+    was, now, delta = deltas.get(cat, (0, 0, 0))
+    print(f"  {cat}: {now} (was {was}, changed: {delta:+d})")
 print()
 
-# Write back
-with open('cashflow-app/src/data/plan.ts', 'w') as f:
-    f.write(content)
+# Write back only the changed ranges
+patch.write()
 
 print("✓ Transactions recategorized and file updated")
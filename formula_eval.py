@@ -0,0 +1,598 @@
+#!/usr/bin/env python3
+"""
+Native evaluation of the workbook's formulas, one column at a time.
+
+data_only=True only ever sees the values Excel cached on its last save; a
+workbook written by a tool that does not recalculate has empty caches, and
+column I (Period) reads back as None. This module recomputes formulas from
+the cell inputs instead, covering what the cashflow workbook uses:
+
+- Transactions!I:   =IFERROR(MATCH(A2,'Periods 26-25'!$C$2:$C$13,1),"")
+- Budget by Period: =$C2, =SUMIFS(Transactions!$E:$E,...,Transactions!$I:$I,1), =E2-D2
+
+Evaluation is vectorised. Each formula is parsed once with its relative
+row references stored as offsets, so a filled-down column (Period, every
+Actuals column) collapses to one expression evaluated over all of its rows
+with NumPy: MATCH is a searchsorted, SUMIFS a single group-by. References to
+other columns and sheets evaluate those first, so Budget Actuals are summed
+over recomputed periods rather than cached ones.
+
+Anything outside that grammar (other functions, comparisons, relative
+ranges) keeps its cached value and is listed in .unsupported.
+
+Usage:
+    with WorkbookEvaluator(WORKBOOK_PATH) as wb:
+        periods = wb.column('Transactions', 'I')
+        for row in wb.rows('Budget by Period', min_row=2): ...
+
+    python formula_eval.py [--workbook PATH] [--sheet NAME ...]
+"""
+
+import argparse
+import re
+from datetime import date, datetime
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from xlsx_stream import XlsxReader, column_index, parse_columns
+
+ERRORS = frozenset(('#NULL!', '#DIV/0!', '#VALUE!', '#REF!', '#NAME?', '#NUM!', '#N/A'))
+
+_EXCEL_EPOCH = datetime(1899, 12, 30)
+
+_TOKEN_RE = re.compile(r"""
+    (?P<str>"(?:[^"]|"")*")
+  | (?P<ref>(?:(?:'(?:[^']|'')+'|[A-Za-z_][\w.]*)!)?
+            \$?[A-Z]{1,3}(?:\$?\d+(?::\$?[A-Z]{1,3}\$?\d+)?|:\$?[A-Z]{1,3}))(?![\w(])
+  | (?P<func>[A-Z][A-Z0-9.]*)\(
+  | (?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<op>[-+*/(),])
+  | (?P<ws>\s+)
+""", re.X)
+_CELL_RE = re.compile(r'\$?([A-Z]{1,3})(\$?)(\d+)$')
+_AREA_RE = re.compile(r'\$?([A-Z]{1,3})(\$?)(\d+):\$?([A-Z]{1,3})(\$?)(\d+)$')
+_COLUMNS_RE = re.compile(r'\$?([A-Z]{1,3}):\$?([A-Z]{1,3})$')
+
+
+class UnsupportedFormula(ValueError):
+    pass
+
+
+class StaleCell(NamedTuple):
+    sheet: str
+    ref: str
+    cached: object
+    evaluated: object
+
+
+def column_letter(index: int) -> str:
+    """0-based column index -> letters (0 -> 'A', 26 -> 'AA')."""
+    letters = ''
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+# -- parsing ---------------------------------------------------------------
+#
+# AST nodes are plain tuples, so identical filled-down formulas compare and
+# hash equal and can be grouped:
+#   ('num', float) ('str', text) ('neg', node) ('bin', op, left, right)
+#   ('cell', sheet, col, row, absolute)   row is an offset when not absolute
+#   ('range', sheet, col, first_row, last_row)   rows None: whole column
+#   ('call', NAME, (args...))
+
+def _tokens(formula: str) -> List[Tuple[str, str]]:
+    tokens = []
+    pos = 0
+    while pos < len(formula):
+        m = _TOKEN_RE.match(formula, pos)
+        if not m:
+            raise UnsupportedFormula(f'cannot tokenize {formula[pos:pos + 10]!r}')
+        pos = m.end()
+        if m.lastgroup != 'ws':
+            tokens.append((m.lastgroup, m.group(m.lastgroup)))
+    return tokens
+
+
+def _ref_node(text: str, origin_row: int):
+    sheet = None
+    if '!' in text:
+        sheet, text = text.rsplit('!', 1)
+        if sheet.startswith("'"):
+            sheet = sheet[1:-1].replace("''", "'")
+    m = _CELL_RE.match(text)
+    if m:
+        col, absolute, row = column_index(m.group(1)), bool(m.group(2)), int(m.group(3))
+        return ('cell', sheet, col, row if absolute else row - origin_row, absolute)
+    m = _AREA_RE.match(text)
+    if m:
+        if m.group(1) != m.group(4):
+            raise UnsupportedFormula('multi-column range')
+        if not (m.group(2) and m.group(5)):
+            raise UnsupportedFormula('relative range')
+        return ('range', sheet, column_index(m.group(1)), int(m.group(3)), int(m.group(6)))
+    m = _COLUMNS_RE.match(text)
+    if m and m.group(1) == m.group(2):
+        return ('range', sheet, column_index(m.group(1)), None, None)
+    raise UnsupportedFormula(f'reference {text}')
+
+
+def parse_formula(formula: str, origin_row: int):
+    """AST for a '=...' formula in row origin_row."""
+    tokens = _tokens(formula[1:] if formula.startswith('=') else formula)
+    pos = 0
+
+    def peek():
+        return tokens[pos] if pos < len(tokens) else (None, None)
+
+    def take(kind=None, text=None):
+        nonlocal pos
+        tok = peek()
+        if (kind and tok[0] != kind) or (text and tok[1] != text):
+            raise UnsupportedFormula(f'expected {text or kind}, got {tok[1]!r}')
+        pos += 1
+        return tok
+
+    def expr():
+        node = term()
+        while peek() in (('op', '+'), ('op', '-')):
+            node = ('bin', take()[1], node, term())
+        return node
+
+    def term():
+        node = factor()
+        while peek() in (('op', '*'), ('op', '/')):
+            node = ('bin', take()[1], node, factor())
+        return node
+
+    def factor():
+        if peek() == ('op', '-'):
+            take()
+            return ('neg', factor())
+        if peek() == ('op', '+'):
+            take()
+            return factor()
+        kind, text = peek()
+        if kind == 'num':
+            take()
+            return ('num', float(text))
+        if kind == 'str':
+            take()
+            return ('str', text[1:-1].replace('""', '"'))
+        if kind == 'ref':
+            take()
+            return _ref_node(text, origin_row)
+        if kind == 'func':
+            take()
+            args = []
+            if peek() != ('op', ')'):
+                args.append(expr())
+                while peek() == ('op', ','):
+                    take()
+                    args.append(expr())
+            take('op', ')')
+            return ('call', text.upper(), tuple(args))
+        if (kind, text) == ('op', '('):
+            take()
+            node = expr()
+            take('op', ')')
+            return node
+        raise UnsupportedFormula(f'unexpected {text!r}')
+
+    node = expr()
+    if pos != len(tokens):
+        raise UnsupportedFormula(f'trailing {tokens[pos][1]!r}')
+    return node
+
+
+# -- value helpers -----------------------------------------------------------
+
+def _is_error(value) -> bool:
+    return isinstance(value, str) and value in ERRORS
+
+
+def _number(value):
+    """Excel numeric coercion: (float, error or None)."""
+    if value is None:
+        return 0.0, None
+    if isinstance(value, bool):
+        return float(value), None
+    if isinstance(value, (int, float)):
+        return float(value), None
+    if isinstance(value, datetime):
+        return (value - _EXCEL_EPOCH).total_seconds() / 86400, None
+    if isinstance(value, date):
+        return float((value - _EXCEL_EPOCH.date()).days), None
+    if _is_error(value):
+        return np.nan, value
+    try:
+        return float(value), None
+    except (TypeError, ValueError):
+        return np.nan, '#VALUE!'
+
+
+def _numbers(values: np.ndarray):
+    """(float64 array, object array of errors or None) for an object array."""
+    pairs = [_number(v) for v in values]
+    nums = np.array([p[0] for p in pairs], dtype=np.float64)
+    errs = np.array([p[1] for p in pairs], dtype=object)
+    return nums, errs
+
+
+def _criterion_key(value) -> str:
+    # SUMIFS equality: text case-insensitive, numbers (and dates) by value,
+    # and an empty criterion cell counts as 0
+    if value is None:
+        return 'n:0.0'
+    if isinstance(value, str):
+        if value[:1] in '<>=' or '*' in value or '?' in value:
+            raise UnsupportedFormula(f'SUMIFS criterion {value!r}')
+        return 's:' + value.casefold()
+    number, err = _number(value)
+    return 'e:' + err if err else f'n:{number!r}'
+
+
+def _cell_key(value) -> str:
+    if value is None:
+        return 'b:'
+    if isinstance(value, str):
+        return 'e:' + value if _is_error(value) else 's:' + value.casefold()
+    return f'n:{_number(value)[0]!r}'
+
+
+def _result(value):
+    """Evaluated value as data_only would read it back."""
+    if isinstance(value, float):
+        if value.is_integer():
+            return int(value)
+        return value
+    if value == '':
+        return None
+    return value
+
+
+class _Range:
+    def __init__(self, values: np.ndarray, first_row: int):
+        self.values = values
+        self.first_row = first_row
+
+
+# -- sheets ------------------------------------------------------------------
+
+class _Sheet:
+    def __init__(self, name: str, cells: Dict[int, Dict[int, object]]):
+        self.name = name
+        self.max_row = max(cells, default=0)
+        self.max_col = max((max(row) for row in cells.values() if row), default=-1)
+        self.cached: Dict[int, np.ndarray] = {}
+        self.formulas: Dict[int, Dict[int, str]] = {}
+        for row_num, row in cells.items():
+            for col, cell in row.items():
+                if col not in self.cached:
+                    self.cached[col] = np.full(self.max_row + 1, None, dtype=object)
+                self.cached[col][row_num] = cell.value
+                if cell.formula is not None:
+                    self.formulas.setdefault(col, {})[row_num] = cell.formula
+        self.evaluated: Dict[int, np.ndarray] = {}
+        self.in_progress = set()
+
+    def cached_column(self, col: int) -> np.ndarray:
+        column = self.cached.get(col)
+        return column if column is not None else np.full(self.max_row + 1, None, dtype=object)
+
+
+class WorkbookEvaluator:
+    def __init__(self, path: str):
+        self.path = path
+        self._xl = XlsxReader(path)
+        self._sheets: Dict[str, _Sheet] = {}
+        # (sheet, cell ref) -> reason the cached value was kept
+        self.unsupported: Dict[Tuple[str, str], str] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._xl.close()
+
+    @property
+    def sheetnames(self) -> List[str]:
+        return self._xl.sheetnames
+
+    def _sheet(self, name: str) -> _Sheet:
+        sheet = self._sheets.get(name)
+        if sheet is None:
+            cells = dict(self._xl.iter_cells(name, formulas=True))
+            sheet = self._sheets[name] = _Sheet(name, cells)
+        return sheet
+
+    # -- public ------------------------------------------------------------
+
+    def column(self, sheet_name: str, col) -> np.ndarray:
+        """Evaluated values of one column, indexed by 1-based row number."""
+        if isinstance(col, str):
+            col = column_index(col)
+        sheet = self._sheet(sheet_name)
+        if col not in sheet.evaluated:
+            if col in sheet.in_progress:
+                raise UnsupportedFormula(f'circular reference through {sheet_name}!{column_letter(col)}')
+            sheet.in_progress.add(col)
+            try:
+                sheet.evaluated[col] = self._evaluate_column(sheet, col)
+            finally:
+                sheet.in_progress.discard(col)
+        return sheet.evaluated[col]
+
+    def rows(self, sheet_name: str, columns=None, min_row: int = 1,
+             max_row: Optional[int] = None) -> Iterator[tuple]:
+        """Evaluated rows, like openpyxl's iter_rows(values_only=True).
+
+        Without columns, tuples run from column A to the sheet's last
+        column; with columns, just those (letters or 0-based indices).
+        """
+        sheet = self._sheet(sheet_name)
+        wanted = parse_columns(columns)
+        if wanted is None:
+            wanted = list(range(sheet.max_col + 1))
+        data = [self.column(sheet_name, c) for c in wanted]
+        last = sheet.max_row if max_row is None else max_row
+        for row_num in range(min_row, last + 1):
+            if row_num > sheet.max_row:
+                yield (None,) * len(wanted)
+            else:
+                yield tuple(column[row_num] for column in data)
+
+    def evaluate(self, sheet_name: str, formula: str, row_num: int):
+        """Value of one formula as if entered in row row_num of sheet_name.
+
+        Only the columns it references are loaded, so a constant formula
+        (=65+75) reads nothing.
+        """
+        node = parse_formula(formula, row_num)
+        result = self._eval(node, _Sheet(sheet_name, {}), np.array([row_num], dtype=np.int64))
+        if isinstance(result, _Range):
+            raise UnsupportedFormula('formula evaluates to a range')
+        value = result[0]
+        if node[0] == 'cell' and value is None:
+            value = 0
+        return _result(value)
+
+    def stale(self, sheet_name: str) -> List[StaleCell]:
+        """Formula cells whose cached value differs from the evaluated one."""
+        sheet = self._sheet(sheet_name)
+        out = []
+        for col in sorted(sheet.formulas):
+            evaluated = self.column(sheet_name, col)
+            cached = sheet.cached_column(col)
+            for row_num in sorted(sheet.formulas[col]):
+                if not _same(cached[row_num], evaluated[row_num]):
+                    out.append(StaleCell(sheet_name, f'{column_letter(col)}{row_num}',
+                                         cached[row_num], evaluated[row_num]))
+        return out
+
+    # -- evaluation --------------------------------------------------------
+
+    def _evaluate_column(self, sheet: _Sheet, col: int) -> np.ndarray:
+        values = sheet.cached_column(col).copy()
+        groups: Dict[object, List[int]] = {}
+        for row_num, formula in sheet.formulas.get(col, {}).items():
+            try:
+                groups.setdefault(parse_formula(formula, row_num), []).append(row_num)
+            except UnsupportedFormula as e:
+                self.unsupported[(sheet.name, f'{column_letter(col)}{row_num}')] = str(e)
+        for node, row_nums in groups.items():
+            rows = np.array(row_nums, dtype=np.int64)
+            try:
+                result = self._eval(node, sheet, rows)
+                if isinstance(result, _Range):
+                    raise UnsupportedFormula('formula evaluates to a range')
+            except UnsupportedFormula as e:
+                for r in row_nums:
+                    self.unsupported[(sheet.name, f'{column_letter(col)}{r}')] = str(e)
+                continue
+            if node[0] == 'cell':
+                # =A1 on a blank cell shows 0, not blank
+                result = np.array([0 if v is None else v for v in result], dtype=object)
+            values[rows] = [_result(v) for v in result]
+        return values
+
+    def _eval(self, node, sheet: _Sheet, rows: np.ndarray):
+        kind = node[0]
+        n = rows.size
+        if kind in ('num', 'str'):
+            return np.full(n, node[1], dtype=object)
+        if kind == 'cell':
+            _, sheet_name, col, row, absolute = node
+            column = self.column(sheet_name or sheet.name, col)
+            target = np.full(n, row) if absolute else rows + row
+            out = np.full(n, None, dtype=object)
+            ok = (target >= 1) & (target < column.size)
+            out[ok] = column[target[ok]]
+            return out
+        if kind == 'range':
+            _, sheet_name, col, first, last = node
+            column = self.column(sheet_name or sheet.name, col)
+            if first is None:
+                return _Range(column[1:], 1)
+            padded = np.full(last + 1, None, dtype=object)
+            padded[:min(column.size, last + 1)] = column[:last + 1]
+            return _Range(padded[first:], first)
+        if kind == 'neg':
+            nums, errs = _numbers(self._eval(node[1], sheet, rows))
+            return _combine(-nums, errs)
+        if kind == 'bin':
+            return self._binary(node[1], self._eval(node[2], sheet, rows), self._eval(node[3], sheet, rows))
+        if kind == 'call':
+            handler = _FUNCTIONS.get(node[1])
+            if handler is None:
+                raise UnsupportedFormula(f'function {node[1]}')
+            return handler(self, [self._eval(arg, sheet, rows) for arg in node[2]], n)
+        raise UnsupportedFormula(f'node {kind}')
+
+    @staticmethod
+    def _binary(op, left, right):
+        if isinstance(left, _Range) or isinstance(right, _Range):
+            raise UnsupportedFormula('arithmetic on a range')
+        a, a_err = _numbers(left)
+        b, b_err = _numbers(right)
+        errs = np.where(a_err != None, a_err, b_err)  # noqa: E711 (elementwise)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if op == '+':
+                out = a + b
+            elif op == '-':
+                out = a - b
+            elif op == '*':
+                out = a * b
+            else:
+                out = a / b
+                errs = np.where((errs == None) & (b == 0), '#DIV/0!', errs)  # noqa: E711
+        return _combine(out, errs)
+
+
+def _combine(nums: np.ndarray, errs: np.ndarray) -> np.ndarray:
+    out = nums.astype(object)
+    has_err = errs != None  # noqa: E711
+    out[has_err] = errs[has_err]
+    return out
+
+
+def _same(cached, evaluated) -> bool:
+    if cached == '':
+        cached = None
+    if isinstance(cached, (int, float)) and isinstance(evaluated, (int, float)) \
+            and not isinstance(cached, bool):
+        return abs(cached - evaluated) <= 1e-9 * max(1.0, abs(cached))
+    return cached == evaluated
+
+
+# -- functions -------------------------------------------------------------
+
+def _fn_iferror(ev, args, n):
+    if len(args) != 2:
+        raise UnsupportedFormula('IFERROR arity')
+    value, fallback = args
+    mask = np.array([_is_error(v) for v in value], dtype=bool)
+    out = value.copy()
+    out[mask] = fallback[mask]
+    return out
+
+
+def _fn_match(ev, args, n):
+    if len(args) == 2:
+        args = args + [np.full(n, 1.0, dtype=object)]
+    value, lookup, match_type = args
+    if not isinstance(lookup, _Range):
+        raise UnsupportedFormula('MATCH needs a range')
+    types = {float(t) for t in match_type}
+    if types != {1.0}:
+        raise UnsupportedFormula('MATCH type other than 1')
+
+    # Approximate match over an ascending numeric range: the last position
+    # <= value, found by binary search like Excel
+    numeric = [(i, _number(v)[0]) for i, v in enumerate(lookup.values)
+               if isinstance(v, (int, float, date)) and not isinstance(v, bool)]
+    positions = np.array([i for i, _ in numeric], dtype=np.int64)
+    keys = np.array([k for _, k in numeric], dtype=np.float64)
+
+    is_number = np.array([isinstance(v, (int, float, date)) and not isinstance(v, bool)
+                          for v in value], dtype=bool)
+    x = np.array([_number(v)[0] if ok else np.nan for v, ok in zip(value, is_number)], dtype=np.float64)
+    found = np.searchsorted(keys, x, side='right')
+    out = np.full(n, '#N/A', dtype=object)
+    hit = is_number & (found > 0)
+    out[hit] = (positions[found[hit] - 1] + 1).astype(float)
+    errors = np.array([_is_error(v) for v in value], dtype=bool)
+    out[errors] = value[errors]
+    return out
+
+
+def _fn_sumifs(ev, args, n):
+    if len(args) < 3 or len(args) % 2 == 0:
+        raise UnsupportedFormula('SUMIFS arity')
+    sum_range, pairs = args[0], list(zip(args[1::2], args[2::2]))
+    if not isinstance(sum_range, _Range) or not all(isinstance(r, _Range) for r, _ in pairs):
+        raise UnsupportedFormula('SUMIFS needs ranges')
+    size = sum_range.values.size
+    if any(r.values.size != size or r.first_row != sum_range.first_row for r, _ in pairs):
+        raise UnsupportedFormula('SUMIFS ranges differ in shape')
+
+    # Only numbers are summed; text, blanks and booleans are skipped
+    amounts = np.array([float(v) if isinstance(v, (int, float)) and not isinstance(v, bool) else 0.0
+                        for v in sum_range.values], dtype=np.float64)
+
+    # Mixed-radix code over every criteria column, so matching rows share a
+    # group and one bincount gives every (criterion tuple) total
+    row_code = np.zeros(size, dtype=np.int64)
+    cell_code = np.zeros(n, dtype=np.int64)
+    cell_ok = np.ones(n, dtype=bool)
+    for crit_range, criterion in pairs:
+        uniques, inverse = np.unique(np.array([_cell_key(v) for v in crit_range.values], dtype=object).astype(str),
+                                     return_inverse=True)
+        wanted = np.array([_criterion_key(v) for v in criterion], dtype=str)
+        idx = np.searchsorted(uniques, wanted)
+        idx_clipped = np.minimum(idx, len(uniques) - 1) if len(uniques) else idx
+        found = (idx < len(uniques)) & (uniques[idx_clipped] == wanted) if len(uniques) else np.zeros(n, bool)
+        radix = len(uniques) + 1
+        row_code = row_code * radix + inverse
+        cell_code = cell_code * radix + np.where(found, idx_clipped, 0)
+        cell_ok &= found
+
+    totals_codes, group = np.unique(row_code, return_inverse=True)
+    totals = np.bincount(group, weights=amounts, minlength=len(totals_codes))
+    pos = np.searchsorted(totals_codes, cell_code)
+    pos_clipped = np.minimum(pos, max(len(totals_codes) - 1, 0))
+    hit = cell_ok & (pos < len(totals_codes))
+    if len(totals_codes):
+        hit &= totals_codes[pos_clipped] == cell_code
+    out = np.zeros(n, dtype=np.float64)
+    out[hit] = totals[pos_clipped[hit]]
+    return out.astype(object)
+
+
+_FUNCTIONS = {
+    'IFERROR': _fn_iferror,
+    'MATCH': _fn_match,
+    'SUMIFS': _fn_sumifs,
+}
+
+
+def evaluated_rows(path: str, sheet_name: str, columns=None, min_row: int = 1,
+                   max_row: Optional[int] = None) -> List[tuple]:
+    """Rows of one sheet with formulas recomputed (convenience wrapper)."""
+    with WorkbookEvaluator(path) as wb:
+        return list(wb.rows(sheet_name, columns, min_row, max_row))
+
+
+def main():
+    from workbook_reader import WORKBOOK_PATH
+
+    parser = argparse.ArgumentParser(description='Recompute workbook formulas and report stale caches')
+    parser.add_argument('--workbook', default=WORKBOOK_PATH)
+    parser.add_argument('--sheet', action='append',
+                        help="sheet to check (repeatable; default: Transactions and 'Budget by Period')")
+    args = parser.parse_args()
+
+    with WorkbookEvaluator(args.workbook) as wb:
+        for name in args.sheet or ['Transactions', 'Budget by Period']:
+            stale = wb.stale(name)
+            n_formulas = sum(len(f) for f in wb._sheet(name).formulas.values())
+            print(f'{name}: {n_formulas} formulas, {len(stale)} stale cached values')
+            for cell in stale[:20]:
+                print(f'  {cell.ref}: cached={cell.cached!r} evaluated={cell.evaluated!r}')
+            if len(stale) > 20:
+                print(f'  ... {len(stale) - 20} more')
+        if wb.unsupported:
+            print(f'{len(wb.unsupported)} formulas kept their cached value (unsupported):')
+            for (sheet, ref), reason in list(wb.unsupported.items())[:10]:
+                print(f'  {sheet}!{ref}: {reason}')
+
+
+if __name__ == '__main__':
+    main()
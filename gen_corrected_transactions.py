@@ -13,6 +13,9 @@ import json
 from datetime import datetime
 from collections import defaultdict
 
+from ts_emitter import emit_ts, transaction_literal
+from txn_ids import assign_ids
+
 # Define the mapping from Excel Column C (Category) to app category
 CATEGORY_MAPPING = {
     # Income
@@ -63,7 +66,6 @@ transactions = []
 period1_start = datetime(2025, 12, 22)
 period1_end = datetime(2026, 1, 25)
 
-txn_id = 0
 category_counts = defaultdict(lambda: {'count': 0, 'amount': 0})
 
 for row in range(2, ws.max_row + 1):
@@ -113,9 +115,7 @@ for row in range(2, ws.max_row + 1):
     else:
         continue
     
-    txn_id += 1
     transactions.append({
-        "id": f"txn-{txn_id}",
         "date": date_str,
         "label": str(desc_val),
         "amount": amount,
@@ -128,6 +128,9 @@ for row in range(2, ws.max_row + 1):
     category_counts[app_category]['count'] += 1
     category_counts[app_category]['amount'] += amount
 
+# Content-addressed ids, occurrences counted in sheet order
+transactions = assign_ids(transactions)
+
 # Summary
 print("="*80)
 print("PERIOD 1 TRANSACTION SUMMARY")
@@ -165,22 +168,11 @@ print(f"\nSaved {len(transactions)} transactions to period1_transactions_correct
 print(f"\n{'='*80}")
 print("Generating TypeScript format...")
 
-ts_lines = []
-for txn in transactions:
-    label = str(txn["label"]).replace('"', '\\"')
-    notes = str(txn["notes"]).replace('"', '\\"')
-    ts_lines.append(
-        f'    {{ id: "{txn["id"]}", date: "{txn["date"]}", label: "{label}", '
-        f'amount: {txn["amount"]}, type: "{txn["type"]}", category: "{txn["category"]}", '
-        f'notes: "{notes}", linkedRuleId: undefined }},'
-    )
-
-with open('period1_transactions_corrected.ts', 'w') as f:
-    f.write('\n'.join(ts_lines))
+emit_ts(transactions, 'period1_transactions_corrected.ts')
 
 print(f"Saved TypeScript format to period1_transactions_corrected.ts")
 print(f"\nFirst 5 TypeScript lines:")
-for line in ts_lines[:5]:
-    print(line)
+for txn in transactions[:5]:
+    print(f'    {transaction_literal(txn)},')
 
 wb.close()
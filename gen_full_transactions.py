@@ -5,25 +5,16 @@ Generate the complete corrected plan.ts file with all 119 transactions
 
 import json
 
+from ts_emitter import transaction_literal, with_ids
+
 # Read the correct transactions
 with open('period1_correct_transactions.json', 'r') as f:
-    transactions = json.load(f)
-
-# Generate the transactions section
-ts_lines = []
-for i, txn in enumerate(transactions):
-    linked_rule = f'"{txn["linkedRuleId"]}"' if txn.get('linkedRuleId') else 'undefined'
-    ts_line = f'    {{ id: "{txn["id"]}", date: "{txn["date"]}", label: "{txn["label"]}", amount: {txn["amount"]}, type: "{txn["type"]}", category: "{txn["category"]}", notes: "{txn["notes"]}", linkedRuleId: {linked_rule} }}'
-    
-    if i < len(transactions) - 1:
-        ts_line += ','
-    
-    ts_lines.append(ts_line)
-
-transactions_section = '\n'.join(ts_lines)
+    transactions = list(with_ids(json.load(f)))
 
-print(f"Generated {len(ts_lines)} transaction lines")
-print(f"First transaction line:\n{ts_lines[0]}")
-print(f"Last transaction line:\n{ts_lines[-1]}")
+# The section itself is streamed by ts_emitter (python ts_emitter.py ...);
+# only the boundary lines are rendered here
+print(f"Generated {len(transactions)} transaction lines")
+print(f"First transaction line:\n    {transaction_literal(transactions[0])},")
+print(f"Last transaction line:\n    {transaction_literal(transactions[-1])}")
 print()
 print("Ready to replace in plan.ts")
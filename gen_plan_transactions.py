@@ -1,24 +1,25 @@
 import json
+import sys
+
+from ts_emitter import emit_ts, write_ts
+from txn_ids import assign_ids
 
 # Read the correct transactions
 with open('period1_correct_transactions.json', 'r') as f:
     transactions = json.load(f)
 
-# Generate TypeScript code for transactions array
-ts_code = []
-for i, txn in enumerate(transactions, 1):
-    ts_code.append(f'    {{ id: "txn-{i}", date: "{txn["date"]}", label: "{txn["label"]}", amount: {txn["amount"]}, type: "{txn["type"]}", category: "{txn["category"]}", notes: "{txn["notes"]}", linkedRuleId: undefined }}' + (',', '')[i == len(transactions)])
+# TypeScript code for transactions array, with content-addressed ids
+records = assign_ids(transactions)
 
 # Print all transaction lines
 print("Transactions array for plan.ts:")
 print("="*120)
-for line in ts_code:
-    print(line)
+write_ts(records, sys.stdout, trailing_comma=False)
+print()
 
 # Save to file
-with open('plan_transactions_section.ts', 'w') as f:
-    f.write(',\n'.join(ts_code))
+count = emit_ts(records, 'plan_transactions_section.ts', trailing_comma=False)
 
 print()
-print(f"Generated {len(ts_code)} transactions")
+print(f"Generated {count} transactions")
 print("Saved to plan_transactions_section.ts")
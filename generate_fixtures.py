@@ -0,0 +1,557 @@
+#!/usr/bin/env python3
+"""
+Synthetic plans and matching workbooks for scale testing.
+
+The real fixtures are two ~110 KB workbooks and a 40-transaction plan.ts,
+too small to show how ingestion, categorisation or timelines scale. This
+writes a workbook laid out like the real one (Periods 26-25, Transactions
+A-I, Bills Schedule, Budget by Period, Category Mapping, with the same
+Period, SUMIFS and variance formulas) and the Plan JSON those transactions
+extract to, for any number of years and any volume:
+
+- merchants: a pool of --merchants names, each with a Column C category, a
+  typical amount and either a cadence (--recurrence gives the share of
+  merchants on each) or none. The first three are a monthly salary, rent
+  and savings transfer, so every fixture has income, a bill and savings
+- recurring merchants pay on their schedule (recurrence.occurrences, seeded
+  up to two years before the first period); ad-hoc merchants, Zipf-weighted
+  by popularity, top every period up to about --per-period transactions
+- --noise (0-1) moves recurring amounts and settlement dates and writes
+  some categories and descriptions in odd case or spacing, as bank exports
+  and hand-typed rows do
+
+The plan's rules and bills are the recurring merchants; its transactions
+are what extract_periods makes of the Transactions sheet (same ids, period
+by period). Budgets are each category's expected spend per period.
+
+Output is a pure function of the arguments and --seed, and is streamed:
+the workbook through openpyxl's write-only mode, the plan a transaction at
+a time, one period in memory at once. --scale multiplies --per-period and
+--merchants, so --scale 10/100/1000 approximate 10x-1000x the real volume.
+
+Periods continue the 2026 sequence (periods.build_periods): --years 1 is
+exactly P1-P13. Pass periods=build_periods(n) to the readers for longer
+fixtures.
+
+Usage:
+    python generate_fixtures.py [--out fixtures/synthetic] [--years 1] [--per-period 90]
+        [--merchants 60] [--recurrence weekly=0.03,monthly=0.15] [--noise 0.1] [--seed 0]
+    python generate_fixtures.py --scale 100 --years 3
+"""
+
+import argparse
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, NamedTuple
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+from money import pounds
+from periods import Period, build_periods
+from recurrence import CADENCES, expand_rules
+from txn_ids import assign_ids
+
+REAL_PER_PERIOD = 90   # the 2026 workbook: ~1,200 rows over 13 periods
+REAL_MERCHANTS = 60
+
+PERIODS_SHEET = 'Periods 26-25'
+TRANSACTIONS_SHEET = 'Transactions'
+BILLS_SHEET = 'Bills Schedule'
+BUDGET_SHEET = 'Budget by Period'
+MAPPING_SHEET = 'Category Mapping'
+
+TRANSACTIONS_HEADER = ('Date', 'Type', 'Category', 'Description', 'Amount (£)', 'One-off?',
+                       'Payment Method', 'Notes', 'Period (auto)')
+
+# (group, Column C category, app category, typical amount in pounds, share of merchants)
+CATEGORIES = (
+    ('INCOME', 'Income - Salary', 'income', 2800, 0.0),
+    ('INCOME', 'Income - Freelance', 'income', 450, 0.02),
+    ('INCOME', 'Income - Gifts', 'income', 60, 0.02),
+    ('GIVING', 'Tithe', 'giving', 280, 0.01),
+    ('GIVING', 'Offerings', 'giving', 20, 0.03),
+    ('GIVING', 'Donations (Variable)', 'giving', 15, 0.04),
+    ('FIXED', 'Rent', 'bill', 950, 0.0),
+    ('FIXED', 'Insurance', 'bill', 45, 0.03),
+    ('FIXED', 'Water Bill', 'bill', 35, 0.01),
+    ('FIXED', 'Electricity & Gas', 'bill', 85, 0.02),
+    ('FIXED', 'Community Fibre / Internet', 'bill', 35, 0.01),
+    ('FIXED', 'Phone', 'bill', 25, 0.02),
+    ('FIXED', 'Credit Card Payment', 'bill', 300, 0.01),
+    ('FIXED', 'Fuel', 'bill', 45, 0.08),
+    ('VARIABLE', 'Food', 'allowance', 18, 0.45),
+    ('VARIABLE', 'Others', 'allowance', 25, 0.23),
+    ('SAVINGS', 'Savings Transfer', 'savings', 250, 0.0),
+    ('POT', 'Buffer Top-Up', 'buffer', 50, 0.02),
+)
+GROUPS, ITEMS, APP, TYPICAL, SHARE = (np.array(col) for col in zip(*CATEGORIES))
+SHEET_TYPE = {'INCOME': 'Income', 'SAVINGS': 'Transfer'}  # everything else is 'Expense'
+PLAN_TYPE = {'Income': 'income', 'Transfer': 'transfer', 'Expense': 'outflow'}
+
+# Merchants 0-2: (name, category, cadence)
+ANCHORS = (
+    ('Employer Payroll', 'Income - Salary', 'monthly'),
+    ('Landlord', 'Rent', 'monthly'),
+    ('Savings Pot', 'Savings Transfer', 'monthly'),
+)
+DEFAULT_RECURRENCE = {'weekly': 0.03, 'biweekly': 0.02, 'monthly': 0.15, 'quarterly': 0.03, 'annual': 0.02}
+# Expected occurrences per 26th -> 25th period
+PER_PERIOD = {'weekly': 365.25 / 7 / 12, 'biweekly': 365.25 / 14 / 12, 'monthly': 1.0,
+              'quarterly': 1 / 3, 'annual': 1 / 12}
+
+AMOUNT_SIGMA = 0.35   # spread of typical amounts across a category's merchants
+AD_HOC_SIGMA = 0.5    # spread of one merchant's ad-hoc amounts
+SEED_LOOKBACK = 730   # days before P1 a recurring merchant may have started
+METHODS = np.array(['Apple Pay', 'Debit Card', 'Credit Card', 'Bank Transfer', 'Cash'])
+ONE_OFF_SHARE = 0.05
+
+_PLACES = ('North', 'Harbour', 'Corner', 'Green', 'Royal', 'City', 'Village', 'Metro', 'Oak', 'River',
+           'Station', 'Market', 'Golden', 'Silver', 'Park', 'Bridge', 'Castle', 'Union', 'Central', 'Hilltop')
+_TRADES = ('Grocers', 'Bakery', 'Fuel', 'Pharmacy', 'Books', 'Coffee', 'Kitchen', 'Hardware', 'Electrics',
+           'Travel', 'Cinema', 'Gym', 'Outfitters', 'Garage', 'Deli', 'Florist', 'Telecom', 'Energy',
+           'Insurance', 'Lettings')
+# Fixed timestamps keep the xlsx bytes a function of the arguments alone
+_EPOCH = datetime(2025, 12, 22)
+_EXCEL_EPOCH = np.datetime64('1899-12-30', 'D')
+_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+
+
+class FixtureSpec(NamedTuple):
+    years: int = 1
+    per_period: int = REAL_PER_PERIOD
+    merchants: int = REAL_MERCHANTS
+    recurrence: Dict[str, float] = DEFAULT_RECURRENCE
+    noise: float = 0.1
+    seed: int = 0
+
+
+class Merchants(NamedTuple):
+    names: np.ndarray       # str
+    item: np.ndarray        # index into CATEGORIES
+    amount: np.ndarray      # typical amount, pounds
+    cadence: np.ndarray     # str; '' for ad hoc
+    seed_date: np.ndarray   # datetime64[D]
+    method: np.ndarray      # payment method
+    popularity: np.ndarray  # ad-hoc draw weights, summing to 1
+
+    @property
+    def recurring(self) -> np.ndarray:
+        return np.flatnonzero(self.cadence != '')
+
+
+def merchant_name(i: int) -> str:
+    place, trade = _PLACES[i % len(_PLACES)], _TRADES[(i // len(_PLACES)) % len(_TRADES)]
+    batch = i // (len(_PLACES) * len(_TRADES))
+    return f'{place} {trade}' + (f' {batch + 1}' if batch else '')
+
+
+def make_merchants(spec: FixtureSpec, rng: np.random.Generator, first: np.datetime64) -> Merchants:
+    n, k = spec.merchants, len(ANCHORS)
+    item_of = {name: i for i, name in enumerate(ITEMS)}
+
+    cadences = list(spec.recurrence)
+    shares = [spec.recurrence[c] for c in cadences]
+    cadence = np.array(cadences + [''], dtype=object)[rng.choice(len(cadences) + 1, n, p=shares + [1 - sum(shares)])]
+    item = rng.choice(len(CATEGORIES), n, p=SHARE / SHARE.sum())
+    names = np.array([merchant_name(i) for i in range(n)], dtype=object)
+    for i, (name, category, anchor_cadence) in enumerate(ANCHORS):
+        names[i], item[i], cadence[i] = name, item_of[category], anchor_cadence
+
+    amount = np.round(TYPICAL[item] * rng.lognormal(0, AMOUNT_SIGMA, n), 2)
+    amount[:k] = TYPICAL[item[:k]]
+    seed_date = first - rng.integers(0, SEED_LOOKBACK, n)
+    method = METHODS[rng.integers(0, len(METHODS), n)]
+    method[cadence != ''] = 'Direct Debit'
+
+    ad_hoc = np.flatnonzero(cadence == '')
+    pool = ad_hoc if ad_hoc.size else np.arange(k, n)
+    popularity = np.zeros(n)
+    popularity[rng.permutation(pool)] = 1 / np.arange(1, pool.size + 1)
+    return Merchants(names, item, amount, cadence, seed_date, method, popularity / popularity.sum())
+
+
+# -- plan -------------------------------------------------------------------
+
+def _rule_id(merchants: Merchants, i: int) -> str:
+    return 'savings' if ITEMS[merchants.item[i]] == 'Savings Transfer' and i < len(ANCHORS) else f'rule-{i}'
+
+
+def plan_rules(merchants: Merchants) -> dict:
+    """incomeRules, outflowRules and bills for the recurring merchants."""
+    income, outflow, bills = [], [], []
+    for i in merchants.recurring.tolist():
+        item, cadence = int(merchants.item[i]), str(merchants.cadence[i])
+        seed = str(merchants.seed_date[i])
+        common = {'label': str(merchants.names[i]), 'amount': float(merchants.amount[i])}
+        if GROUPS[item] == 'INCOME':
+            income.append({'id': f'income-{i}', **common, 'cadence': cadence, 'seedDate': seed, 'enabled': True})
+        elif GROUPS[item] == 'FIXED' and cadence == 'monthly':
+            bills.append({'id': f'bill-{i}', **common, 'dueDay': int(seed[8:10]), 'category': 'bill',
+                          'enabled': True})
+        else:
+            outflow.append({'id': _rule_id(merchants, i), **common, 'cadence': cadence, 'seedDate': seed,
+                            'category': str(APP[item]), 'enabled': True})
+    return {'incomeRules': income, 'outflowRules': outflow, 'bills': bills}
+
+
+def plan_head(periods: List[Period], merchants: Merchants) -> dict:
+    """Every Plan field but transactions."""
+    return {
+        'version': 2,
+        'setup': {'selectedPeriodId': 1, 'asOfDate': periods[0].start.isoformat(), 'windowDays': 30,
+                  'startingBalance': 2500, 'rollForwardBalance': True, 'expectedMinBalance': 500,
+                  'variableCap': 400},
+        'periods': [{'id': p.id, 'label': p.label, 'start': p.start.isoformat(), 'end': p.end.isoformat()}
+                    for p in periods],
+        **plan_rules(merchants),
+        'periodRuleOverrides': [],
+        'periodOverrides': [],
+        'eventOverrides': [],
+        'overrides': [],
+    }
+
+
+# -- transactions -------------------------------------------------------------
+
+class PeriodRows(NamedTuple):
+    period: Period
+    dates: np.ndarray        # datetime64[D], sorted
+    merchant: np.ndarray     # index into Merchants
+    pence: np.ndarray        # int64
+    category: np.ndarray     # Column C as written
+    description: np.ndarray
+    one_off: np.ndarray      # bool
+
+
+def _variants(text: str) -> List[str]:
+    return [text.upper(), text.lower(), text + ' ', text.replace(' ', '  ', 1)]
+
+
+def generate_rows(spec: FixtureSpec, periods: List[Period], merchants: Merchants,
+                  rng: np.random.Generator) -> Iterator[PeriodRows]:
+    """Each period's transactions in date order, one period at a time."""
+    first, last = np.datetime64(periods[0].start, 'D'), np.datetime64(periods[-1].end, 'D')
+    starts = np.array([p.start for p in periods], dtype='datetime64[D]')
+    noise = spec.noise
+
+    # Recurring payments over the whole span; a few int64 per row
+    recurring = merchants.recurring
+    rules = [{'cadence': str(merchants.cadence[i]), 'seedDate': str(merchants.seed_date[i]), 'enabled': True}
+             for i in recurring.tolist()]
+    rule_index, r_dates = expand_rules(rules, first, last)
+    r_merchant = recurring[rule_index]
+    settle = int(round(3 * noise))
+    r_dates = np.clip(r_dates + rng.integers(-settle, settle + 1, r_dates.size), first, last)
+    r_pounds = merchants.amount[r_merchant] * np.maximum(0.05, 1 + noise * rng.standard_normal(r_dates.size))
+    order = np.argsort(r_dates, kind='stable')
+    r_dates, r_merchant, r_pounds = r_dates[order], r_merchant[order], r_pounds[order]
+    bounds = np.searchsorted(r_dates, starts).tolist() + [r_dates.size]
+
+    variants = np.array([[name] + _variants(name) for name in ITEMS], dtype=object)
+    upper_names = np.array([n.upper() for n in merchants.names], dtype=object)
+
+    for j, period in enumerate(periods):
+        lo, hi = bounds[j], bounds[j + 1]
+        days = (period.end - period.start).days + 1
+        n_ad_hoc = int(rng.poisson(max(spec.per_period - (hi - lo), 0)))
+        a_merchant = rng.choice(merchants.names.size, n_ad_hoc, p=merchants.popularity)
+        a_dates = starts[j] + rng.integers(0, days, n_ad_hoc)
+        a_pounds = merchants.amount[a_merchant] * rng.lognormal(0, AD_HOC_SIGMA + noise, n_ad_hoc)
+
+        dates = np.concatenate((r_dates[lo:hi], a_dates))
+        merchant = np.concatenate((r_merchant[lo:hi], a_merchant))
+        pence = np.maximum(1, np.rint(np.concatenate((r_pounds[lo:hi], a_pounds)) * 100)).astype(np.int64)
+        one_off = np.concatenate((np.zeros(hi - lo, bool), rng.random(n_ad_hoc) < ONE_OFF_SHARE))
+
+        n = dates.size
+        item = merchants.item[merchant]
+        odd = rng.random(n) < noise / 4
+        category = np.where(odd, variants[item, rng.integers(1, variants.shape[1], n)], ITEMS[item].astype(object))
+        odd = rng.random(n) < noise / 4
+        description = np.where(odd, upper_names[merchant], merchants.names[merchant])
+
+        order = np.argsort(dates, kind='stable')
+        yield PeriodRows(period, dates[order], merchant[order], pence[order], category[order],
+                         description[order], one_off[order])
+
+
+def plan_transactions(rows: PeriodRows, merchants: Merchants) -> List[dict]:
+    """extract_periods.to_plan_transaction for a period's rows, with their ids."""
+    item = merchants.item[rows.merchant]
+    kinds = [PLAN_TYPE[SHEET_TYPE.get(g, 'Expense')] for g in GROUPS[item].tolist()]
+    txns = []
+    for d, p, kind, app, category, description in zip(
+            np.datetime_as_string(rows.dates).tolist(), rows.pence.tolist(), kinds, APP[item].tolist(),
+            rows.category.tolist(), rows.description.tolist()):
+        txns.append({
+            'date': d,
+            'label': description,
+            'amount': pounds(p),
+            'type': kind,
+            'category': app,
+            'notes': category,
+            'linkedRuleId': 'savings' if app == 'savings' else None,
+        })
+    return assign_ids(txns)
+
+
+# -- workbook -------------------------------------------------------------------
+
+def _col(index: int) -> str:
+    from openpyxl.utils import get_column_letter
+
+    return get_column_letter(index + 1)
+
+
+def write_periods(ws, periods: List[Period]) -> None:
+    ws.append(('Period', 'Label', 'Start', 'End', 'Next Start'))
+    for p in periods:
+        start, end = datetime.combine(p.start, datetime.min.time()), datetime.combine(p.end, datetime.min.time())
+        ws.append((p.id, f'P{p.id}: {p.start:%d %b %Y}–{p.end:%d %b %Y}', start, end,
+                   datetime.fromordinal(end.toordinal() + 1)))
+
+
+def budget_per_period(spec: FixtureSpec, merchants: Merchants) -> np.ndarray:
+    """Expected pounds per period for each CATEGORIES row."""
+    recurring = merchants.recurring
+    rate = np.array([PER_PERIOD[c] for c in merchants.cadence[recurring]])
+    budget = np.bincount(merchants.item[recurring], merchants.amount[recurring] * rate, len(CATEGORIES))
+    n_ad_hoc = max(spec.per_period - rate.sum(), 0)
+    mean = merchants.amount * np.exp((AD_HOC_SIGMA + spec.noise) ** 2 / 2)
+    budget += n_ad_hoc * np.bincount(merchants.item, merchants.popularity * mean, len(CATEGORIES))
+    return np.round(budget)
+
+
+def write_budget(ws, periods: List[Period], budget: np.ndarray) -> None:
+    ws.append(('Budget vs Actual by Period (26th–25th) — auto from Transactions', 'Items', None)
+              + ('Budget', 'Actuals', 'Variance') * len(periods))
+    for r, (group, item, amount) in enumerate(zip(GROUPS.tolist(), ITEMS.tolist(), budget.tolist()), 2):
+        kind = SHEET_TYPE.get(group, 'Expense')
+        row = [group, item, amount]
+        for j, p in enumerate(periods):
+            b, a = _col(3 + 3 * j), _col(4 + 3 * j)
+            row += [f'=$C{r}',
+                    f'=SUMIFS(Transactions!$E:$E,Transactions!$C:$C,$B{r},Transactions!$B:$B,"{kind}",'
+                    f'Transactions!$I:$I,{p.id})',
+                    f'={a}{r}-{b}{r}']
+        ws.append(row)
+
+
+def write_bills(ws, merchants: Merchants) -> None:
+    """One row per FIXED category with monthly payments: due day of its first, summed budget."""
+    ws.append(('Bills & Fixed Expenses Schedule (typically 26th–3rd)',))
+    ws.append(('Bill', 'Typical Due Day', 'Budget / Period', 'Paid? (tick)', 'Period', 'Actual Paid (auto)',
+               'Variance', 'Notes'))
+    monthly = merchants.recurring[merchants.cadence[merchants.recurring] == 'monthly']
+    r = 3
+    for item in range(len(CATEGORIES)):
+        paying = monthly[merchants.item[monthly] == item]
+        if GROUPS[item] != 'FIXED' or not paying.size:
+            continue
+        due = int(str(merchants.seed_date[paying[0]])[8:10])
+        ws.append((str(ITEMS[item]), due, round(float(merchants.amount[paying].sum()), 2), None, 1,
+                   f'=IF($E{r}="","",SUMIFS(Transactions!$E:$E,Transactions!$C:$C,$A{r},'
+                   f'Transactions!$B:$B,"Expense",Transactions!$I:$I,$E{r}))',
+                   f'=F{r}-C{r}'))
+        r += 1
+
+
+def write_mapping(ws) -> None:
+    ws.append(('Category', 'App Category'))
+    for item, app in zip(ITEMS.tolist(), APP.tolist()):
+        ws.append((item, app))
+
+
+class TransactionsSheet:
+    """The Transactions sheet as raw worksheet XML, streamed to a temp file.
+
+    openpyxl's write-only cells cost ~300us each to serialise; these rows are
+    formatted directly (inline strings, date serials in the workbook's date
+    style) and spliced into the package after openpyxl has written the rest.
+    """
+
+    def __init__(self, path: str, date_style: int, match_range: str):
+        self.path = path
+        self.date_style = date_style
+        self.match_range = escape(match_range)
+        self.rows = 0
+        self._f = open(path, 'w', encoding='utf-8', buffering=1 << 20)
+        self._text_row(TRANSACTIONS_HEADER)
+
+    def _text_row(self, values) -> None:
+        self.rows += 1
+        self._f.write(f'<row r="{self.rows}">' + ''.join(
+            f'<c r="{_col(i)}{self.rows}" t="inlineStr"><is><t>{escape(v)}</t></is></c>'
+            for i, v in enumerate(values)) + '</row>')
+
+    def append(self, rows: PeriodRows, merchants: Merchants) -> None:
+        serials = (rows.dates - _EXCEL_EPOCH).astype(np.int64).tolist()
+        kinds = [SHEET_TYPE.get(g, 'Expense') for g in GROUPS[merchants.item[rows.merchant]].tolist()]
+        methods = merchants.method[rows.merchant].tolist()
+        amounts = (rows.pence / 100).tolist()
+        s, match = self.date_style, self.match_range
+        out = []
+        r = self.rows
+        for serial, kind, category, description, amount, one_off, method in zip(
+                serials, kinds, rows.category.tolist(), rows.description.tolist(), amounts,
+                rows.one_off.tolist(), methods):
+            r += 1
+            out.append(
+                f'<row r="{r}"><c r="A{r}" s="{s}"><v>{serial}</v></c>'
+                f'<c r="B{r}" t="inlineStr"><is><t>{kind}</t></is></c>'
+                f'<c r="C{r}" t="inlineStr"><is><t xml:space="preserve">{escape(category)}</t></is></c>'
+                f'<c r="D{r}" t="inlineStr"><is><t>{escape(description)}</t></is></c>'
+                f'<c r="E{r}"><v>{amount}</v></c>'
+                f'<c r="F{r}" t="inlineStr"><is><t>{"Yes" if one_off else "No"}</t></is></c>'
+                f'<c r="G{r}" t="inlineStr"><is><t>{method}</t></is></c>'
+                f'<c r="I{r}"><f>IFERROR(MATCH(A{r},{match},1),"")</f><v></v></c></row>')
+        self._f.writelines(out)
+        self.rows = r
+
+    def close(self) -> None:
+        self._f.close()
+
+    def copy_part(self, out) -> None:
+        """Write the complete worksheet part to a binary file object."""
+        out.write(f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                  f'<worksheet xmlns="{_MAIN_NS}"><dimension ref="A1:{_col(len(TRANSACTIONS_HEADER) - 1)}'
+                  f'{self.rows}"/><sheetData>'.encode('utf-8'))
+        with open(self.path, 'rb') as f:
+            shutil.copyfileobj(f, out, 1 << 20)
+        out.write(b'</sheetData></worksheet>')
+
+
+# -- driver ---------------------------------------------------------------------
+
+def generate(spec: FixtureSpec, xlsx_path: str, plan_path: str) -> dict:
+    """Write the workbook and plan; returns counts for the summary."""
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+
+    rng = np.random.default_rng(spec.seed)
+    periods = build_periods(12 * spec.years + 1)
+    merchants = make_merchants(spec, rng, np.datetime64(periods[0].start, 'D'))
+
+    wb = openpyxl.Workbook(write_only=True)
+    wb.properties.created = _EPOCH
+    ws_periods, ws_txns, ws_bills, ws_budget, ws_mapping = (
+        wb.create_sheet(name) for name in (PERIODS_SHEET, TRANSACTIONS_SHEET, BILLS_SHEET, BUDGET_SHEET,
+                                           MAPPING_SHEET))
+    write_periods(ws_periods, periods)
+    write_bills(ws_bills, merchants)
+    write_budget(ws_budget, periods, budget_per_period(spec, merchants))
+    write_mapping(ws_mapping)
+
+    date_style = WriteOnlyCell(ws_txns, _EPOCH).style_id
+    sheet = TransactionsSheet(xlsx_path + '.rows', date_style, f"'{PERIODS_SHEET}'!$C$2:$C${len(periods) + 1}")
+    count = 0
+    try:
+        with open(plan_path, 'w', encoding='utf-8') as f:
+            f.write('{\n')
+            for key, value in plan_head(periods, merchants).items():
+                f.write(f'  {json.dumps(key)}: {json.dumps(value)},\n')
+            f.write('  "transactions": [')
+            sep = '\n    '
+            for rows in generate_rows(spec, periods, merchants, rng):
+                sheet.append(rows, merchants)
+                for txn in plan_transactions(rows, merchants):
+                    f.write(sep + json.dumps(txn))
+                    sep = ',\n    '
+                count += rows.dates.size
+            f.write('\n  ]\n}\n')
+        sheet.close()
+        wb.save(xlsx_path)
+        _repack(xlsx_path, wb.properties, {ws_txns.path.lstrip('/'): sheet.copy_part})
+    finally:
+        sheet.close()
+        os.remove(sheet.path)
+    return {'periods': len(periods), 'merchants': spec.merchants,
+            'recurring': int(merchants.recurring.size), 'transactions': count}
+
+
+def _repack(path: str, properties, parts: Dict[str, Callable]) -> None:
+    """Rewrite the xlsx with constant timestamps and the given parts replaced.
+
+    openpyxl stamps docProps 'modified' and zipfile every member's time with
+    the current time on save.
+    """
+    import zipfile
+
+    from openpyxl.xml.functions import tostring
+
+    properties.modified = _EPOCH
+    tmp = path + '.tmp'
+    with zipfile.ZipFile(path) as src, zipfile.ZipFile(tmp, 'w', zipfile.ZIP_DEFLATED) as dst:
+        for info in src.infolist():
+            name = info.filename
+            member = zipfile.ZipInfo(name, _EPOCH.timetuple()[:6])
+            member.compress_type = zipfile.ZIP_DEFLATED
+            if name == 'docProps/core.xml':
+                dst.writestr(member, tostring(properties.to_tree()))
+                continue
+            with dst.open(member, 'w', force_zip64=True) as out:
+                if name in parts:
+                    parts[name](out)
+                else:
+                    with src.open(info) as f:
+                        shutil.copyfileobj(f, out, 1 << 20)
+    os.replace(tmp, path)
+
+
+def parse_recurrence(text: str) -> Dict[str, float]:
+    """'weekly=0.05,monthly=0.2' -> {cadence: share of merchants}."""
+    mix = {}
+    for part in filter(None, (p.strip() for p in text.split(','))):
+        cadence, _, share = part.partition('=')
+        if cadence not in CADENCES:
+            raise argparse.ArgumentTypeError(f'unknown cadence {cadence!r} (expected one of {", ".join(CADENCES)})')
+        try:
+            mix[cadence] = float(share)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f'{part!r} is not cadence=share') from None
+    if any(v < 0 for v in mix.values()) or sum(mix.values()) > 1:
+        raise argparse.ArgumentTypeError('recurrence shares must be >= 0 and sum to at most 1')
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--out', default=os.path.join('fixtures', 'synthetic'),
+                        help='output prefix: writes PREFIX.xlsx and PREFIX.plan.json')
+    parser.add_argument('--years', type=int, default=1, help='12 periods per year after P1')
+    parser.add_argument('--per-period', type=int, default=REAL_PER_PERIOD, help='transactions per period')
+    parser.add_argument('--merchants', type=int, default=REAL_MERCHANTS, help='merchant cardinality')
+    parser.add_argument('--scale', type=int, default=1, help='multiply --per-period and --merchants')
+    parser.add_argument('--recurrence', type=parse_recurrence, default=DEFAULT_RECURRENCE,
+                        help='share of merchants per cadence (default: %(default)s)')
+    parser.add_argument('--noise', type=float, default=0.1, help='0-1: amount, date and text noise')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    spec = FixtureSpec(args.years, args.per_period * args.scale, args.merchants * args.scale,
+                       args.recurrence, args.noise, args.seed)
+    if spec.years < 1:
+        parser.error('--years must be at least 1')
+    if spec.merchants < len(ANCHORS):
+        parser.error(f'--merchants must be at least {len(ANCHORS)}')
+    if not 0 <= spec.noise <= 1:
+        parser.error('--noise must be between 0 and 1')
+
+    os.makedirs(os.path.dirname(args.out) or '.', exist_ok=True)
+    xlsx_path, plan_path = args.out + '.xlsx', args.out + '.plan.json'
+    t0 = time.perf_counter()
+    counts = generate(spec, xlsx_path, plan_path)
+    elapsed = time.perf_counter() - t0
+
+    print(f"{counts['transactions']:,} transactions over {counts['periods']} periods, "
+          f"{counts['merchants']:,} merchants ({counts['recurring']:,} recurring) in {elapsed:.1f}s")
+    for path in (xlsx_path, plan_path):
+        print(f'  {path}  {os.path.getsize(path) / 2 ** 20:,.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Incremental, append-only ingestion of the Transactions sheet.
+
+The sheet grows at the bottom each week, so re-extracting rows 2..max_row
+every run repeats work that has not changed. ingest() keeps a state file
+(.cache/ingest/) holding the plan-shaped transactions already extracted and
+a watermark:
+
+- the last populated sheet row ingested, and
+- a rolling SHA-256 over the input cells (A-E, H) of every populated row
+  up to it, row numbers included.
+
+On the next run the prefix rows are streamed (iter_transactions) and
+hashed but not categorised again; only rows after the
+watermark are converted and assigned to periods. If the prefix
+hash no longer matches (an earlier row was edited, inserted or deleted),
+or the category mapping changed, it falls back to a full rescan. An
+unchanged workbook (same content hash) is not opened at all.
+
+The result is the same as extract_periods.partition_transactions.
+
+Usage:
+    python ingest.py [--workbook PATH] [--full] [--partitioned FILE]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from datetime import date, datetime
+from typing import Dict, List, NamedTuple, Optional
+
+from category_mapping import load_category_mapping
+from extract_periods import to_plan_transaction
+from file_cache import cache_path, sha256_file
+from periods import PeriodIndex, build_periods_2026
+from txn_ids import assign_ids
+from workbook_reader import TRANSACTIONS_SHEET, WORKBOOK_PATH, iter_transactions
+
+STATE_VERSION = 1
+STATE_NAMESPACE = 'ingest'
+
+
+class IngestResult(NamedTuple):
+    by_period: Dict[int, List[dict]]  # as extract_periods.partition_transactions
+    unassigned: int
+    new_rows: int                      # rows converted this run
+    full_rescan: bool
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f'cannot hash {type(value).__name__}')
+
+
+def _inputs(rec) -> tuple:
+    # Input cells only: column I is a formula of the date, so it never changes alone
+    return rec.date, rec.type, rec.category, rec.description, rec.amount, rec.notes
+
+
+def _row_bytes(row_num: int, values: tuple) -> bytes:
+    return json.dumps([row_num, *values], default=_json_default, separators=(',', ':')).encode('utf-8')
+
+
+def _mapping_fingerprint(mapping) -> str:
+    items = sorted(mapping.items())
+    return hashlib.sha256(json.dumps(items, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+def state_path(path: str, sheet_name: str = TRANSACTIONS_SHEET) -> str:
+    return cache_path(STATE_NAMESPACE, f'{os.path.abspath(path)}#{sheet_name}')
+
+
+def _load_state(file: str) -> Optional[dict]:
+    try:
+        with open(file) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state if state.get('version') == STATE_VERSION else None
+
+
+def _save_state(file: str, state: dict) -> None:
+    os.makedirs(os.path.dirname(file), exist_ok=True)
+    tmp = file + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp, file)
+
+
+def _partition(entries: List[list]):
+    """[[row, period_id, txn], ...] -> (by_period with content ids, unassigned)."""
+    by_period: Dict[int, List[dict]] = {}
+    unassigned = 0
+    for _, period_id, txn in entries:
+        if not period_id:
+            unassigned += 1
+            continue
+        by_period.setdefault(period_id, []).append(txn)
+    for txns in by_period.values():
+        txns[:] = assign_ids(txns)
+        txns.sort(key=lambda t: t['date'])
+    return dict(sorted(by_period.items())), unassigned
+
+
+def _scan(path: str, sheet_name: str, watermark: int, prefix_hash: Optional[str],
+          convert) -> Optional[tuple]:
+    """Read the sheet once; convert rows after watermark.
+
+    Returns (new entries, last populated row, rolling hash) or None when the
+    rows up to watermark no longer hash to prefix_hash.
+    """
+    rolling = hashlib.sha256()
+    entries = []
+    last_row = 0
+    checked = prefix_hash is None
+
+    for rec in iter_transactions(path, sheet_name):
+        if not checked and rec.row > watermark:
+            if rolling.hexdigest() != prefix_hash:
+                return None
+            checked = True
+        rolling.update(_row_bytes(rec.row, _inputs(rec)))
+        last_row = rec.row
+        if rec.row > watermark:
+            entries.append(convert(rec))
+
+    if not checked and (last_row < watermark or rolling.hexdigest() != prefix_hash):
+        # Rows were removed from the end, or the edit was in the last rows
+        return None
+    return entries, last_row, rolling.hexdigest()
+
+
+def ingest(path: str = WORKBOOK_PATH, sheet_name: str = TRANSACTIONS_SHEET,
+           periods=None, full: bool = False) -> IngestResult:
+    """Extract the sheet's transactions, converting only rows added since last run."""
+    index = PeriodIndex(periods if periods is not None else build_periods_2026())
+    mapping = load_category_mapping(path)
+    fingerprint = _mapping_fingerprint(mapping)
+    file = state_path(path, sheet_name)
+    state = None if full else _load_state(file)
+    if state is not None and state.get('mapping') != fingerprint:
+        state = None
+
+    content_hash = sha256_file(path)
+    if state is not None and state.get('sha256') == content_hash:
+        by_period, unassigned = _partition(state['entries'])
+        return IngestResult(by_period, unassigned, 0, False)
+
+    def convert(rec):
+        if rec.date is None or not rec.amount:
+            return [rec.row, None, None]
+        period_id = rec.period if rec.period is not None else index.period_id(rec.date)
+        return [rec.row, period_id or 0, to_plan_transaction(rec, mapping)]
+
+    scanned = None
+    if state is not None:
+        scanned = _scan(path, sheet_name, state['watermark'], state['prefix_hash'], convert)
+    full_rescan = scanned is None
+    if full_rescan:
+        scanned = _scan(path, sheet_name, 0, None, convert)
+        kept = []
+    else:
+        kept = state['entries']
+    new_entries, last_row, rolling = scanned
+    entries = kept + [e for e in new_entries if e[2] is not None]
+
+    _save_state(file, {
+        'version': STATE_VERSION,
+        'source': os.path.abspath(path),
+        'sheet': sheet_name,
+        'sha256': content_hash,
+        'mapping': fingerprint,
+        'watermark': last_row,
+        'prefix_hash': rolling,
+        'entries': entries,
+    })
+    by_period, unassigned = _partition(entries)
+    return IngestResult(by_period, unassigned, len(new_entries), full_rescan)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Incrementally extract Transactions by period')
+    parser.add_argument('--workbook', default=WORKBOOK_PATH)
+    parser.add_argument('--full', action='store_true', help='ignore the watermark and rescan every row')
+    parser.add_argument('--partitioned', metavar='FILE', help='write the result keyed by period id')
+    args = parser.parse_args()
+
+    result = ingest(args.workbook, full=args.full)
+    mode = 'full rescan' if result.full_rescan else 'incremental'
+    total = sum(len(t) for t in result.by_period.values())
+    print(f'{mode}: {result.new_rows} rows converted, {total} transactions in '
+          f'{len(result.by_period)} periods ({result.unassigned} unassigned)')
+
+    if args.partitioned:
+        with open(args.partitioned, 'w') as f:
+            json.dump({str(k): v for k, v in result.by_period.items()}, f, indent=2)
+        print(f'Saved {len(result.by_period)} periods to {args.partitioned}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Amounts as integer pence.
+
+Summing pounds as floats drifts (5319.490000000001) and has to be rounded
+again at every step, which is what money() in cashflow-app/src/lib/
+cashflowEngine.ts does:
+
+    Math.round((n + Number.EPSILON) * 100) / 100
+
+Here amounts are parsed once into int pence with that same rounding
+(half towards +infinity, after the epsilon nudge), summed with integer
+NumPy reductions, and only turned back into pounds for JSON or display.
+pounds(to_pence(x)) is exactly money(x), so totals reconcile with the TS
+engine to the penny.
+
+Usage:
+    pence = to_pence(row[4])                   # int, from a cell value
+    column = pence_array(amounts)              # int64 array
+    totals = group_sum(codes, column, n)       # int64 per group
+    print(format_pounds(totals[0]))            # '£1,234.56'
+"""
+
+import math
+import sys
+from decimal import ROUND_FLOOR, Decimal, InvalidOperation
+
+import numpy as np
+
+EPSILON = sys.float_info.epsilon  # Number.EPSILON
+_HALF = Decimal('0.5')
+
+
+def _round_half_up(x: float) -> int:
+    # Exact for |x| < 2**52: x - floor(x) loses nothing
+    floor = math.floor(x)
+    return int(floor) + (x - floor >= 0.5)
+
+
+def _parse_text(text: str) -> Decimal:
+    cleaned = text.strip().replace('£', '').replace(',', '').replace(' ', '')
+    negative = cleaned.startswith('(') and cleaned.endswith(')')
+    if negative:
+        cleaned = cleaned[1:-1]
+    try:
+        value = Decimal(cleaned) if cleaned else Decimal(0)
+    except InvalidOperation:
+        raise ValueError(f'Not an amount: {text!r}') from None
+    return -value if negative else value
+
+
+def to_pence(value) -> int:
+    """A cell or JSON amount (number, numeric text, None) as int pence."""
+    if value is None or isinstance(value, (bool, np.bool_)):
+        return 0
+    if isinstance(value, int):
+        return value * 100
+    if isinstance(value, float):
+        if math.isnan(value):
+            return 0
+        return _round_half_up((value + EPSILON) * 100)
+    if isinstance(value, str):
+        value = _parse_text(value)
+    if isinstance(value, Decimal):
+        return int((value * 100 + _HALF).to_integral_value(rounding=ROUND_FLOOR))
+    return to_pence(float(value))
+
+
+def pence_array(values) -> np.ndarray:
+    """Vectorised to_pence: int64 pence for an array or sequence of amounts."""
+    arr = np.asarray(values)
+    if arr.dtype.kind == 'b':
+        return np.zeros(arr.shape, dtype=np.int64)   # to_pence(True) is 0
+    if arr.dtype.kind in 'iu':
+        return arr.astype(np.int64) * 100
+    if arr.dtype.kind == 'f':
+        x = (np.nan_to_num(arr) + EPSILON) * 100
+        floor = np.floor(x)
+        return (floor + (x - floor >= 0.5)).astype(np.int64)
+    flat = np.fromiter((to_pence(v) for v in arr.ravel()), dtype=np.int64, count=arr.size)
+    return flat.reshape(arr.shape)
+
+
+def pounds(pence) -> float:
+    """Pence as a float of pounds, for JSON (equal to money() of the amount)."""
+    return int(pence) / 100
+
+
+def format_pounds(pence, symbol: str = '£') -> str:
+    """'£1,234.56' / '-£12.00', from the integer, never via a float."""
+    pence = int(pence)
+    whole, frac = divmod(abs(pence), 100)
+    return f"{'-' if pence < 0 else ''}{symbol}{whole:,}.{frac:02d}"
+
+
+def group_sum(codes: np.ndarray, pence: np.ndarray, n_groups: int) -> np.ndarray:
+    """Integer per-group totals: out[g] = sum of pence where codes == g."""
+    out = np.zeros(n_groups, dtype=np.int64)
+    np.add.at(out, codes, pence)
+    return out
@@ -0,0 +1,126 @@
+"""
+Run cashflow-app TypeScript modules in a local node process.
+
+The differential checks (check_engine_parity, check_bills_parity,
+bench_variance) feed the same inputs to a Python port and to the app's
+own module, then diff the results. This holds the node side they share: a driver script gets
+loadModule(file, appDir), which transpiles the module and every
+`@/...` module it imports into a temporary directory of .mjs files and
+imports it.
+
+TypeScript comes from the typescript package in cashflow-app's
+devDependencies (npm ci), else Node's built-in type stripping (Node >=
+22.13). Without either the driver exits with NO_TS_EXIT, and run_driver
+reports the TS side as unavailable rather than failed.
+
+Usage:
+    driver = write_driver(workdir, 'check', BODY)    # BODY uses loadModule
+    ok, reason = run_driver(node, driver, [module_ts, APP_DIR, in_path, out_path])
+"""
+
+import os
+import subprocess
+from typing import List, Tuple
+
+APP_DIR = 'cashflow-app'
+LIB_DIR = os.path.join(APP_DIR, 'src', 'lib')
+NO_TS_EXIT = 3       # the driver's exit code when it cannot load TypeScript
+
+# Defines loadModule(file, appDir) for a driver body
+LOADER = r"""
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const { pathToFileURL } = require('url');
+
+function transpiler(appDir) {
+  let ts = null;
+  try {
+    ts = require(require.resolve('typescript', { paths: [path.resolve(appDir)] }));
+  } catch (err) {
+    ts = null;
+  }
+  if (ts) {
+    return (source, fileName) => ts.transpileModule(source, {
+      fileName,
+      compilerOptions: { module: ts.ModuleKind.ESNext, target: ts.ScriptTarget.ES2020 },
+    }).outputText;
+  }
+  const strip = require('module').stripTypeScriptTypes;
+  if (typeof strip === 'function') {
+    return (source) => strip(source);
+  }
+  console.error('TypeScript unavailable: run npm ci in ' + appDir + ' or use Node >= 22.13');
+  process.exit(%(no_ts_exit)d);
+}
+
+function resolveSource(base) {
+  for (const ext of ['.ts', '.tsx', '/index.ts']) {
+    if (fs.existsSync(base + ext)) return base + ext;
+  }
+  throw new Error('Cannot resolve ' + base);
+}
+
+// Writes file (and, depth first, the @/ modules it imports) under dir
+function emit(file, srcDir, dir, transpile, emitted) {
+  let rel = path.relative(srcDir, file);
+  if (rel.startsWith('..')) rel = path.basename(file);
+  const out = path.join(dir, rel.replace(/\.tsx?$/, '.mjs'));
+  if (emitted.has(out)) return out;
+  emitted.add(out);
+  const js = transpile(fs.readFileSync(file, 'utf8'), file)
+    .replace(/(\bfrom\s*|\bimport\s*\(?\s*)(["'])@\/([^"']+)\2/g, (match, lead, quote, spec) => {
+      const target = emit(resolveSource(path.join(srcDir, spec)), srcDir, dir, transpile, emitted);
+      let relSpec = path.relative(path.dirname(out), target).split(path.sep).join('/');
+      if (!relSpec.startsWith('.')) relSpec = './' + relSpec;
+      return lead + quote + relSpec + quote;
+    });
+  fs.mkdirSync(path.dirname(out), { recursive: true });
+  fs.writeFileSync(out, js);
+  return out;
+}
+
+// @/ is the src directory above the module, as in the app's tsconfig paths
+function sourceRoot(file, appDir) {
+  for (let dir = path.dirname(file); path.dirname(dir) !== dir; dir = path.dirname(dir)) {
+    if (path.basename(dir) === 'src') return dir;
+  }
+  return path.resolve(appDir, 'src');
+}
+
+async function loadModule(file, appDir) {
+  const transpile = transpiler(appDir);
+  const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'cashflow-ts-'));
+  try {
+    file = path.resolve(file);
+    const entry = emit(file, sourceRoot(file, appDir), dir, transpile, new Set());
+    return await import(pathToFileURL(entry).href);
+  } finally {
+    fs.rmSync(dir, { recursive: true, force: true });
+  }
+}
+""" % {'no_ts_exit': NO_TS_EXIT}
+
+
+def write_driver(workdir: str, name: str, body: str) -> str:
+    """Write LOADER plus body as <workdir>/<name>.cjs; returns its path."""
+    path = os.path.join(workdir, f'{name}.cjs')
+    with open(path, 'w') as f:
+        f.write(LOADER + body)
+    return path
+
+
+def run_driver(node: str, driver: str, args: List[str]) -> Tuple[bool, str]:
+    """(True, '') when the driver ran; (False, reason) when TypeScript is unavailable.
+
+    Any other failure raises RuntimeError with the driver's error message.
+    """
+    proc = subprocess.run([node, driver] + list(args), capture_output=True, text=True)
+    lines = proc.stderr.strip().splitlines() or [f'exit {proc.returncode}']
+    # A thrown error's message, not node's trailing version line
+    reason = next((line for line in lines if line.split(':')[0].endswith('Error')), lines[-1])
+    if proc.returncode == NO_TS_EXIT:
+        return False, reason
+    if proc.returncode != 0:
+        raise RuntimeError(f'{os.path.basename(driver)} failed: {reason}')
+    return True, ''
@@ -0,0 +1,125 @@
+"""
+Budget periods for the 2026 cashflow workbook.
+
+Python mirror of buildPeriods2026 / periodForDate in
+cashflow-app/src/lib/periods.ts:
+- Period 1 starts 22/12/2025 (special case because FM came early)
+- Period 2 starts 26/01/2026
+- After that: each period is 26th -> 25th
+
+build_periods(count) carries the same sequence on past 2026, for plans and
+fixtures that span several years.
+
+PeriodIndex replaces the per-row comparison chains with a bisect over the
+sorted period starts, and can assign a whole column of dates at once.
+"""
+
+from bisect import bisect_right
+from datetime import date, timedelta
+from typing import Iterable, List, NamedTuple, Optional
+
+
+class Period(NamedTuple):
+    id: int
+    start: date  # inclusive
+    end: date    # inclusive
+    label: str
+
+
+def _fmt(d: date) -> str:
+    return d.strftime('%d %b %Y')
+
+
+def _make_period(period_id: int, start: date, end: date) -> Period:
+    return Period(period_id, start, end, f'{_fmt(start)} – {_fmt(end)}')
+
+
+def build_periods(count: int = 13) -> List[Period]:
+    """buildPeriods2026's sequence carried on for count periods (26th -> 25th after P1)."""
+    periods = [_make_period(1, date(2025, 12, 22), date(2026, 1, 25))]
+
+    cur_start = date(2026, 1, 26)
+    for period_id in range(2, count + 1):
+        # End is the 25th of the month after the start
+        year, month = divmod(cur_start.month, 12)
+        end = date(cur_start.year + year, month + 1, 25)
+        periods.append(_make_period(period_id, cur_start, end))
+        cur_start = end + timedelta(days=1)
+
+    return periods[:count]
+
+
+def build_periods_2026() -> List[Period]:
+    """Periods 1..13 exactly as buildPeriods2026() produces them."""
+    return build_periods(13)
+
+
+def period_for_date(periods: List[Period], d: Optional[date]) -> Optional[Period]:
+    """Find which period (if any) contains the given date.
+
+    Linear scan, kept as the reference implementation; use PeriodIndex when
+    assigning more than a handful of dates.
+    """
+    if d is None:
+        return None
+    for p in periods:
+        if p.start <= d <= p.end:
+            return p
+    return None
+
+
+class PeriodIndex:
+    """Sorted period boundaries for O(log P) date -> period lookups.
+
+    Periods may be irregular (Period 1 runs 22 Dec - 25 Jan) and may leave
+    gaps; a date in a gap, before the first start or after the last end has
+    no period. Overlapping periods are rejected.
+    """
+
+    def __init__(self, periods: Iterable[Period]):
+        ordered = sorted(periods, key=lambda p: p.start)
+        for prev, cur in zip(ordered, ordered[1:]):
+            if cur.start <= prev.end:
+                raise ValueError(f'Period {cur.id} overlaps period {prev.id}')
+        self.periods = ordered
+        self._starts = [p.start for p in ordered]
+        self._np = None
+
+    def lookup(self, d: Optional[date]) -> Optional[Period]:
+        if d is None:
+            return None
+        i = bisect_right(self._starts, d) - 1
+        if i < 0:
+            return None
+        p = self.periods[i]
+        return p if d <= p.end else None
+
+    def period_id(self, d: Optional[date]) -> Optional[int]:
+        p = self.lookup(d)
+        return p.id if p else None
+
+    def assign(self, dates, missing: int = 0):
+        """Vectorised lookup: period id for every date in one searchsorted call.
+
+        `dates` is anything numpy can turn into datetime64[D] (an array, a list
+        of date objects or ISO strings). NaT and out-of-range dates get
+        `missing`. Returns an int64 array.
+        """
+        import numpy as np
+
+        if self._np is None:
+            self._np = (
+                np.array(self._starts, dtype='datetime64[D]'),
+                np.array([p.end for p in self.periods], dtype='datetime64[D]'),
+                np.array([p.id for p in self.periods], dtype=np.int64),
+            )
+        starts, ends, ids = self._np
+
+        days = np.asarray(dates, dtype='datetime64[D]')
+        if not len(ids):
+            return np.full(days.shape, missing, dtype=np.int64)
+        idx = np.searchsorted(starts, days, side='right') - 1
+        safe = idx.clip(0)
+        # NaT sorts last and compares False, so it falls through to `missing`
+        hit = (idx >= 0) & (days <= ends[safe])
+        return np.where(hit, ids[safe], missing)
@@ -0,0 +1,524 @@
+"""
+Tokenizer and parser for the TypeScript object-literal subset used in
+cashflow-app/src/data/plan.ts (and the generated *_transactions.ts fragments).
+
+The tokenizer makes one left-to-right pass over the source; every token
+pattern is deterministic (no nested quantifiers), so long labels and notes
+cost linear time. Comments, type annotations, template strings and function
+bodies are tokenized but only `const NAME(: Type) = {...}` / `[...]`
+initialisers are parsed:
+
+- object literals become ObjectLiteral (a dict) and arrays ArrayLiteral (a
+  list); both remember their source span, and objects the span of each
+  value, so callers can rewrite fields in place
+- strings, numbers, true/false/null behave as in JSON; `undefined` is None
+- anything that is not a literal (createDefaultPeriods(), PLAN_VERSION,
+  "x" as const) is kept as an Expr holding its source text
+
+Spans are character offsets into the decoded source text.
+
+Usage:
+    plan = load_plan()                      # SAMPLE_PLAN from plan.ts
+    for txn in plan.transactions: ...
+    txns = parse_transactions(open('period1_transactions.ts').read())
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+PLAN_PATH = 'cashflow-app/src/data/plan.ts'
+
+Span = Tuple[int, int]
+
+
+class PlanSyntaxError(ValueError):
+    def __init__(self, message: str, text: str, pos: int):
+        line = text.count('\n', 0, pos) + 1
+        col = pos - (text.rfind('\n', 0, pos) + 1) + 1
+        super().__init__(f'{message} at line {line}, column {col}')
+        self.pos = pos
+
+
+# ---------------------------------------------------------------------------
+# Tokenizer
+# ---------------------------------------------------------------------------
+
+class Token(NamedTuple):
+    kind: str    # 'string', 'number', 'ident', 'template', 'punct'
+    text: str    # source text of the token
+    start: int
+    end: int
+
+
+_TOKEN_RE = re.compile(r'''
+      (?P<ws>\s+)
+    | (?P<line_comment>//[^\n]*)
+    | (?P<block_comment>/\*)
+    | (?P<string>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+    | (?P<number>(?:0[xX][0-9a-fA-F_]+|(?:\d[\d_]*(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?))
+    | (?P<ident>[A-Za-z_$][\w$]*)
+    | (?P<template>`)
+    | (?P<punct>=>|\.\.\.|[{}\[\](),:;=?.<>|&!+\-*/%@#~^])
+''', re.VERBOSE | re.DOTALL)
+
+
+def _skip_template(text: str, pos: int) -> int:
+    """End offset of the template literal whose opening backtick is at pos."""
+    i = pos + 1
+    n = len(text)
+    depth = 0  # open ${ ... } substitutions
+    while i < n:
+        ch = text[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if depth == 0:
+            if ch == '`':
+                return i + 1
+            if text.startswith('${', i):
+                depth = 1
+                i += 2
+                continue
+        else:
+            if ch in '"\'':
+                m = _TOKEN_RE.match(text, i)
+                i = m.end() if m and m.lastgroup == 'string' else i + 1
+                continue
+            if ch == '`':
+                i = _skip_template(text, i)
+                continue
+            if ch == '{':
+                depth += 1
+            elif ch == '}':
+                depth -= 1
+        i += 1
+    raise PlanSyntaxError('Unterminated template literal', text, pos)
+
+
+def tokenize(text: str) -> Iterator[Token]:
+    """Yield significant tokens (whitespace and comments dropped)."""
+    pos = 0
+    n = len(text)
+    match = _TOKEN_RE.match
+    while pos < n:
+        m = match(text, pos)
+        if m is None:
+            raise PlanSyntaxError(f'Unexpected character {text[pos]!r}', text, pos)
+        kind = m.lastgroup
+        end = m.end()
+        if kind == 'block_comment':
+            close = text.find('*/', end)
+            if close < 0:
+                raise PlanSyntaxError('Unterminated comment', text, pos)
+            end = close + 2
+        elif kind == 'template':
+            end = _skip_template(text, pos)
+        if kind not in ('ws', 'line_comment', 'block_comment'):
+            yield Token(kind, text[pos:end], pos, end)
+        pos = end
+
+
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+_ESCAPE_RE = re.compile(r'\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|\r\n|.)', re.DOTALL)
+
+
+def _unescape(match: re.Match) -> str:
+    esc = match.group(1)
+    if esc[0] == 'u':
+        return chr(int(esc[1:].strip('{}'), 16))
+    if esc[0] == 'x':
+        return chr(int(esc[1:], 16))
+    if esc in ('\n', '\r\n'):
+        return ''  # line continuation
+    return _ESCAPES.get(esc, esc)
+
+
+def decode_string(token_text: str) -> str:
+    body = token_text[1:-1]
+    if '\\' not in body:
+        return body
+    return _ESCAPE_RE.sub(_unescape, body)
+
+
+def _number(token_text: str):
+    clean = token_text.replace('_', '')
+    if clean[:2] in ('0x', '0X'):
+        return int(clean, 16)
+    if any(c in clean for c in '.eE'):
+        return float(clean)
+    return int(clean)
+
+
+# ---------------------------------------------------------------------------
+# Parser
+# ---------------------------------------------------------------------------
+
+class ObjectLiteral(dict):
+    """An object literal; .span covers the braces, .value_spans each value."""
+
+    def __init__(self, span: Span = (0, 0)):
+        super().__init__()
+        self.span = span
+        self.value_spans: Dict[str, Span] = {}
+
+
+class ArrayLiteral(list):
+    """An array literal; .span covers the brackets. Holes (`,,`) are dropped."""
+
+    def __init__(self, span: Span = (0, 0)):
+        super().__init__()
+        self.span = span
+
+
+@dataclass(frozen=True)
+class Expr:
+    """A value that is not a literal, e.g. createDefaultPeriods()."""
+    source: str
+    span: Span
+
+
+_KEYWORD_VALUES = {'true': True, 'false': False, 'null': None, 'undefined': None}
+_OPEN = {'{': '}', '[': ']', '(': ')'}
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = list(tokenize(text))
+        self.pos = 0
+
+    def peek(self, offset: int = 0) -> Optional[Token]:
+        i = self.pos + offset
+        return self.tokens[i] if i < len(self.tokens) else None
+
+    def error(self, message: str):
+        tok = self.peek()
+        raise PlanSyntaxError(message, self.text, tok.start if tok else len(self.text))
+
+    def expect(self, text: str) -> Token:
+        tok = self.peek()
+        if tok is None or tok.kind != 'punct' or tok.text != text:
+            self.error(f'Expected {text!r}')
+        self.pos += 1
+        return tok
+
+    def skip_balanced(self) -> int:
+        """Skip one token, or a whole bracketed group; return its end offset."""
+        tok = self.tokens[self.pos]
+        self.pos += 1
+        if tok.kind != 'punct' or tok.text not in _OPEN:
+            return tok.end
+        stack = [_OPEN[tok.text]]
+        while stack:
+            tok = self.peek()
+            if tok is None:
+                self.error(f'Unbalanced {stack[-1]!r}')
+            self.pos += 1
+            if tok.kind == 'punct':
+                if tok.text in _OPEN:
+                    stack.append(_OPEN[tok.text])
+                elif tok.text == stack[-1]:
+                    stack.pop()
+        return tok.end
+
+    def value(self):
+        tok = self.peek()
+        if tok is None:
+            self.error('Unexpected end of input')
+        if tok.kind == 'punct' and tok.text == '{':
+            result = self.object()
+        elif tok.kind == 'punct' and tok.text == '[':
+            result = self.array()
+        elif tok.kind == 'string':
+            self.pos += 1
+            result = decode_string(tok.text)
+        elif tok.kind == 'number':
+            self.pos += 1
+            result = _number(tok.text)
+        elif tok.kind == 'punct' and tok.text in '+-' and (self.peek(1) or tok).kind == 'number':
+            self.pos += 2
+            result = _number(self.tokens[self.pos - 1].text)
+            if tok.text == '-':
+                result = -result
+        elif tok.kind == 'ident' and tok.text in _KEYWORD_VALUES and not self._continues(1):
+            self.pos += 1
+            result = _KEYWORD_VALUES[tok.text]
+        else:
+            return self.expression()
+        if self._continues(0):
+            # e.g. `[...] as const`, `"a" + b`: keep the whole expression as source
+            return self.expression(start=tok.start)
+        return result
+
+    def _continues(self, offset: int) -> bool:
+        """Whether the token at offset extends the current value into an expression."""
+        nxt = self.peek(offset)
+        if nxt is None:
+            return False
+        if nxt.kind == 'punct':
+            return nxt.text not in (',', '}', ']', ')', ';', ':')
+        return nxt.kind == 'ident' and nxt.text in ('as', 'satisfies')
+
+    def expression(self, start: Optional[int] = None) -> Expr:
+        """Consume tokens up to the next top-level , } ] ) or ;."""
+        first = self.peek()
+        start = first.start if start is None else start
+        end = start
+        while True:
+            tok = self.peek()
+            if tok is None or (tok.kind == 'punct' and tok.text in (',', '}', ']', ')', ';')):
+                break
+            end = self.skip_balanced()
+        if end == start:
+            self.error('Expected a value')
+        return Expr(self.text[start:end], (start, end))
+
+    def object(self) -> ObjectLiteral:
+        open_tok = self.expect('{')
+        obj = ObjectLiteral()
+        while True:
+            tok = self.peek()
+            if tok is None:
+                self.error("Expected '}'")
+            if tok.kind == 'punct' and tok.text == '}':
+                break
+            if tok.kind == 'punct' and tok.text == '...':
+                self.pos += 1
+                self.expression()
+            else:
+                if tok.kind == 'string':
+                    key = decode_string(tok.text)
+                elif tok.kind in ('ident', 'number'):
+                    key = tok.text
+                else:
+                    self.error('Expected a property name')
+                self.pos += 1
+                nxt = self.peek()
+                if nxt is not None and nxt.kind == 'punct' and nxt.text in (',', '}'):
+                    # shorthand property: { id }
+                    obj[key] = Expr(tok.text, (tok.start, tok.end))
+                    obj.value_spans[key] = (tok.start, tok.end)
+                else:
+                    self.expect(':')
+                    value_start = self.peek().start if self.peek() else len(self.text)
+                    obj[key] = self.value()
+                    obj.value_spans[key] = (value_start, self.tokens[self.pos - 1].end)
+            tok = self.peek()
+            if tok is not None and tok.kind == 'punct' and tok.text == ',':
+                self.pos += 1
+            elif tok is None or tok.text != '}':
+                self.error("Expected ',' or '}'")
+        close_tok = self.expect('}')
+        obj.span = (open_tok.start, close_tok.end)
+        return obj
+
+    def array(self) -> ArrayLiteral:
+        open_tok = self.expect('[')
+        arr = ArrayLiteral()
+        while True:
+            tok = self.peek()
+            if tok is None:
+                self.error("Expected ']'")
+            if tok.kind == 'punct' and tok.text == ']':
+                break
+            if tok.kind == 'punct' and tok.text == ',':
+                self.pos += 1  # hole
+                continue
+            arr.append(self.value())
+            tok = self.peek()
+            if tok is not None and tok.kind == 'punct' and tok.text == ',':
+                self.pos += 1
+            elif tok is None or tok.text != ']':
+                self.error("Expected ',' or ']'")
+        close_tok = self.expect(']')
+        arr.span = (open_tok.start, close_tok.end)
+        return arr
+
+    def declarations(self) -> Dict[str, object]:
+        """Initialisers of every `const|let|var NAME(: T) = <value>` declaration."""
+        found = {}
+        tokens = self.tokens
+        while self.pos < len(tokens):
+            tok = tokens[self.pos]
+            self.pos += 1
+            if tok.kind != 'ident' or tok.text not in ('const', 'let', 'var'):
+                continue
+            name_tok = self.peek()
+            if name_tok is None or name_tok.kind != 'ident':
+                continue
+            self.pos += 1
+            # Skip a type annotation up to the top-level '='
+            while self.peek() is not None and self.peek().text not in ('=', ';', ','):
+                self.skip_balanced()
+            tok = self.peek()
+            if tok is None or tok.text != '=':
+                continue
+            self.pos += 1
+            first = self.peek()
+            if first is not None and first.kind == 'punct' and first.text in ('{', '['):
+                found[name_tok.text] = self.value()
+        return found
+
+    def elements(self) -> List:
+        """Values of a bare, comma-separated element list (an array body)."""
+        values = []
+        while self.peek() is not None:
+            tok = self.peek()
+            if tok.kind == 'punct' and tok.text in (',', ';'):
+                self.pos += 1
+                continue
+            values.append(self.value())
+        return values
+
+
+def parse_literal(text: str):
+    """Parse a single literal value, e.g. the text of one object or array."""
+    parser = _Parser(text)
+    value = parser.value()
+    if parser.peek() is not None and parser.peek().text != ';':
+        parser.error('Unexpected trailing input')
+    return value
+
+
+def parse_declarations(text: str) -> Dict[str, object]:
+    """Object/array initialisers of a module, keyed by variable name."""
+    return _Parser(text).declarations()
+
+
+# ---------------------------------------------------------------------------
+# Typed records
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Transaction:
+    id: str
+    date: str
+    label: str
+    amount: float
+    type: str
+    category: str
+    notes: Optional[str] = None
+    linked_rule_id: Optional[str] = None
+    linked_bill_id: Optional[str] = None
+    goal_id: Optional[str] = None
+    span: Span = (0, 0)
+    source: ObjectLiteral = field(default_factory=ObjectLiteral, repr=False, compare=False)
+
+
+@dataclass
+class Bill:
+    id: str
+    label: str
+    amount: float
+    due_day: int
+    category: str
+    enabled: bool = True
+    span: Span = (0, 0)
+    source: ObjectLiteral = field(default_factory=ObjectLiteral, repr=False, compare=False)
+
+
+@dataclass
+class Rule:
+    id: str
+    kind: str   # 'income' or 'outflow'
+    label: str
+    amount: float
+    cadence: str
+    seed_date: str
+    enabled: bool = True
+    category: Optional[str] = None  # outflow rules only
+    span: Span = (0, 0)
+    source: ObjectLiteral = field(default_factory=ObjectLiteral, repr=False, compare=False)
+
+
+def _field(obj: ObjectLiteral, key: str, default=None):
+    value = obj.get(key, default)
+    return default if isinstance(value, Expr) else value
+
+
+def _require(obj: ObjectLiteral, keys, what: str):
+    missing = [k for k in keys if k not in obj]
+    if missing:
+        raise ValueError(f'{what} at offset {obj.span[0]} is missing {", ".join(missing)}')
+
+
+def transaction_from_literal(obj: ObjectLiteral) -> Transaction:
+    _require(obj, ('id', 'date', 'label', 'amount', 'type', 'category'), 'Transaction')
+    return Transaction(
+        id=obj['id'], date=obj['date'], label=obj['label'], amount=obj['amount'],
+        type=obj['type'], category=obj['category'],
+        notes=_field(obj, 'notes'),
+        linked_rule_id=_field(obj, 'linkedRuleId'),
+        linked_bill_id=_field(obj, 'linkedBillId'),
+        goal_id=_field(obj, 'goalId'),
+        span=obj.span, source=obj,
+    )
+
+
+def bill_from_literal(obj: ObjectLiteral) -> Bill:
+    _require(obj, ('id', 'label', 'amount', 'dueDay', 'category'), 'Bill')
+    return Bill(
+        id=obj['id'], label=obj['label'], amount=obj['amount'], due_day=obj['dueDay'],
+        category=obj['category'], enabled=_field(obj, 'enabled', True),
+        span=obj.span, source=obj,
+    )
+
+
+def rule_from_literal(obj: ObjectLiteral, kind: str) -> Rule:
+    _require(obj, ('id', 'label', 'amount', 'cadence', 'seedDate'), 'Rule')
+    return Rule(
+        id=obj['id'], kind=kind, label=obj['label'], amount=obj['amount'],
+        cadence=obj['cadence'], seed_date=obj['seedDate'],
+        enabled=_field(obj, 'enabled', True), category=_field(obj, 'category'),
+        span=obj.span, source=obj,
+    )
+
+
+def _objects(value) -> List[ObjectLiteral]:
+    return [v for v in value if isinstance(v, ObjectLiteral)] if isinstance(value, list) else []
+
+
+@dataclass
+class ParsedPlan:
+    name: str
+    literal: ObjectLiteral
+    transactions: List[Transaction]
+    bills: List[Bill]
+    income_rules: List[Rule]
+    outflow_rules: List[Rule]
+    text: str = field(repr=False, default='')
+
+    @property
+    def rules(self) -> List[Rule]:
+        return self.income_rules + self.outflow_rules
+
+    def transaction(self, txn_id: str) -> Optional[Transaction]:
+        return next((t for t in self.transactions if t.id == txn_id), None)
+
+
+def parse_plan(text: str, name: str = 'SAMPLE_PLAN') -> ParsedPlan:
+    """Typed view of the `const <name> = {...}` plan literal in text."""
+    declarations = parse_declarations(text)
+    literal = declarations.get(name)
+    if not isinstance(literal, ObjectLiteral):
+        raise KeyError(f'No object literal named {name}')
+    return ParsedPlan(
+        name=name,
+        literal=literal,
+        transactions=[transaction_from_literal(o) for o in _objects(literal.get('transactions'))],
+        bills=[bill_from_literal(o) for o in _objects(literal.get('bills'))],
+        income_rules=[rule_from_literal(o, 'income') for o in _objects(literal.get('incomeRules'))],
+        outflow_rules=[rule_from_literal(o, 'outflow') for o in _objects(literal.get('outflowRules'))],
+        text=text,
+    )
+
+
+def load_plan(path: str = PLAN_PATH, name: str = 'SAMPLE_PLAN') -> ParsedPlan:
+    with open(path, encoding='utf-8') as f:
+        return parse_plan(f.read(), name)
+
+
+def parse_transactions(text: str) -> List[Transaction]:
+    """Transactions from a bare list of object literals (a transactions fragment)."""
+    return [transaction_from_literal(o) for o in _objects(_Parser(text).elements())]
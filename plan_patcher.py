@@ -0,0 +1,203 @@
+"""
+Batch, record-level edits to plan.ts written back in place.
+
+Parses plan.ts once (plan_parser), applies any number of field edits to the
+in-memory Transaction records (by id or by predicate), then writes only the
+changed byte ranges back to the file:
+
+- same-length replacements are written at their offsets;
+- from the first edit that changes length, the rest of the file is written
+  once and the file truncated.
+
+Category counts and deltas come from the in-memory records, so there is no
+rescanning of the text after edits.
+
+Usage:
+    patch = PlanPatcher()
+    patch.update(lambda t: t.notes == 'House Keep', category='bill')
+    patch.update_by_id('txn-7', notes='Electricity & Gas')
+    print(patch.category_deltas())
+    patch.write()
+"""
+
+import json
+import math
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from plan_parser import PLAN_PATH, ParsedPlan, Transaction, parse_plan
+
+# Transaction attribute -> plan.ts property name
+TS_KEYS = {
+    'id': 'id',
+    'date': 'date',
+    'label': 'label',
+    'amount': 'amount',
+    'type': 'type',
+    'category': 'category',
+    'notes': 'notes',
+    'linked_rule_id': 'linkedRuleId',
+    'linked_bill_id': 'linkedBillId',
+    'goal_id': 'goalId',
+}
+
+
+def ts_literal(value) -> str:
+    """TypeScript source for a scalar value, in plan.ts style."""
+    if value is None:
+        return 'undefined'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, float)):
+        if not math.isfinite(value):
+            raise ValueError(f'{value!r} has no plan.ts literal')
+        return repr(value)
+    return json.dumps(str(value), ensure_ascii=False)
+
+
+def notes_in(*notes: str) -> Callable[[Transaction], bool]:
+    wanted = set(notes)
+    return lambda txn: txn.notes in wanted
+
+
+class PlanPatcher:
+    def __init__(self, path: str = PLAN_PATH, name: str = 'SAMPLE_PLAN'):
+        self.path = path
+        self.name = name
+        with open(path, encoding='utf-8', newline='') as f:
+            self._load(f.read())
+
+    def _load(self, text: str):
+        self.text = text
+        self.plan: ParsedPlan = parse_plan(text, self.name)
+        self._by_id: Dict[str, Transaction] = {t.id: t for t in self.plan.transactions}
+        self._initial = Counter(t.category for t in self.plan.transactions)
+        # (char start, char end) of the replaced source -> new source
+        self._edits: Dict[Tuple[int, int], str] = {}
+        # insertion offset -> {property name: source} for keys an object lacks
+        self._inserts: Dict[int, Dict[str, str]] = {}
+        self.changed_ids: List[str] = []
+
+    @property
+    def transactions(self) -> List[Transaction]:
+        return self.plan.transactions
+
+    def _set(self, txn: Transaction, attr: str, value) -> bool:
+        if attr not in TS_KEYS:
+            raise AttributeError(f'Transaction has no editable field {attr!r}')
+        if getattr(txn, attr) == value:
+            return False
+        key = TS_KEYS[attr]
+        obj = txn.source
+        if key in obj.value_spans:
+            self._edits[obj.value_spans[key]] = ts_literal(value)
+        else:
+            self._insert(obj, key, value)
+        setattr(txn, attr, value)
+        return True
+
+    def _insert(self, obj, key: str, value):
+        """Add a property the object lacks; setting it again replaces the pending one."""
+        if obj.value_spans:
+            # After the last property: `, key: value`
+            at, first = max(end for _, end in obj.value_spans.values()), ', '
+        else:
+            # Inside the empty braces: `{ key: value }`
+            at, first = obj.span[0] + 1, ' '
+        pending = self._inserts.setdefault(at, {})
+        if value is None:
+            pending.pop(key, None)
+        else:
+            pending[key] = ts_literal(value)
+        if pending:
+            source = ', '.join(f'{k}: {v}' for k, v in pending.items())
+            self._edits[(at, at)] = first + source + (' ' if first == ' ' else '')
+        else:
+            self._edits.pop((at, at), None)
+
+    def update_by_id(self, txn_id: str, **changes) -> bool:
+        """Edit one transaction; values may be callables of the transaction."""
+        try:
+            txn = self._by_id[txn_id]
+        except KeyError:
+            raise KeyError(f'No transaction {txn_id} in {self.name}') from None
+        return self._apply(txn, changes)
+
+    def update(self, where: Callable[[Transaction], bool], **changes) -> int:
+        """Edit every transaction matching where; returns how many changed."""
+        return sum(self._apply(txn, changes) for txn in self.plan.transactions if where(txn))
+
+    def _apply(self, txn: Transaction, changes) -> bool:
+        changed = False
+        for attr, value in changes.items():
+            if callable(value):
+                value = value(txn)
+            changed |= self._set(txn, attr, value)
+        if changed and txn.id not in self.changed_ids:
+            self.changed_ids.append(txn.id)
+        return changed
+
+    def category_counts(self) -> Counter:
+        return Counter(t.category for t in self.plan.transactions)
+
+    def category_deltas(self) -> Dict[str, Tuple[int, int, int]]:
+        """category -> (before, after, after - before), for every category seen."""
+        after = self.category_counts()
+        return {cat: (self._initial[cat], after[cat], after[cat] - self._initial[cat])
+                for cat in sorted(set(self._initial) | set(after))}
+
+    def write(self, path: Optional[str] = None) -> int:
+        """Write pending edits; returns the number of bytes written."""
+        if not self._edits:
+            return 0
+        path = path or self.path
+        text = self.text
+        edits = sorted(self._edits.items())
+
+        # Char offsets -> UTF-8 byte offsets, walking the text once
+        byte_edits = []
+        pos = byte_pos = 0
+        for (start, end), new in edits:
+            byte_start = byte_pos + len(text[pos:start].encode('utf-8'))
+            byte_end = byte_start + len(text[start:end].encode('utf-8'))
+            byte_edits.append((byte_start, byte_end, new.encode('utf-8')))
+            pos, byte_pos = end, byte_end
+
+        written = 0
+        mode = 'r+b' if path == self.path else 'wb'
+        with open(path, mode) as f:
+            if mode == 'wb':
+                f.write(self._patched_text().encode('utf-8'))
+                written = f.tell()
+            else:
+                for i, (byte_start, byte_end, new) in enumerate(byte_edits):
+                    if len(new) != byte_end - byte_start:
+                        # Everything after here shifts: write the tail once
+                        tail = self._patched_text(from_char=edits[i][0][0]).encode('utf-8')
+                        f.seek(byte_start)
+                        f.write(tail)
+                        f.truncate()
+                        written += len(tail)
+                        break
+                    f.seek(byte_start)
+                    f.write(new)
+                    written += len(new)
+
+        if path == self.path:
+            # Re-parse the patched text so spans match the file again
+            initial, changed_ids = self._initial, self.changed_ids
+            self._load(self._patched_text())
+            self._initial, self.changed_ids = initial, changed_ids
+        return written
+
+    def _patched_text(self, from_char: int = 0) -> str:
+        parts = []
+        pos = from_char
+        for (start, end), new in sorted(self._edits.items()):
+            if start < from_char:
+                continue
+            parts.append(self.text[pos:start])
+            parts.append(new)
+            pos = end
+        parts.append(self.text[pos:])
+        return ''.join(parts)
@@ -5,43 +5,13 @@ House Keep and One-Off should now be 'bill' not 'allowance'/'other'.
 Donations should be 'giving'.
 """
 
-import json
+from plan_parser import load_plan
 
-# Read current transactions from plan
-with open('cashflow-app/src/data/plan.ts', 'r') as f:
-    content = f.read()
+# Read current transactions from plan.ts
+transactions = load_plan().transactions
+print(f"Found {len(transactions)} transactions")
 
-# Extract the transactions array
-import re
-trans_match = re.search(r'transactions: \[(.*?)\n  \],', content, re.DOTALL)
-if not trans_match:
-    print("Could not find transactions array")
-    exit(1)
-
-# Simple regex extraction - this is hacky but works for our format
-trans_section = trans_match.group(1)
-
-# Parse each transaction line
-transactions = []
-for line in trans_section.strip().split('\n'):
-    if 'id: "txn-' in line:
-        # Extract the full transaction object
-        match = re.search(r'\{ (id: .*?) \},?$', line)
-        if match:
-            obj_str = "{" + match.group(1) + "}"
-            # Evaluate as JavaScript-like object
-            # Convert to Python dict notation
-            obj_str = obj_str.replace(': "', ': "').replace('", category:', '", "category":').replace('notes:', '"notes":').replace('linkedRuleId:', '"linkedRuleId":')
-            obj_str = obj_str.replace('undefined', 'null')
-            obj_str = obj_str.replace(' type:', ' "type":').replace(' amount:', ' "amount":').replace(' date:', ' "date":').replace(' label:', ' "label":').replace(' id:', ' "id":')
-            try:
-                obj = eval(obj_str.replace("'", '"'))
-            except:
-                pass
-
-print("This approach is too complex. Let me use the extracted JSON from before and re-categorize it...")
-
-# Actually, let's use the categorization mapping from Excel
+# Categorization mapping from Excel
 categorization_map = {
     # Current "allowance" items that should be "bill"  
     "House Keep": "bill",
@@ -57,3 +27,10 @@ categorization_map = {
 print("Category remapping:")
 for item, category in categorization_map.items():
     print(f"  {item} -> {category}")
+
+print()
+print("Transactions to re-categorize:")
+for txn in transactions:
+    new_category = categorization_map.get(txn.notes or '')
+    if new_category and new_category != txn.category:
+        print(f"  {txn.id}: {txn.label} ({txn.notes}) {txn.category} -> {new_category}")
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Occurrence dates of recurring income/outflow rules and bills.
+
+generateRuleEvents in cashflow-app/src/lib/cashflowEngine.ts finds a
+rule's first date in a period by stepping from rule.seedDate
+(`while (cur < start)`), again for every period, so a weekly rule seeded
+years ago costs O(distance) per period per rule. Here the first
+occurrence in a window is computed arithmetically and every occurrence
+in the window comes back as one datetime64[D] array:
+
+- weekly/biweekly: seed + k * 7 or 14 days, the first k from the day offset
+- monthly: the seed's day of month in every month, clamped like clampDay
+- quarterly/annual: Date.setMonth stepping, overflow included (31 Jan plus
+  3 months is 1 May, and every later step keeps day 1). A day past the
+  28th can only overflow within the first two years of steps, so only
+  those are walked; the rest is month arithmetic
+
+Windows are inclusive. Results are cached per (cadence, seedDate, window)
+and returned read-only; a rule's id, label and amount do not change its
+dates, so rules on the same schedule share an entry.
+
+Usage:
+    dates = occurrences('weekly', '2019-03-04', first, last)
+    rule_index, dates = expand_rules(plan['outflowRules'], first, last)
+"""
+
+from functools import lru_cache
+from typing import Iterable, Tuple
+
+import numpy as np
+
+CADENCE_DAYS = {'weekly': 7, 'biweekly': 14}
+CADENCE_MONTHS = {'quarterly': 3, 'annual': 12}
+CADENCES = ('weekly', 'biweekly', 'monthly', 'quarterly', 'annual')
+CACHE_SIZE = 4096
+
+# Every month has at least this many days, so a day up to it never overflows
+_SAFE_DAY = 28
+# A day past the 28th overflows within two years of steps if it ever does:
+# every step cycle meets each of its months once a year, and one of any
+# two consecutive Februaries has 28 days
+_OVERFLOW_MONTHS = 24
+
+_NO_DATES = np.array([], dtype='datetime64[D]')
+_NO_DATES.flags.writeable = False
+
+
+def _frozen(dates: np.ndarray) -> np.ndarray:
+    dates.flags.writeable = False
+    return dates
+
+
+def _month_index(d: np.datetime64) -> int:
+    return int(d.astype('datetime64[M]').astype(np.int64))
+
+
+def _day_of_month(d: np.datetime64) -> int:
+    return int((d - d.astype('datetime64[M]')).astype(np.int64)) + 1
+
+
+def _days_in_month(month_index):
+    months = np.asarray(month_index, dtype=np.int64).astype('datetime64[M]')
+    return ((months + 1).astype('datetime64[D]') - months.astype('datetime64[D]')).astype(np.int64)
+
+
+def _dates(month_index, day) -> np.ndarray:
+    """datetime64[D] for month index (months since 1970-01) and an in-range day."""
+    return np.asarray(month_index, dtype=np.int64).astype('datetime64[M]').astype('datetime64[D]') + (day - 1)
+
+
+def _window(first, last) -> Tuple[np.datetime64, np.datetime64]:
+    return np.datetime64(first, 'D'), np.datetime64(last, 'D')
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def monthly_occurrences(day: int, first, last) -> np.ndarray:
+    """Day `day` of every month in [first, last], clamped into the month."""
+    first, last = _window(first, last)
+    months = np.arange(_month_index(first), _month_index(last) + 1)
+    dates = _dates(months, np.clip(int(day), 1, _days_in_month(months)))
+    return _frozen(dates[(dates >= first) & (dates <= last)])
+
+
+def _every_n_days(seed: np.datetime64, step: int, first, last) -> np.ndarray:
+    if seed > last:
+        return _NO_DATES
+    skip = max(0, -(-int((first - seed).astype(np.int64)) // step))
+    return _frozen(np.arange(seed + skip * step, last + 1, step))
+
+
+def _every_n_months(seed: np.datetime64, step: int, first, last) -> np.ndarray:
+    # (month index, day) after each setMonth(getMonth() + step); walk only
+    # while the day could still overflow, collecting those dates
+    month, day = _month_index(seed), _day_of_month(seed)
+    walked = []
+    for _ in range(_OVERFLOW_MONTHS // step + 1):
+        if day <= _SAFE_DAY:
+            break
+        walked.append((month, day))
+        month += step
+        length = int(_days_in_month(month))
+        if day > length:
+            month, day = month + 1, day - length
+    else:
+        # Never overflowed in a full cycle: the day fits every month it meets
+        walked = []
+        month, day = _month_index(seed), _day_of_month(seed)
+
+    head = _dates([m for m, _ in walked], np.array([d for _, d in walked], dtype=np.int64))
+
+    # From here on the day is fixed: month + k * step for k >= 0
+    lo = max(0, (_month_index(first) - month) // step)
+    hi = (_month_index(last) - month) // step
+    tail = _dates(month + step * np.arange(lo, max(lo, hi + 1)), day)
+    dates = np.concatenate((head, tail))
+    return _frozen(dates[(dates >= first) & (dates <= last)])
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def occurrences(cadence: str, seed_date: str, first, last) -> np.ndarray:
+    """Dates a rule with this cadence and seed falls on within [first, last]."""
+    seed = np.datetime64(str(seed_date)[:10], 'D')
+    first, last = _window(first, last)
+    if first > last:
+        return _NO_DATES
+    if cadence == 'monthly':
+        return monthly_occurrences(_day_of_month(seed), first, last)
+    if cadence in CADENCE_DAYS:
+        return _every_n_days(seed, CADENCE_DAYS[cadence], first, last)
+    if cadence in CADENCE_MONTHS:
+        return _every_n_months(seed, CADENCE_MONTHS[cadence], first, last)
+    raise ValueError(f'Unknown cadence {cadence!r} (expected one of {", ".join(CADENCES)})')
+
+
+def expand_rules(rules: Iterable[dict], first, last) -> Tuple[np.ndarray, np.ndarray]:
+    """Occurrences of many plan rules in one pair of arrays.
+
+    Returns (rule_index, dates): for each occurrence in [first, last], the
+    position of its rule in `rules` and its date, grouped by rule. Disabled
+    rules contribute nothing.
+    """
+    first, last = _window(first, last)
+    parts = [(i, occurrences(rule['cadence'], rule['seedDate'], first, last))
+             for i, rule in enumerate(rules) if rule.get('enabled')]
+    if not parts:
+        return np.array([], dtype=np.int64), _NO_DATES
+    index = np.repeat(np.array([i for i, _ in parts], dtype=np.int64), [len(d) for _, d in parts])
+    return index, np.concatenate([d for _, d in parts])
+
+
+def clear_cache() -> None:
+    occurrences.cache_clear()
+    monthly_occurrences.cache_clear()
@@ -1,16 +1,12 @@
-import openpyxl
+from workbook_cache import load_snapshot
 
-wb = openpyxl.load_workbook('FINAL_2026_Cashflow_System_AppleStyle_v3_Start22Dec2025 - Copy (2).xlsx', data_only=True)
-bbp = wb['Budget by Period']
+bbp = load_snapshot().sheet_rows('Budget by Period')
 
 print('Budget by Period - All Categories:')
 print('=' * 60)
 
 categories = {}
-for row in range(2, 35):
-    category = bbp[f'A{row}'].value
-    item = bbp[f'B{row}'].value
-    budget = bbp[f'C{row}'].value
+for category, item, budget, *_ in bbp[1:34]:
     
     if category and item and budget:
         if category not in categories:
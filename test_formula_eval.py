@@ -0,0 +1,116 @@
+import os
+import re
+import zipfile
+from datetime import datetime
+
+import openpyxl
+import pytest
+
+from extract_periods import partition_transactions
+from formula_eval import WorkbookEvaluator, column_letter
+from workbook_reader import WORKBOOK_PATH, iter_transactions
+
+PERIOD_FORMULA = "=IFERROR(MATCH(A{r},'Periods 26-25'!$C$2:$C$4,1),\"\")"
+ROWS = [
+    (datetime(2025, 12, 20), 'Expense', 'Food', 'Before P1', -4),
+    (datetime(2025, 12, 22), 'Expense', 'Food', 'Tesco', -10.5),
+    (datetime(2026, 1, 25), 'Expense', 'Rent', 'Landlord', -900),
+    (datetime(2026, 1, 26), 'Income', 'Income - FM', 'Salary', 1500),
+    (datetime(2026, 2, 27), 'Expense', 'Food', 'Lidl', -20.25),
+]
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    """Workbook as a non-recalculating tool saves it: formulas, no cached values."""
+    wb = openpyxl.Workbook()
+    periods = wb.active
+    periods.title = 'Periods 26-25'
+    periods.append(('Period', 'Label', 'Start', 'End'))
+    for i, (start, end) in enumerate([((2025, 12, 22), (2026, 1, 25)), ((2026, 1, 26), (2026, 2, 25)),
+                                      ((2026, 2, 26), (2026, 3, 25))], 1):
+        periods.append((i, f'P{i}', datetime(*start), datetime(*end)))
+
+    txns = wb.create_sheet('Transactions')
+    txns.append(('Date', 'Type', 'Category', 'Description', 'Amount (£)', 'One-off?', 'Payment', 'Notes', 'Period'))
+    for r, row in enumerate(ROWS, 2):
+        txns.append(row + (None, None, None, PERIOD_FORMULA.format(r=r)))
+
+    budget = wb.create_sheet('Budget by Period')
+    budget.append(('Group', 'Item', 'Budget', 'Actual', 'Variance'))
+    for r, item in enumerate(('Food', 'Rent'), 2):
+        budget.append(('VARIABLE', item, 50, f'=-SUMIFS(Transactions!$E:$E,Transactions!$C:$C,$B{r},'
+                                             f'Transactions!$I:$I,1)', f'=C{r}-D{r}'))
+    budget['F2'] = '=$A$2:$A$3'
+
+    path = tmp_path / 'book.xlsx'
+    wb.save(path)
+    return str(path)
+
+
+def test_period_column(workbook):
+    with WorkbookEvaluator(workbook) as wb:
+        assert wb.column('Transactions', 'I')[2:].tolist() == [None, 1, 1, 2, 3]
+
+
+def test_sumifs_over_recomputed_periods(workbook):
+    with WorkbookEvaluator(workbook) as wb:
+        rows = list(wb.rows('Budget by Period', 'B:E', min_row=2))
+    assert rows == [('Food', 50, 10.5, 39.5), ('Rent', 50, 900, -850)]
+
+
+def test_range_result_is_unsupported_not_fatal(workbook):
+    with WorkbookEvaluator(workbook) as wb:
+        assert wb.column('Budget by Period', 'F')[2] is None
+        assert wb.column('Budget by Period', 'E')[2] == 39.5
+        assert ('Budget by Period', 'F2') in wb.unsupported
+
+
+def test_stale_lists_cells_without_cache(workbook):
+    with WorkbookEvaluator(workbook) as wb:
+        stale = {cell.ref for cell in wb.stale('Transactions')}
+    assert stale == {'I3', 'I4', 'I5', 'I6'}
+
+
+def test_streamed_periods_match_evaluated(workbook):
+    streamed = list(iter_transactions(workbook))
+    assert [r.period for r in streamed] == [None, 1, 1, 2, 3]
+    assert streamed == list(iter_transactions(workbook, evaluate=True))
+
+
+def test_streamed_amount_formulas_are_evaluated(workbook):
+    wb = openpyxl.load_workbook(workbook)
+    wb['Transactions']['E3'] = '=-10-0.5'
+    wb['Transactions']['E4'] = '=-SUM(900)'
+    wb.save(workbook)
+    with pytest.warns(UserWarning, match=r'Transactions!E4 .* cannot be evaluated'):
+        streamed = list(iter_transactions(workbook))
+    assert [r.amount for r in streamed] == [-4, -10.5, None, 1500, -20.25]
+
+
+def test_streamed_period_ignores_stale_cache(workbook, tmp_path):
+    # Cache P3 on a P1 row, as Excel would leave it after the Periods sheet changed
+    stale = tmp_path / 'stale.xlsx'
+    with zipfile.ZipFile(workbook) as src, zipfile.ZipFile(stale, 'w') as dst:
+        for item in src.infolist():
+            data = src.read(item)
+            if item.filename == 'xl/worksheets/sheet2.xml':
+                data, n = re.subn(rb'(<c r="I3"><f>[^<]*</f>)<v />', rb'\1<v>3</v>', data)
+                assert n == 1
+            dst.writestr(item, data)
+    assert [r.period for r in iter_transactions(str(stale))] == [None, 1, 1, 2, 3]
+
+
+@pytest.mark.skipif(not os.path.exists(WORKBOOK_PATH), reason='cashflow workbook not present')
+def test_openpyxl_resave_keeps_every_transaction(tmp_path):
+    # openpyxl drops every cached formula value, including =65+75 style amounts
+    resaved = tmp_path / 'resaved.xlsx'
+    openpyxl.load_workbook(WORKBOOK_PATH).save(resaved)
+    original, _ = partition_transactions(WORKBOOK_PATH)
+    after, _ = partition_transactions(str(resaved))
+    assert sum(len(txns) for txns in after.values()) == 119
+    assert after == original
+
+
+def test_column_letter():
+    assert [column_letter(i) for i in (0, 8, 25, 26, 701, 702)] == ['A', 'I', 'Z', 'AA', 'ZZ', 'AAA']
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from money import format_pounds, group_sum, pence_array, pounds, to_pence
+
+
+@pytest.mark.parametrize('value, pence', [
+    (1.005, 101),       # money(): EPSILON nudges the binary 1.00499... up
+    (2.675, 268),
+    (-1.005, -100),     # half towards +infinity
+    (0.1 + 0.2, 30),
+    (12, 1200),
+    ('£1,234.56', 123456),
+    ('(12.345)', -1234),
+    ('', 0),
+    (None, 0),
+    (float('nan'), 0),
+])
+def test_to_pence(value, pence):
+    assert to_pence(value) == pence
+
+
+def test_to_pence_rejects_text():
+    with pytest.raises(ValueError):
+        to_pence('twelve')
+
+
+def test_pence_array_matches_to_pence():
+    values = [1.005, 2.675, -1.005, 0.1 + 0.2, 5319.49, 0.0]
+    assert pence_array(values).tolist() == [to_pence(v) for v in values]
+    assert pence_array(['1.50', None]).tolist() == [150, 0]
+    assert pence_array([True, False]).tolist() == [to_pence(True), to_pence(np.True_)] == [0, 0]
+
+
+def test_sums_do_not_drift():
+    amounts = [0.1] * 10 + [5319.39]
+    total = int(pence_array(amounts).sum())
+    assert pounds(total) == 5320.39
+    assert format_pounds(total) == '£5,320.39'
+    assert format_pounds(-1200) == '-£12.00'
+
+
+def test_group_sum():
+    codes = np.array([0, 1, 0, 2])
+    assert group_sum(codes, np.array([100, 250, 5, -5]), 3).tolist() == [105, 250, -5]
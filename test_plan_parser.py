@@ -0,0 +1,56 @@
+from plan_parser import parse_plan, parse_transactions, tokenize
+
+PLAN = '''import { Plan } from "../types";
+
+// Sample plan
+const SAMPLE_PLAN: Plan = {
+  version: PLAN_VERSION,
+  periods: createDefaultPeriods(),
+  transactions: [
+    { id: "t1", date: "2026-01-02", label: "Café £", amount: 12.5, type: "outflow", category: "allowance", notes: "Food" },
+    { id: 't2', date: "2026-01-26", label: "Salary", amount: 1500, type: "income", category: "income", goalId: undefined, },
+  ],
+  bills: [{ id: "b1", label: "Rent", amount: 900, dueDay: 1, category: "bill" }],
+  incomeRules: [],
+  outflowRules: [{ id: "r1", label: "Gym", amount: 30, cadence: "monthly", seedDate: "2026-01-05", enabled: false, category: "other" }],
+};
+
+export default SAMPLE_PLAN;
+'''
+
+
+def test_parse_plan_records():
+    plan = parse_plan(PLAN)
+    assert [t.id for t in plan.transactions] == ['t1', 't2']
+    t1, t2 = plan.transactions
+    assert (t1.label, t1.amount, t1.notes) == ('Café £', 12.5, 'Food')
+    assert t2.goal_id is None
+    assert plan.bills[0].due_day == 1
+    assert [(r.id, r.kind, r.enabled) for r in plan.rules] == [('r1', 'outflow', False)]
+
+
+def test_spans_cover_source():
+    plan = parse_plan(PLAN)
+    for txn in plan.transactions:
+        start, end = txn.span
+        assert PLAN[start] == '{' and PLAN[end - 1] == '}'
+        for key, (v_start, v_end) in txn.source.value_spans.items():
+            assert start < v_start <= v_end < end
+    t1 = plan.transactions[0]
+    start, end = t1.source.value_spans['amount']
+    assert PLAN[start:end] == '12.5'
+    start, end = t1.source.value_spans['label']
+    assert PLAN[start:end] == '"Café £"'
+    assert PLAN[slice(*plan.literal.span)].startswith('{\n  version: PLAN_VERSION')
+
+
+def test_parse_transactions_fragment():
+    txns = parse_transactions('{ id: "a", date: "2026-02-01", label: "x", amount: -1.25, '
+                              'type: "outflow", category: "bill" },')
+    assert len(txns) == 1 and txns[0].amount == -1.25
+
+
+def test_tokenize_drops_comments_and_keeps_templates_whole():
+    tokens = list(tokenize('/* a */ const x = `y ${"}"}`; // z'))
+    assert [t.kind for t in tokens] == ['ident', 'ident', 'punct', 'template', 'punct']
+    assert tokens[3].text == '`y ${"}"}`'
@@ -0,0 +1,91 @@
+import math
+
+import pytest
+
+from plan_parser import parse_plan
+from plan_patcher import PlanPatcher, ts_literal
+
+PLAN = '''const SAMPLE_PLAN: Plan = {
+  transactions: [
+    { id: "t1", date: "2026-01-02", label: "Café", amount: 12.5, type: "outflow", category: "other", notes: "Food" },
+    { id: "t2", date: "2026-01-03", label: "Rent", amount: 900, type: "outflow", category: "bill" },
+  ],
+};
+'''
+
+
+@pytest.fixture
+def plan_path(tmp_path):
+    path = tmp_path / 'plan.ts'
+    path.write_text(PLAN, encoding='utf-8')
+    return str(path)
+
+
+def read(path):
+    with open(path, encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def test_replace_same_length_in_place(plan_path):
+    patch = PlanPatcher(plan_path)
+    assert patch.update_by_id('t2', category='bill') is False
+    assert patch.update_by_id('t2', category='giving') is True
+    patch.write()
+    assert read(plan_path) == PLAN.replace('category: "bill"', 'category: "giving"')
+
+
+def test_replace_changes_length_and_reparses(plan_path):
+    patch = PlanPatcher(plan_path)
+    assert patch.update(lambda t: t.notes == 'Food', category='allowance', label='Café & Bar') == 1
+    patch.write()
+    text = read(plan_path)
+    assert 'label: "Café & Bar", amount: 12.5, type: "outflow", category: "allowance"' in text
+    # Spans were refreshed: a second edit lands in the right place
+    patch.update_by_id('t1', amount=13)
+    patch.write()
+    assert parse_plan(read(plan_path)).transactions[0].amount == 13
+    assert patch.category_deltas()['allowance'] == (0, 1, 1)
+
+
+def test_insert_missing_key(plan_path):
+    patch = PlanPatcher(plan_path)
+    patch.update_by_id('t2', goal_id='g1', notes='Rent')
+    patch.write()
+    assert 'category: "bill", goalId: "g1", notes: "Rent" }' in read(plan_path)
+
+
+def test_setting_missing_key_twice_replaces_pending_insert(plan_path):
+    patch = PlanPatcher(plan_path)
+    patch.update_by_id('t2', goal_id='g1')
+    patch.update_by_id('t2', goal_id='g2')
+    patch.write()
+    text = read(plan_path)
+    assert text.count('goalId') == 1
+    assert parse_plan(text).transactions[1].goal_id == 'g2'
+
+
+def test_unsetting_pending_insert_drops_it(plan_path):
+    patch = PlanPatcher(plan_path)
+    patch.update_by_id('t2', goal_id='g1')
+    patch.update_by_id('t2', goal_id=None)
+    assert patch.write() == 0
+    assert read(plan_path) == PLAN
+
+
+def test_insert_into_empty_object(tmp_path):
+    path = tmp_path / 'plan.ts'
+    path.write_text(PLAN.replace('  transactions:', '  meta: {},\n  transactions:'), encoding='utf-8')
+    patch = PlanPatcher(str(path))
+    patch._insert(patch.plan.literal['meta'], 'owner', 'Ada')
+    patch.write()
+    assert '  meta: { owner: "Ada" },\n' in read(str(path))
+
+
+def test_ts_literal():
+    assert ts_literal(None) == 'undefined'
+    assert ts_literal(True) == 'true'
+    assert ts_literal(12.5) == '12.5'
+    assert ts_literal('Tom "T"') == '"Tom \\"T\\""'
+    for bad in (math.nan, math.inf, -math.inf):
+        with pytest.raises(ValueError):
+            ts_literal(bad)
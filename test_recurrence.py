@@ -0,0 +1,105 @@
+"""recurrence.py against generateRuleEvents' stepping, on random seeds and windows."""
+
+import random
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from recurrence import CADENCES, expand_rules, monthly_occurrences, occurrences
+
+CASES = 20_000
+
+
+def _add_months_js(d: date, months: int) -> date:
+    """d.setMonth(d.getMonth() + months): a day past the month's end overflows."""
+    year, month = divmod(d.month - 1 + months, 12)
+    first = date(d.year + year, month + 1, 1)
+    return date.fromordinal(first.toordinal() + d.day - 1)
+
+
+def stepped_dates(cadence: str, seed: date, first: date, last: date) -> list:
+    """generateRuleEvents: step from the seed to the window, then through it."""
+    if cadence == 'monthly':
+        out = []
+        year, month = first.year, first.month
+        while date(year, month, 1) <= last:
+            next_month = date(year + month // 12, month % 12 + 1, 1)
+            d = date(year, month, min(seed.day, (next_month - timedelta(days=1)).day))
+            if first <= d <= last:
+                out.append(d)
+            year, month = next_month.year, next_month.month
+        return out
+    if cadence in ('weekly', 'biweekly'):
+        step = timedelta(days=7 if cadence == 'weekly' else 14)
+        advance = lambda d: d + step  # noqa: E731
+    else:
+        months = 3 if cadence == 'quarterly' else 12
+        advance = lambda d: _add_months_js(d, months)  # noqa: E731
+    cur, out = seed, []
+    while cur < first:
+        cur = advance(cur)
+    while cur <= last:
+        out.append(cur)
+        cur = advance(cur)
+    return out
+
+
+def _random_date(rng: random.Random) -> date:
+    if rng.random() < 0.3:
+        # Month ends and leap days, where setMonth overflows
+        year = rng.choice((1999, 2000, 2023, 2024, 2025, 2026, 2028, 2099, 2100))
+        month = rng.randint(1, 12)
+        end = (date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)).day
+        return date(year, month, rng.randint(max(1, end - 3), end))
+    return date(1995, 1, 1) + timedelta(days=rng.randint(0, 40_000))
+
+
+def test_random_windows_match_stepping():
+    rng = random.Random(0)
+    mismatches = []
+    for _ in range(CASES):
+        cadence = rng.choice(CADENCES)
+        seed = _random_date(rng)
+        first = _random_date(rng) if rng.random() < 0.5 else seed + timedelta(days=rng.randint(-400, 4000))
+        last = first + timedelta(days=rng.randint(-5, 800))
+        got = occurrences(cadence, seed.isoformat(), np.datetime64(first), np.datetime64(last)).tolist()
+        if got != stepped_dates(cadence, seed, first, last):
+            mismatches.append((cadence, seed, first, last))
+    assert mismatches == []
+
+
+@pytest.mark.parametrize('seed, dates', [
+    ('2026-01-31', ['2026-01-31', '2026-05-01', '2026-08-01', '2026-11-01']),
+    ('2024-02-29', ['2024-02-29', '2024-05-29', '2024-08-29', '2024-11-29', '2025-03-01', '2025-06-01',
+                    '2025-09-01', '2025-12-01', '2026-03-01', '2026-06-01', '2026-09-01', '2026-12-01']),
+    ('2025-11-30', ['2025-11-30', '2026-03-02', '2026-06-02', '2026-09-02', '2026-12-02']),
+])
+def test_quarterly_overflow(seed, dates):
+    got = occurrences('quarterly', seed, np.datetime64('2024-01-01'), np.datetime64('2026-12-31'))
+    assert np.datetime_as_string(got).tolist() == dates
+
+
+def test_monthly_clamps_to_month_end():
+    got = monthly_occurrences(31, np.datetime64('2026-01-15'), np.datetime64('2026-04-30'))
+    assert np.datetime_as_string(got).tolist() == ['2026-01-31', '2026-02-28', '2026-03-31', '2026-04-30']
+
+
+def test_results_are_cached_and_read_only():
+    a = occurrences('weekly', '2019-03-04', np.datetime64('2026-01-01'), np.datetime64('2026-02-01'))
+    assert a is occurrences('weekly', '2019-03-04', np.datetime64('2026-01-01'), np.datetime64('2026-02-01'))
+    assert not a.flags.writeable
+
+
+def test_expand_rules_skips_disabled():
+    rules = [{'cadence': 'monthly', 'seedDate': '2026-01-05', 'enabled': True},
+             {'cadence': 'weekly', 'seedDate': '2026-01-01', 'enabled': False},
+             {'cadence': 'annual', 'seedDate': '2020-02-29', 'enabled': True}]
+    index, dates = expand_rules(rules, '2026-01-01', '2026-03-31')
+    assert index.tolist() == [0, 0, 0, 2]
+    assert np.datetime_as_string(dates).tolist() == ['2026-01-05', '2026-02-05', '2026-03-05', '2026-03-01']
+
+
+def test_unknown_cadence():
+    with pytest.raises(ValueError):
+        occurrences('fortnightly', '2026-01-01', np.datetime64('2026-01-01'), np.datetime64('2026-02-01'))
@@ -0,0 +1,47 @@
+import zipfile
+
+import openpyxl
+import pytest
+
+from xlsx_stream import XlsxReader
+
+SHEET_XML = b'''<?xml version="1.0" encoding="UTF-8"?>
+<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>
+<row r="1"><c r="A1"><v>1</v></c><c r="B1"><f t="shared" ref="B1:B4" si="0">A1*2</f><v>2</v></c></row>
+<row r="2"><c r="A2"><v>2</v></c><c r="B2"><f t="shared" si="0"/><v>4</v></c></row>
+<row r="4"><c r="A4" t="inlineStr"><is><t>four</t></is></c><c r="B4"><f t="shared" si="0"/></c></row>
+</sheetData></worksheet>'''
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    """One sheet written by hand: a shared formula in B1:B4 and a missing row 3."""
+    path = tmp_path / 'book.xlsx'
+    wb = openpyxl.Workbook()
+    wb.active.title = 'Sheet'
+    wb.save(path)
+    with zipfile.ZipFile(path) as z:
+        parts = {name: z.read(name) for name in z.namelist()}
+    parts['xl/worksheets/sheet1.xml'] = SHEET_XML
+    with zipfile.ZipFile(path, 'w') as z:
+        for name, data in parts.items():
+            z.writestr(name, data)
+    return str(path)
+
+
+def test_iter_rows_fills_missing_rows(workbook):
+    with XlsxReader(workbook) as xl:
+        assert list(xl.iter_rows('Sheet')) == [(1, 2), (2, 4), (), ('four', None)]
+        assert list(xl.iter_rows('Sheet', 'B', min_row=2)) == [(4,), (None,), (None,)]
+
+
+def test_shared_formula_followers(workbook):
+    with XlsxReader(workbook) as xl:
+        cells = [row[0] for row in xl.iter_rows('Sheet', 'B', formulas=True)]
+    assert [c.formula for c in cells] == ['=A1*2', '=A2*2', None, '=A4*2']
+
+
+def test_shared_formula_master_above_min_row(workbook):
+    with XlsxReader(workbook) as xl:
+        cells = [row[0] for row in xl.iter_rows('Sheet', 'B', min_row=2, formulas=True)]
+    assert [(c.formula, c.value) for c in cells] == [('=A2*2', 4), (None, None), ('=A4*2', None)]
@@ -0,0 +1,156 @@
+"""
+Streaming emitter for Transaction records as TypeScript (or a JSON sidecar).
+
+Each record is escaped and written to the output as soon as it is produced,
+so a large plan never exists as one big joined string. Strings are written
+as JSON string literals (ensure_ascii=False), which are valid TypeScript and
+escape quotes, backslashes and control characters in labels and notes.
+
+Records may be dicts keyed by plan.ts property names (extracted JSON) or
+plan_parser.Transaction objects.
+
+Two outputs:
+
+- write_ts: object literal lines for a plan.ts `transactions: [...]` body,
+  optionally minified (no padding, undefined fields dropped, one line)
+- write_json_sidecar: a JSON array plus, optionally, a small .ts module that
+  imports it typed as Transaction[], so plan.ts can import the data instead
+  of the TS compiler parsing thousands of object literals
+
+Usage:
+    python ts_emitter.py period1_correct_transactions.json period1_transactions.ts
+    python ts_emitter.py in.json out.json --sidecar-module out.ts --minify
+"""
+
+import argparse
+import json
+import os
+import sys
+from dataclasses import is_dataclass
+from typing import IO, Iterable, Iterator, Optional, Sequence, Union
+
+from plan_patcher import TS_KEYS, ts_literal
+from txn_ids import ID_PREFIX, iter_with_ids
+
+# Always emitted (undefined when missing), in this order
+TS_FIELDS = ('id', 'date', 'label', 'amount', 'type', 'category', 'notes', 'linkedRuleId')
+# Emitted only when set
+OPTIONAL_TS_FIELDS = ('linkedBillId', 'goalId')
+
+Record = Union[dict, object]
+
+
+def _as_dict(record: Record) -> dict:
+    if isinstance(record, dict):
+        return record
+    if is_dataclass(record):
+        return {ts_key: getattr(record, attr) for attr, ts_key in TS_KEYS.items()}
+    raise TypeError(f'Cannot emit {type(record).__name__} as a transaction')
+
+
+def with_ids(records: Iterable[dict], prefix: str = ID_PREFIX) -> Iterator[dict]:
+    """Give records without an id their content-addressed id (txn_ids)."""
+    return iter_with_ids(records, prefix=prefix, overwrite=False)
+
+
+def transaction_literal(record: Record, minify: bool = False,
+                        fields: Sequence[str] = TS_FIELDS) -> str:
+    """One transaction as a TypeScript object literal."""
+    data = _as_dict(record)
+    items = [(key, data.get(key)) for key in fields]
+    items += [(key, data[key]) for key in OPTIONAL_TS_FIELDS if data.get(key) is not None]
+    if minify:
+        return '{' + ','.join(f'{k}:{ts_literal(v)}' for k, v in items if v is not None) + '}'
+    return '{ ' + ', '.join(f'{k}: {ts_literal(v)}' for k, v in items) + ' }'
+
+
+def write_ts(records: Iterable[Record], out: IO[str], indent: str = '    ',
+             minify: bool = False, trailing_comma: bool = True,
+             fields: Sequence[str] = TS_FIELDS) -> int:
+    """Write records as array elements, one per line; returns the count.
+
+    With trailing_comma every element ends in ',' (paste-ready inside an
+    existing array); otherwise commas only separate elements.
+    """
+    count = 0
+    sep = ',' if minify else ',\n'
+    for record in records:
+        if count and not trailing_comma:
+            out.write(sep)
+        out.write((indent if not minify else '') + transaction_literal(record, minify, fields))
+        if trailing_comma:
+            out.write(sep)
+        count += 1
+    return count
+
+
+def write_json_sidecar(records: Iterable[Record], out: IO[str], minify: bool = False) -> int:
+    """Write records as a JSON array (undefined fields dropped); returns the count."""
+    sep, open_, close = (',', '[', ']') if minify else (',\n', '[\n', '\n]\n')
+    dumps_kwargs = {'ensure_ascii': False, 'separators': (',', ':') if minify else None}
+    out.write(open_)
+    count = 0
+    for record in records:
+        data = _as_dict(record)
+        keys = list(TS_FIELDS) + [k for k in OPTIONAL_TS_FIELDS if k not in TS_FIELDS]
+        ordered = {k: data[k] for k in keys if data.get(k) is not None}
+        if count:
+            out.write(sep)
+        out.write(('' if minify else '  ') + json.dumps(ordered, **dumps_kwargs))
+        count += 1
+    out.write(close)
+    return count
+
+
+def sidecar_module(json_path: str, module_path: str, export_name: str = 'TRANSACTIONS',
+                   types_import: str = '@/data/plan') -> str:
+    """Source of a .ts module re-exporting the JSON sidecar as Transaction[]."""
+    rel = os.path.relpath(json_path, os.path.dirname(os.path.abspath(module_path)) or '.')
+    rel = rel.replace(os.sep, '/')
+    if not rel.startswith('.'):
+        rel = './' + rel
+    return (
+        f'import type {{ Transaction }} from "{types_import}";\n'
+        f'import data from "{rel}";\n'
+        f'\n'
+        f'export const {export_name}: Transaction[] = data as Transaction[];\n'
+    )
+
+
+def emit_ts(records: Iterable[Record], path: str, **kwargs) -> int:
+    with open(path, 'w', encoding='utf-8') as f:
+        return write_ts(records, f, **kwargs)
+
+
+def emit_json_sidecar(records: Iterable[Record], path: str, minify: bool = False,
+                      module_path: Optional[str] = None) -> int:
+    with open(path, 'w', encoding='utf-8') as f:
+        count = write_json_sidecar(records, f, minify)
+    if module_path:
+        with open(module_path, 'w', encoding='utf-8') as f:
+            f.write(sidecar_module(path, module_path))
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Emit extracted transactions as TypeScript or JSON')
+    parser.add_argument('input', help='JSON file with a list of transactions')
+    parser.add_argument('output', help='.ts fragment, or .json sidecar')
+    parser.add_argument('--minify', action='store_true')
+    parser.add_argument('--sidecar-module', metavar='TS',
+                        help='with a .json output, also write a .ts module importing it')
+    args = parser.parse_args(argv)
+
+    with open(args.input, encoding='utf-8') as f:
+        records = json.load(f)
+    records = with_ids(records)
+
+    if args.output.endswith('.json'):
+        count = emit_json_sidecar(records, args.output, args.minify, args.sidecar_module)
+    else:
+        count = emit_ts(records, args.output, minify=args.minify)
+    print(f'Wrote {count} transactions to {args.output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
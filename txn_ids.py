@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Content-addressed transaction ids.
+
+An id is a hash of what the transaction is: date, amount, normalised label
+and Column C category, plus an occurrence index that keeps genuine
+duplicates apart (the same coffee twice on one day). Inserting or deleting
+a row no longer renumbers every later transaction, so re-extracting gives
+plan.ts, the JSON sidecars and linkedRuleId references the same ids for
+the same transactions, and downstream diffs only show real changes.
+
+Plan-shaped dicts keep the Column C category in 'notes', which is what
+plan_key reads; pass key= for records shaped differently.
+
+DedupeIndex remembers the ids already extracted, so a re-extraction can
+keep just the transactions it has not seen.
+
+Usage:
+    transactions = assign_ids(transactions)
+    python txn_ids.py extracted.json [--index FILE] [--write]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from collections import Counter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from file_cache import CACHE_DIR
+
+ID_PREFIX = 'txn-'
+ID_HEX_DIGITS = 12
+INDEX_PATH = os.path.join(CACHE_DIR, 'txn_index.json')
+
+
+def normalise_label(label) -> str:
+    """Case- and whitespace-insensitive form of a label or category."""
+    return ' '.join(str(label or '').split()).casefold()
+
+
+def content_key(date, amount, label, category) -> str:
+    amount_text = f'{float(amount or 0):.2f}'
+    return '\x1f'.join((str(date), amount_text, normalise_label(label), normalise_label(category)))
+
+
+def transaction_id(date, amount, label, category, occurrence: int = 0,
+                   prefix: str = ID_PREFIX) -> str:
+    key = f'{content_key(date, amount, label, category)}\x1f{occurrence}'
+    return prefix + hashlib.sha1(key.encode('utf-8')).hexdigest()[:ID_HEX_DIGITS]
+
+
+def plan_key(txn: dict) -> Tuple:
+    """(date, amount, label, Column C category) of a plan-shaped transaction."""
+    return txn.get('date'), txn.get('amount'), txn.get('label'), txn.get('notes')
+
+
+def iter_with_ids(transactions: Iterable[dict], key: Callable[[dict], Tuple] = plan_key,
+                  prefix: str = ID_PREFIX, overwrite: bool = True) -> Iterator[dict]:
+    """Yield copies of transactions with their content id first.
+
+    The occurrence index counts earlier transactions with the same content,
+    in input order, so pass them in sheet order. With overwrite=False a
+    transaction that already has an id keeps it.
+    """
+    seen: Counter = Counter()
+    for txn in transactions:
+        parts = key(txn)
+        ck = content_key(*parts)
+        occurrence = seen[ck]
+        seen[ck] += 1
+        if not overwrite and txn.get('id'):
+            yield txn
+            continue
+        yield {'id': transaction_id(*parts, occurrence=occurrence, prefix=prefix),
+               **{k: v for k, v in txn.items() if k != 'id'}}
+
+
+def assign_ids(transactions: Iterable[dict], key: Callable[[dict], Tuple] = plan_key,
+               prefix: str = ID_PREFIX) -> List[dict]:
+    return list(iter_with_ids(transactions, key, prefix))
+
+
+class DedupeIndex:
+    """Transactions already extracted, by content id, persisted as JSON."""
+
+    def __init__(self, path: Optional[str] = INDEX_PATH):
+        self.path = path
+        self.by_id: Dict[str, dict] = {}
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.by_id = json.load(f)
+
+    def __contains__(self, txn_id: str) -> bool:
+        return txn_id in self.by_id
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def add(self, txn: dict) -> bool:
+        """Record txn (which must have an id); False if it was already known."""
+        if txn['id'] in self.by_id:
+            return False
+        self.by_id[txn['id']] = txn
+        return True
+
+    def merge(self, transactions: Iterable[dict], key: Callable[[dict], Tuple] = plan_key) -> List[dict]:
+        """Add transactions (ids assigned when missing); returns the new ones."""
+        return [txn for txn in iter_with_ids(transactions, key, overwrite=False) if self.add(txn)]
+
+    def missing(self, ids: Iterable[str]) -> List[str]:
+        """Known ids that are not in ids (removed since they were indexed)."""
+        current = set(ids)
+        return [i for i in self.by_id if i not in current]
+
+    def save(self, path: Optional[str] = None) -> None:
+        path = path or self.path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.by_id, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Give extracted transactions content-addressed ids')
+    parser.add_argument('input', help='JSON list of plan-shaped transactions')
+    parser.add_argument('--index', default=INDEX_PATH, help='dedupe index to check against and update')
+    parser.add_argument('--write', action='store_true', help='rewrite input with the new ids')
+    args = parser.parse_args()
+
+    with open(args.input, encoding='utf-8') as f:
+        transactions = assign_ids(json.load(f))
+
+    index = DedupeIndex(args.index)
+    new = index.merge(transactions)
+    print(f'{len(transactions)} transactions: {len(new)} new, {len(transactions) - len(new)} already indexed')
+    for txn in new[:20]:
+        print(f"  + {txn['id']} {txn['date']} {txn['label'][:40]} £{txn['amount']}")
+    index.save()
+
+    if args.write:
+        with open(args.input, 'w', encoding='utf-8') as f:
+            json.dump(transactions, f, indent=2)
+        print(f'Rewrote {args.input}')
+
+
+if __name__ == '__main__':
+    main()
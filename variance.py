@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Budget vs actual by period and app category, for every period at once.
+
+Budgets come from the 'Budget by Period' sheet (one row per Column C item,
+a Budget/Actuals/Variance column triplet per period) and are rolled up to
+app categories with the workbook's category mapping. Actuals come from
+extracted plan-shaped transactions (extract_periods). Both sides are
+flattened to (period, category, signed pence) arrays and summed with a
+single integer group-by, so totals are exact (money.py).
+
+The result mirrors getVarianceByCategory in cashflow-app/src/lib/
+cashflowEngine.ts, per period:
+
+    {category: {category, budgeted, actual, variance, variancePercent, status}}
+
+with the same conventions: outflows count positive and income negative,
+transfers count towards neither side, budgeted/actual are absolute values,
+and status is 'under' below -5, 'over' above +5, else 'neutral'.
+
+Usage:
+    python variance.py [--workbook PATH] [--period N] [--json FILE]
+"""
+
+import argparse
+import json
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional
+
+import numpy as np
+
+from category_mapping import CategoryMapping, load_category_mapping
+from money import group_sum, pence_array, pounds, to_pence
+from periods import Period, PeriodIndex, build_periods_2026
+from workbook_reader import WORKBOOK_PATH
+
+BUDGET_SHEET = 'Budget by Period'
+FIRST_PERIOD_COL = 3  # column D: Budget, Actuals, Variance for period 1
+PERIOD_COLS = 3
+
+# Budget rows in these groups are income; everything else is an outflow
+# (savings are an outflow rule in the app, not a transfer)
+INCOME_GROUPS = ('INCOME',)
+
+
+class BudgetTable(NamedTuple):
+    groups: List[str]       # column A per item
+    items: List[str]        # column B (the Column C category) per item
+    amounts: np.ndarray     # int64 pence [item, period index]; period id = index + 1
+
+    @property
+    def period_ids(self) -> List[int]:
+        return list(range(1, self.amounts.shape[1] + 1))
+
+
+def read_budgets(rows: List[tuple]) -> BudgetTable:
+    """Budget columns of the 'Budget by Period' sheet (header row included)."""
+    width = max((len(r) for r in rows), default=0)
+    n_periods = max(0, (width - FIRST_PERIOD_COL) // PERIOD_COLS)
+    budget_cols = [FIRST_PERIOD_COL + PERIOD_COLS * i for i in range(n_periods)]
+
+    groups, items, amounts = [], [], []
+    for row in rows[1:]:
+        group, item = row[0], row[1]
+        if group is None or item is None:
+            continue
+        groups.append(str(group).strip())
+        items.append(str(item).strip())
+        amounts.append([to_pence(v) if isinstance(v, (int, float)) else 0
+                        for v in (row[c] if c < len(row) else None for c in budget_cols)])
+    return BudgetTable(groups, items, np.array(amounts, dtype=np.int64).reshape(len(items), n_periods))
+
+
+def load_budgets(path: str = WORKBOOK_PATH) -> BudgetTable:
+    from workbook_cache import load_snapshot
+
+    return read_budgets(load_snapshot(path).sheet_rows(BUDGET_SHEET))
+
+
+def category_summary(category: str, budgeted: int, actual: int) -> dict:
+    """One category's summary from signed pence totals; amounts out in pounds."""
+    variance = actual - budgeted
+    return {
+        'category': category,
+        'budgeted': pounds(abs(budgeted)),
+        'actual': pounds(abs(actual)),
+        'variance': pounds(variance),
+        'variancePercent': (variance / abs(budgeted)) * 100 if budgeted != 0 else 0,
+        'status': 'under' if variance < -500 else 'over' if variance > 500 else 'neutral',
+    }
+
+
+def variance_by_period(budgets: BudgetTable,
+                       transactions: Iterable[Mapping],
+                       mapping: Optional[CategoryMapping] = None,
+                       periods: Optional[List[Period]] = None) -> Dict[int, Dict[str, dict]]:
+    """getVarianceByCategory for every period: {period_id: {category: summary}}.
+
+    transactions are plan-shaped dicts (date, amount, type, category); they
+    are assigned to periods by date, as the TS engine filters them.
+    """
+    if mapping is None:
+        mapping = load_category_mapping()
+    if periods is None:
+        periods = build_periods_2026()
+    period_ids = [p.id for p in periods]
+    n_periods = len(period_ids)
+    # period id -> row of the result grid (-1: not a known period)
+    slot_of = np.full(max(period_ids + budgets.period_ids + [0]) + 1, -1, dtype=np.int64)
+    slot_of[period_ids] = np.arange(n_periods)
+
+    # Budget side: one entry per (item, period), item-major like amounts.ravel()
+    n_items, n_budget_periods = budgets.amounts.shape
+    b_sign = np.array([-1 if g.upper() in INCOME_GROUPS else 1 for g in budgets.groups], dtype=np.int64)
+    b_amount = (budgets.amounts * b_sign[:, None]).ravel()
+    b_slot = np.tile(slot_of[budgets.period_ids], n_items)
+    b_present = budgets.amounts.ravel() != 0
+    b_cats = np.repeat(np.array([mapping.get(item, 'other') for item in budgets.items], dtype=object),
+                       n_budget_periods)
+
+    # Actual side: one entry per transaction
+    txns = list(transactions)
+    a_type = np.array([t['type'] for t in txns], dtype=object)
+    a_amount = pence_array([t['amount'] or 0 for t in txns]) if txns else np.zeros(0, np.int64)
+    a_amount = np.where(a_type == 'outflow', a_amount, -a_amount)
+    a_amount[a_type == 'transfer'] = 0
+    a_dates = np.array([t['date'] for t in txns], dtype='datetime64[D]')
+    a_slot = slot_of[PeriodIndex(periods).assign(a_dates, missing=0)] if txns else np.zeros(0, np.int64)
+    a_cats = np.array([t['category'] for t in txns], dtype=object)
+
+    # Category codes over both sides
+    categories, codes = np.unique(np.concatenate([b_cats, a_cats]).astype(str), return_inverse=True)
+    n_cats = len(categories)
+    b_code, a_code = codes[:b_amount.size], codes[b_amount.size:]
+
+    def grid_sum(slot, code, weights):
+        ok = slot >= 0
+        flat = slot[ok] * n_cats + code[ok]
+        return group_sum(flat, weights[ok], n_periods * n_cats).reshape(n_periods, n_cats)
+
+    budgeted = grid_sum(b_slot, b_code, b_amount)
+    actual = grid_sum(a_slot, a_code, a_amount)
+    # A category appears in a period when it has a budget line or any transaction
+    present = (grid_sum(b_slot, b_code, b_present.astype(np.int64)) +
+               grid_sum(a_slot, a_code, np.ones(a_slot.size, dtype=np.int64))) > 0
+
+    result = {}
+    for i, pid in enumerate(period_ids):
+        result[pid] = {
+            str(categories[j]): category_summary(str(categories[j]), int(budgeted[i, j]), int(actual[i, j]))
+            for j in np.flatnonzero(present[i])
+        }
+    return result
+
+
+def total_variance(by_category: Mapping[str, dict]) -> dict:
+    """getTotalVariance over one period's summaries."""
+    budgeted = sum(to_pence(v['budgeted']) for v in by_category.values())
+    actual = sum(to_pence(v['actual']) for v in by_category.values())
+    return {
+        'budgeted': pounds(budgeted),
+        'actual': pounds(actual),
+        'variance': pounds(actual - budgeted),
+        'variancePercent': ((actual - budgeted) / budgeted) * 100 if budgeted != 0 else 0,
+    }
+
+
+def workbook_variance(path: str = WORKBOOK_PATH) -> Dict[int, Dict[str, dict]]:
+    """Sheet budgets against the workbook's own extracted transactions."""
+    from extract_periods import partition_transactions
+
+    by_period, _ = partition_transactions(path)
+    transactions = [t for txns in by_period.values() for t in txns]
+    return variance_by_period(load_budgets(path), transactions, load_category_mapping(path))
+
+
+def print_variance(result: Dict[int, Dict[str, dict]], period: Optional[int] = None) -> None:
+    for pid, by_category in result.items():
+        if period is not None and pid != period:
+            continue
+        if not by_category:
+            continue
+        print(f'\nPeriod {pid}')
+        print(f"{'Category':<12} {'Budget':>11} {'Actual':>11} {'Variance':>11} {'%':>8} {'Status':>8}")
+        for cat, v in by_category.items():
+            print(f"{cat:<12} £{v['budgeted']:>10,.2f} £{v['actual']:>10,.2f} £{v['variance']:>10,.2f} "
+                  f"{v['variancePercent']:>7.1f}% {v['status']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Budget vs actual by period and category')
+    parser.add_argument('--workbook', default=WORKBOOK_PATH)
+    parser.add_argument('--period', type=int, help='only print this period')
+    parser.add_argument('--json', metavar='FILE', help='write {period: {category: summary}} as JSON')
+    args = parser.parse_args()
+
+    result = workbook_variance(args.workbook)
+    print_variance(result, args.period)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({str(k): v for k, v in result.items()}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,105 +1,48 @@
 #!/usr/bin/env python3
 """
-Verify the variance calculations with the updated plan.ts data
+Verify the variance calculations against the workbook
 """
 
-# Budgeted amounts from updated plan.ts outflowRules + bills
-budgets = {
-    "income": 4700,  # From Excel Budget by Period - Period 1
-    "bill": 550 + 175 + 34 + 93 + 37 + 200 + 108 + 140 + 400 + 100 + 43,  # 11 bill items
-    "giving": 410 + 165 + 50 + 100,  # 4 giving items (Tithe, Offerings, Charities)
-    "allowance": 560,  # House Keep only (VARIABLE Food & Others = £300, but House Keep is £560)
-    "savings": 1050,  # Only savings outflow rule
-    "other": 500,  # One-Off Giving (Christmas)
-}
+from collections import defaultdict
 
-# Actual amounts from transactions in plan.ts
-# These should match what was extracted from Excel Period 1
-actuals = {
-    "income": 5319.49,
-    "bill": 1829.55,
-    "giving": 906.16,
-    "allowance": 1052.01,
-    "savings": 860.00,
-    "other": 457.37,
-}
+from money import pounds
+from variance import load_budgets, total_variance, workbook_variance
+
+# Budget by Period budgets vs transactions extracted from the workbook
+variance = workbook_variance()[1]
 
 print("=" * 70)
 print("VARIANCE VERIFICATION - Period 1")
 print("=" * 70)
 print()
 
-total_budgeted = 0
-total_actual = 0
-
 for category in ["income", "bill", "giving", "allowance", "savings", "other"]:
-    budgeted = budgets[category]
-    actual = actuals[category]
-    variance = actual - budgeted
-    variance_pct = (variance / abs(budgeted)) * 100 if budgeted != 0 else 0
-    status = "OVER" if variance > 5 else "UNDER" if variance < -5 else "OK"
-    
-    print(f"{category.upper():12} | Budget: £{budgeted:8.2f} | Actual: £{actual:8.2f} | Variance: £{variance:8.2f} ({variance_pct:6.1f}%) [{status}]")
-    
-    total_budgeted += budgeted
-    total_actual += actual
+    if category not in variance:
+        continue
+    v = variance[category]
+    print(f"{category.upper():12} | Budget: £{v['budgeted']:8.2f} | Actual: £{v['actual']:8.2f} | "
+          f"Variance: £{v['variance']:8.2f} ({v['variancePercent']:6.1f}%) [{v['status'].upper()}]")
 
 print()
 print("-" * 70)
-total_variance = total_actual - total_budgeted
-total_variance_pct = (total_variance / total_budgeted) * 100 if total_budgeted != 0 else 0
-print(f"{'TOTAL':12} | Budget: £{total_budgeted:8.2f} | Actual: £{total_actual:8.2f} | Variance: £{total_variance:8.2f} ({total_variance_pct:6.1f}%)")
+total = total_variance(variance)
+print(f"{'TOTAL':12} | Budget: £{total['budgeted']:8.2f} | Actual: £{total['actual']:8.2f} | "
+      f"Variance: £{total['variance']:8.2f} ({total['variancePercent']:6.1f}%)")
 print("=" * 70)
 print()
 
-# Expected vs Excel
-print("COMPARISON WITH EXCEL BUDGET BY PERIOD (Period 1):")
+# Breakdown straight from the sheet
+print("EXCEL BUDGET BY PERIOD (Period 1) BY GROUP:")
 print("-" * 70)
-excel_budgets = {
-    "INCOME": 4700,
-    "FIXED (bills)": 2440,
-    "GIVING": 815,
-    "VARIABLE (allowance/food)": 300,
-    "SAVINGS": 1050,
-    "ONE-OFF": 500,
-}
-
-print("Our Bills breakdown (should total £2,440 for FIXED):")
-bill_items = {
-    "Rent": 550,
-    "Insurance": 175,
-    "Road Tax": 34,
-    "Water": 93,
-    "Internet": 37,
-    "Electricity & Gas": 200,
-    "iPhone": 108,
-    "Parents": 140,
-    "Credit Card": 400,
-    "Fuel": 100,
-    "Laptop": 43,
-}
-bill_total = sum(bill_items.values())
-for item, amount in bill_items.items():
-    print(f"  {item:25} £{amount:7.2f}")
-print(f"  {'TOTAL BILLS':25} £{bill_total:7.2f}")
-print()
-
-print("Our Giving breakdown (should total £815 for GIVING):")
-giving_items = {
-    "Tithe": 410,
-    "Offerings": 165,
-    "Charity - Perez Uni": 50,
-    "Charity - JPC Utilities": 100,
-}
-giving_total = sum(giving_items.values())
-for item, amount in giving_items.items():
-    print(f"  {item:25} £{amount:7.2f}")
-print(f"  {'TOTAL GIVING':25} £{giving_total:7.2f}")
-print()
-
-print(f"House Keep (VARIABLE): £{560:7.2f}")
-print(f"Christmas (ONE-OFF): £{500:7.2f}")
-print()
-print("=" * 70)
-print("✓ All budgets match Excel structure")
+budgets = load_budgets()
+by_group = defaultdict(list)
+for group, item, amounts in zip(budgets.groups, budgets.items, budgets.amounts):
+    by_group[group].append((item, amounts[0]))
+
+for group, items in by_group.items():
+    print(f"{group}:")
+    for item, amount in items:
+        print(f"  {item:30} £{pounds(amount):8.2f}")
+    print(f"  {'TOTAL ' + group:30} £{pounds(sum(a for _, a in items)):8.2f}")
+    print()
 print("=" * 70)
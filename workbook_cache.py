@@ -0,0 +1,198 @@
+"""
+Parsed-workbook snapshots keyed by content hash.
+
+The first load of a workbook parses it once (xlsx_stream) and writes a
+compact columnar snapshot to .cache/workbooks/<sha256>/:
+
+- the Transactions sheet as one .npy file per column (datetime64[D] dates,
+  float64 amounts, int16 periods, fixed-width unicode text), and
+- every other sheet's values as JSON rows (they are a few dozen rows
+  each).
+
+Transactions are streamed by workbook_reader.iter_transactions. Other
+sheets keep Excel's cached values unless a formula cell has none, in which
+case that sheet is recomputed by formula_eval.
+
+Later loads of the same content memory-map the .npy columns instead of
+re-parsing the xlsx, so a batch of diagnostic scripts costs one parse in
+total. The content hash itself is memoised by file_cache against the
+workbook's mtime and size, so an unchanged workbook is not even re-hashed.
+
+Usage:
+    snap = load_snapshot()
+    for rec in snap.iter_transactions(): ...
+    rows = snap.sheet_rows('Budget by Period')
+"""
+
+import json
+import os
+import shutil
+from datetime import date, datetime
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+from file_cache import CACHE_DIR, load_cached, sha256_file, store_cached
+from formula_eval import WorkbookEvaluator
+from workbook_reader import TRANSACTIONS_SHEET, WORKBOOK_PATH, TransactionRecord, iter_transactions
+from xlsx_stream import XlsxReader
+
+SNAPSHOT_VERSION = 3
+SNAPSHOT_DIR = os.path.join(CACHE_DIR, 'workbooks')
+
+# Transactions columns kept in the snapshot; text columns are stored as
+# fixed-width unicode, so a blank cell and an empty string both read back as None
+TEXT_COLUMNS = ('type', 'category', 'description', 'notes')
+NO_PERIOD = 0
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'$datetime': value.isoformat()}
+    if isinstance(value, date):
+        return {'$date': value.isoformat()}
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if '$datetime' in value:
+            return datetime.fromisoformat(value['$datetime'])
+        if '$date' in value:
+            return date.fromisoformat(value['$date'])
+    return value
+
+
+def _content_hash(path: str) -> str:
+    cached = load_cached('workbook_sha256', path, SNAPSHOT_VERSION)
+    if cached is not None:
+        return cached
+    digest = sha256_file(path)
+    store_cached('workbook_sha256', path, SNAPSHOT_VERSION, digest, digest)
+    return digest
+
+
+def _columns_from_records(records: List[TransactionRecord]) -> Dict[str, np.ndarray]:
+    columns = {
+        'row': np.array([r.row for r in records], dtype=np.int32),
+        'date': np.array([r.date for r in records], dtype='datetime64[D]'),
+        'amount': np.array([np.nan if r.amount is None else r.amount for r in records],
+                           dtype=np.float64),
+        'period': np.array([NO_PERIOD if r.period is None else r.period for r in records],
+                           dtype=np.int16),
+    }
+    for name in TEXT_COLUMNS:
+        values = [getattr(r, name) or '' for r in records]
+        width = max((len(v) for v in values), default=0) or 1
+        columns[name] = np.array(values, dtype=f'<U{width}')
+    return columns
+
+
+def _sheet_values(xl: XlsxReader, name: str):
+    """Cached rows of a sheet padded to equal width, or None if a formula cell has no cached value."""
+    rows = list(xl.iter_rows(name, formulas=True))
+    if any(c.formula is not None and c.value is None for row in rows for c in row):
+        return None
+    width = max(map(len, rows), default=0)
+    return [tuple(c.value for c in row) + (None,) * (width - len(row)) for row in rows]
+
+
+def _write_snapshot(path: str, target_dir: str) -> None:
+    sheets = {}
+    header: List = []
+    evaluator = None
+    try:
+        with XlsxReader(path) as xl:
+            sheetnames = xl.sheetnames
+            for name in sheetnames:
+                if name == TRANSACTIONS_SHEET:
+                    header = [_encode_value(v) for v in next(xl.iter_rows(name, max_row=1), ())]
+                    continue
+                rows = _sheet_values(xl, name)
+                if rows is None:
+                    evaluator = evaluator or WorkbookEvaluator(path)
+                    rows = evaluator.rows(name)
+                sheets[name] = [[_encode_value(v) for v in r] for r in rows]
+    finally:
+        if evaluator is not None:
+            evaluator.close()
+    records: List[TransactionRecord] = (
+        list(iter_transactions(path)) if TRANSACTIONS_SHEET in sheetnames else [])
+
+    tmp_dir = target_dir + '.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    for name, column in _columns_from_records(records).items():
+        np.save(os.path.join(tmp_dir, f'transactions.{name}.npy'), column)
+    with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+        json.dump({'version': SNAPSHOT_VERSION, 'source': os.path.abspath(path),
+                   'sheetnames': sheetnames, 'transactions': len(records),
+                   'transactions_header': header, 'sheets': sheets}, f)
+    shutil.rmtree(target_dir, ignore_errors=True)
+    os.replace(tmp_dir, target_dir)
+
+
+class WorkbookSnapshot:
+    """Read-only view over a cached workbook snapshot."""
+
+    def __init__(self, snapshot_dir: str, sha256: str):
+        self.sha256 = sha256
+        with open(os.path.join(snapshot_dir, 'meta.json')) as f:
+            meta = json.load(f)
+        self.source = meta['source']
+        self.sheetnames: List[str] = meta['sheetnames']
+        self._sheets = meta['sheets']
+        self.transactions_header = tuple(_decode_value(v) for v in meta['transactions_header'])
+        # Memory-mapped: pages are read lazily and shared between processes
+        self.transactions: Dict[str, np.ndarray] = {
+            name: np.load(os.path.join(snapshot_dir, f'transactions.{name}.npy'), mmap_mode='r')
+            for name in ('row', 'date', 'amount', 'period') + TEXT_COLUMNS
+        }
+
+    def __len__(self):
+        return len(self.transactions['row'])
+
+    def sheet_rows(self, sheet_name: str) -> List[tuple]:
+        """Cached values of a (non-Transactions) sheet, row 1 first, padded to equal width."""
+        if sheet_name not in self._sheets:
+            raise KeyError(f'Worksheet {sheet_name} is not in the snapshot')
+        return [tuple(_decode_value(v) for v in row) for row in self._sheets[sheet_name]]
+
+    def iter_transactions(self) -> Iterator[TransactionRecord]:
+        """Same records as workbook_reader.iter_transactions, without openpyxl."""
+        cols = self.transactions
+        dates = cols['date'].astype(object)
+        amounts = cols['amount'].tolist()
+        periods = cols['period'].tolist()
+        text = {name: cols[name].tolist() for name in TEXT_COLUMNS}
+        for i, row in enumerate(cols['row'].tolist()):
+            yield TransactionRecord(
+                row=row,
+                date=dates[i],
+                type=text['type'][i] or None,
+                category=text['category'][i] or None,
+                description=text['description'][i] or None,
+                amount=None if amounts[i] != amounts[i] else amounts[i],
+                notes=text['notes'][i] or None,
+                period=periods[i] or None,
+            )
+
+
+def load_snapshot(path: str = WORKBOOK_PATH) -> WorkbookSnapshot:
+    """Snapshot of the workbook at path, parsing it only if its content is new."""
+    digest = _content_hash(path)
+    snapshot_dir = os.path.join(SNAPSHOT_DIR, digest)
+    meta_path = os.path.join(snapshot_dir, 'meta.json')
+    snapshot_ok = False
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            snapshot_ok = json.load(f).get('version') == SNAPSHOT_VERSION
+    if not snapshot_ok:
+        _write_snapshot(path, snapshot_dir)
+    return WorkbookSnapshot(snapshot_dir, digest)
+
+
+def clear_snapshots() -> None:
+    shutil.rmtree(SNAPSHOT_DIR, ignore_errors=True)
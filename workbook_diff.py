@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Diff two workbook revisions and patch extracted JSON with the difference.
+
+Rows of Transactions, Bills Schedule and Budget by Period are hashed and
+aligned with a two-stage hash join, O(rows) rather than nested loops:
+
+1. rows whose whole content hashes equal are unchanged (as a multiset, so
+   duplicate rows pair off one for one);
+2. the rest are joined on an identity key (transaction date, Column C
+   category and description; bill name and period; budget group and item)
+   and reported as changed, and whatever is left over is added or removed.
+
+Transaction differences are also written as a patch in the extract_periods
+shape, which apply_patch applies to an existing extracted JSON (one
+period's list, or the partitioned {period: [...]} file) without
+re-extracting the workbook.
+
+Usage:
+    python workbook_diff.py OLD.xlsx NEW.xlsx [--patch FILE]
+    python workbook_diff.py --apply FILE.json --patch FILE [--period N] [--out FILE]
+"""
+
+import argparse
+import hashlib
+import json
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Callable, Dict, Hashable, List, NamedTuple, Optional, Sequence, Tuple
+
+from category_mapping import load_category_mapping
+from extract_periods import to_plan_transaction
+from money import pounds
+from periods import PeriodIndex, build_periods_2026
+from txn_ids import assign_ids
+from variance import BUDGET_SHEET, read_budgets
+from workbook_cache import load_snapshot
+
+PATCH_VERSION = 1
+BILLS_SHEET = 'Bills Schedule'
+BILLS_FIRST_ROW = 3  # title and header rows above
+
+# Plan fields compared when matching a patch against extracted JSON
+MATCH_FIELDS = ('date', 'label', 'amount', 'type', 'category', 'notes', 'linkedRuleId')
+
+
+class PatchConflict(ValueError):
+    pass
+
+
+class SheetDiff(NamedTuple):
+    added: List[dict]
+    removed: List[dict]
+    changed: List[Tuple[dict, dict]]  # (old, new)
+    unchanged: int
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f'cannot hash {type(value).__name__}')
+
+
+def row_hash(values: Sequence) -> str:
+    return hashlib.sha1(json.dumps(list(values), default=_json_default,
+                                   separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+def hash_join(old: List[dict], new: List[dict], content: Callable[[dict], Sequence],
+              key: Callable[[dict], Hashable]) -> SheetDiff:
+    """Align two row lists: exact content matches first, then by key."""
+    by_hash: Dict[str, List[dict]] = defaultdict(list)
+    for row in old:
+        by_hash[row_hash(content(row))].append(row)
+
+    unmatched_new = []
+    unchanged = 0
+    for row in new:
+        bucket = by_hash.get(row_hash(content(row)))
+        if bucket:
+            bucket.pop(0)
+            unchanged += 1
+        else:
+            unmatched_new.append(row)
+
+    by_key: Dict[Hashable, List[dict]] = defaultdict(list)
+    for bucket in by_hash.values():
+        for row in bucket:
+            by_key[key(row)].append(row)
+
+    added, changed = [], []
+    for row in unmatched_new:
+        bucket = by_key.get(key(row))
+        if bucket:
+            changed.append((bucket.pop(0), row))
+        else:
+            added.append(row)
+    # Leftovers in old row order
+    removed = sorted((row for bucket in by_key.values() for row in bucket), key=lambda r: r['row'])
+    return SheetDiff(added, removed, changed, unchanged)
+
+
+# -- per-sheet rows --------------------------------------------------------
+
+def transaction_rows(path: str, periods=None) -> List[dict]:
+    """Dated, non-zero Transactions rows with their plan-shaped transaction."""
+    index = PeriodIndex(periods if periods is not None else build_periods_2026())
+    mapping = load_category_mapping(path)
+    rows = []
+    for rec in load_snapshot(path).iter_transactions():
+        if rec.date is None or not rec.amount:
+            continue
+        period_id = rec.period if rec.period is not None else index.period_id(rec.date)
+        rows.append({
+            'row': rec.row,
+            'period': period_id,
+            'record': rec,
+            'txn': to_plan_transaction(rec, mapping),
+        })
+    return rows
+
+
+def _transaction_content(row):
+    rec = row['record']
+    return rec.date, rec.type, rec.category, rec.description, rec.amount, rec.notes
+
+
+def _transaction_key(row):
+    rec = row['record']
+    return rec.date, (rec.category or '').strip().lower(), (rec.description or '').strip().lower()
+
+
+def bill_rows(path: str) -> List[dict]:
+    """The bills table: rows from BILLS_FIRST_ROW down to the first blank bill name.
+
+    Scratch notes further down the sheet are not part of it.
+    """
+    out = []
+    rows = load_snapshot(path).sheet_rows(BILLS_SHEET)
+    for i, r in enumerate(rows[BILLS_FIRST_ROW - 1:], BILLS_FIRST_ROW):
+        if not r or r[0] is None:
+            break
+        out.append({'row': i, 'values': tuple(r)})
+    return out
+
+
+def budget_rows(path: str) -> List[dict]:
+    table = read_budgets(load_snapshot(path).sheet_rows(BUDGET_SHEET))
+    return [{'row': i + 2, 'group': g, 'item': item, 'budgets': tuple(pounds(a) for a in amounts)}
+            for i, (g, item, amounts) in enumerate(zip(table.groups, table.items, table.amounts))]
+
+
+class WorkbookDiff(NamedTuple):
+    transactions: SheetDiff
+    bills: SheetDiff
+    budgets: SheetDiff
+
+
+def diff_workbooks(old_path: str, new_path: str) -> WorkbookDiff:
+    return WorkbookDiff(
+        transactions=hash_join(transaction_rows(old_path), transaction_rows(new_path),
+                               _transaction_content, _transaction_key),
+        bills=hash_join(bill_rows(old_path), bill_rows(new_path),
+                        lambda r: r['values'], lambda r: (r['values'][0], r['values'][4])),
+        budgets=hash_join(budget_rows(old_path), budget_rows(new_path),
+                          lambda r: (r['group'], r['item'], r['budgets']),
+                          lambda r: (r['group'], r['item'])),
+    )
+
+
+# -- patches -----------------------------------------------------------------
+
+def _op_txn(row) -> dict:
+    return {'period': row['period'], 'txn': row['txn']}
+
+
+def make_patch(diff: SheetDiff, old_path: str = None, new_path: str = None) -> dict:
+    """Transaction differences as a patch for extract_periods-shaped JSON."""
+    return {
+        'version': PATCH_VERSION,
+        'from': old_path,
+        'to': new_path,
+        'remove': [_op_txn(r) for r in diff.removed],
+        'change': [{'from': _op_txn(old), 'to': _op_txn(new)} for old, new in diff.changed],
+        'add': [_op_txn(r) for r in diff.added],
+    }
+
+
+def _match_key(txn: dict) -> tuple:
+    return tuple(txn.get(f) for f in MATCH_FIELDS)
+
+
+def _apply_to_list(txns: List[dict], removes: List[dict], adds: List[dict], where: str) -> List[dict]:
+    positions: Dict[tuple, List[int]] = defaultdict(list)
+    for i, txn in enumerate(txns):
+        positions[_match_key(txn)].append(i)
+    dropped = set()
+    for wanted in removes:
+        bucket = positions.get(_match_key(wanted))
+        if not bucket:
+            raise PatchConflict(f'{where}: no transaction matching {wanted}')
+        dropped.add(bucket.pop(0))
+    out = [txn for i, txn in enumerate(txns) if i not in dropped]
+    out.extend(adds)
+    # Same ids and order as extract_periods.partition_transactions
+    out = assign_ids(out)
+    out.sort(key=lambda t: t['date'])
+    return out
+
+
+def apply_patch(data, patch: dict, period: Optional[int] = None):
+    """Apply a transaction patch to extracted JSON.
+
+    data is one period's list of transactions (pass period to pick that
+    period's operations) or the partitioned {period id: [...]} mapping.
+    Removed and changed transactions are matched on their plan fields;
+    a missing match raises PatchConflict.
+    """
+    if patch.get('version') != PATCH_VERSION:
+        raise PatchConflict(f"unsupported patch version {patch.get('version')}")
+    removes: Dict[Optional[int], List[dict]] = defaultdict(list)
+    adds: Dict[Optional[int], List[dict]] = defaultdict(list)
+    for op in patch['remove']:
+        removes[op['period']].append(op['txn'])
+    for op in patch['change']:
+        removes[op['from']['period']].append(op['from']['txn'])
+        adds[op['to']['period']].append(op['to']['txn'])
+    for op in patch['add']:
+        adds[op['period']].append(op['txn'])
+
+    if isinstance(data, dict):
+        out = {}
+        keys = {int(k) for k in data} | {p for p in adds if p is not None}
+        for pid in sorted(keys):
+            txns = data.get(str(pid), data.get(pid, []))
+            out[str(pid)] = _apply_to_list(txns, removes.get(pid, []), adds.get(pid, []), f'period {pid}')
+        return out
+    if period is None:
+        return _apply_to_list(data, [t for ts in removes.values() for t in ts],
+                              [t for ts in adds.values() for t in ts], 'transactions')
+    return _apply_to_list(data, removes.get(period, []), adds.get(period, []), f'period {period}')
+
+
+# -- CLI ---------------------------------------------------------------------
+
+def _describe_txn(row) -> str:
+    t = row['txn']
+    return f"row {row['row']:>4} P{row['period'] or '-'} {t['date']} {t['label'][:40]:<40} £{t['amount']:>9,.2f} {t['notes']}"
+
+
+def print_diff(diff: WorkbookDiff) -> None:
+    t = diff.transactions
+    print(f'Transactions: {len(t.added)} added, {len(t.removed)} removed, '
+          f'{len(t.changed)} changed, {t.unchanged} unchanged')
+    for row in t.added:
+        print(f'  + {_describe_txn(row)}')
+    for row in t.removed:
+        print(f'  - {_describe_txn(row)}')
+    for old, new in t.changed:
+        print(f'  ~ {_describe_txn(old)}\n    -> {_describe_txn(new)}')
+
+    b = diff.bills
+    print(f'\nBills Schedule: {len(b.added)} added, {len(b.removed)} removed, '
+          f'{len(b.changed)} changed, {b.unchanged} unchanged')
+    for row in b.added:
+        print(f"  + {row['values'][0]} (P{row['values'][4]})")
+    for row in b.removed:
+        print(f"  - {row['values'][0]} (P{row['values'][4]})")
+    for old, new in b.changed:
+        cols = [i for i, (x, y) in enumerate(zip(old['values'], new['values'])) if x != y]
+        print(f"  ~ {new['values'][0]} (P{new['values'][4]}): " +
+              ', '.join(f'col {chr(65 + i)} {old["values"][i]!r} -> {new["values"][i]!r}' for i in cols))
+
+    g = diff.budgets
+    print(f'\nBudget lines: {len(g.added)} added, {len(g.removed)} removed, '
+          f'{len(g.changed)} changed, {g.unchanged} unchanged')
+    for row in g.added:
+        print(f"  + {row['group']} / {row['item']}")
+    for row in g.removed:
+        print(f"  - {row['group']} / {row['item']}")
+    for old, new in g.changed:
+        periods = [f'P{i + 1} {x:g} -> {y:g}' for i, (x, y) in enumerate(zip(old['budgets'], new['budgets'])) if x != y]
+        print(f"  ~ {new['group']} / {new['item']}: {', '.join(periods) or 'periods added/removed'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Diff workbook revisions / apply a transaction patch')
+    parser.add_argument('old', nargs='?', help='older workbook')
+    parser.add_argument('new', nargs='?', help='newer workbook')
+    parser.add_argument('--patch', metavar='FILE', help='patch file to write (diff) or read (--apply)')
+    parser.add_argument('--apply', metavar='JSON', help='extracted JSON to patch')
+    parser.add_argument('--period', type=int, help='with --apply on a single-period list: its period id')
+    parser.add_argument('--out', metavar='FILE', help='where to write the patched JSON (default: in place)')
+    args = parser.parse_args()
+
+    if args.apply:
+        if not args.patch:
+            parser.error('--apply needs --patch')
+        with open(args.patch) as f:
+            patch = json.load(f)
+        with open(args.apply) as f:
+            data = json.load(f)
+        patched = apply_patch(data, patch, args.period)
+        out = args.out or args.apply
+        with open(out, 'w') as f:
+            json.dump(patched, f, indent=2)
+        print(f'Patched {args.apply} -> {out}')
+        return
+
+    if not (args.old and args.new):
+        parser.error('give OLD and NEW workbooks, or --apply')
+    diff = diff_workbooks(args.old, args.new)
+    print_diff(diff)
+    if args.patch:
+        with open(args.patch, 'w') as f:
+            json.dump(make_patch(diff.transactions, args.old, args.new), f, indent=2)
+        print(f'\nWrote transaction patch to {args.patch}')
+
+
+if __name__ == '__main__':
+    main()
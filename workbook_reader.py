@@ -0,0 +1,248 @@
+"""
+Streaming reader for the Transactions sheet of the cashflow workbook.
+
+Reads the sheet XML once (xlsx_stream) and yields a typed record per
+populated row, in constant memory. Use this instead of load_workbook(...)
+followed by ws.cell(row, col) lookups, which loads every cell into memory
+and re-resolves each coordinate.
+
+Excel's cached formula results go stale or empty when the workbook was
+last saved by a tool that does not recalculate (openpyxl among them), so
+they are not trusted as they stream past:
+
+- Column I (Period) is recomputed in every row as its formula,
+  MATCH(A, 'Periods 26-25'!$C$2:$C$13, 1), from the row's date and the
+  Periods sheet's start dates.
+- Any other formula cell with no cached value (an amount entered as
+  =65+75) is evaluated with formula_eval. One it cannot evaluate is read
+  as blank with a warning, never dropped silently.
+
+evaluate=True recomputes every formula column with formula_eval instead,
+holding the sheet in memory.
+"""
+
+import re
+import warnings
+from bisect import bisect_right
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from xlsx_stream import XlsxReader
+
+WORKBOOK_PATH = 'FINAL_2026_Cashflow_System_AppleStyle_v3_Start22Dec2025 - Copy (2).xlsx'
+TRANSACTIONS_SHEET = 'Transactions'
+PERIODS_SHEET = 'Periods 26-25'
+COL_PERIOD_START = 2  # Periods sheet column C, the range Column I MATCHes into
+
+# Transactions sheet columns (0-based): A..E, H, I
+COL_DATE = 0
+COL_TYPE = 1
+COL_CATEGORY = 2
+COL_DESCRIPTION = 3
+COL_AMOUNT = 4
+COL_NOTES = 7
+COL_PERIOD = 8
+TRANSACTION_COLUMNS = (COL_DATE, COL_TYPE, COL_CATEGORY, COL_DESCRIPTION, COL_AMOUNT, COL_NOTES, COL_PERIOD)
+
+# Column I as the workbook writes it in every row
+PERIOD_FORMULA = re.compile(r"=IFERROR\(MATCH\(A(\d+),'%s'!\$C\$(\d+):\$C\$(\d+),1\),\"\"\)$"
+                            % re.escape(PERIODS_SHEET))
+
+EXCEL_EPOCH = datetime(1899, 12, 30)
+
+# Rows per excel_dates.decode_dates call; keeps iter_transactions streaming
+DATE_CHUNK = 4096
+
+
+class TransactionRecord(NamedTuple):
+    row: int                    # 1-based sheet row
+    date: Optional[date]        # Column A
+    type: Optional[str]         # Column B: "Expense", "Income", "Transfer"
+    category: Optional[str]     # Column C: the Budget by Period item
+    description: Optional[str]  # Column D
+    amount: Optional[float]     # Column E, signed as entered
+    notes: Optional[str]        # Column H
+    period: Optional[int]       # Column I, recomputed from the date
+
+
+def _to_amount(value) -> Optional[float]:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_text(value) -> Optional[str]:
+    if value is None:
+        return None
+    return str(value)
+
+
+def _to_period(value) -> Optional[int]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    return None
+
+
+def _serial(value) -> Optional[float]:
+    """Excel's number for a date or number cell; None for text, blanks and errors."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, datetime):
+        return (value - EXCEL_EPOCH).total_seconds() / 86400
+    if isinstance(value, date):
+        return float((value - EXCEL_EPOCH.date()).days)
+    if isinstance(value, (int, float)):
+        return float(value)
+    return None
+
+
+class _FormulaValues:
+    """Plain values for rows of FormulaCells from the Transactions sheet.
+
+    Period formulas are recomputed; other formulas keep their cached value
+    unless it is missing, when they are evaluated one cell at a time.
+    """
+
+    def __init__(self, xl: XlsxReader, path: str, sheet_name: str, columns: Sequence[int]):
+        self._xl = xl
+        self._path = path
+        self._sheet_name = sheet_name
+        self._columns = list(columns)
+        self._i_date = self._columns.index(COL_DATE)
+        # (first, last) row of the MATCH range -> (positions, serials) of its numeric cells
+        self._ranges: Dict[Tuple[int, int], Tuple[List[int], List[float]]] = {}
+        self._evaluator = None
+
+    def close(self):
+        if self._evaluator is not None:
+            self._evaluator.close()
+
+    def row(self, row_num: int, cells: tuple) -> tuple:
+        values = [cell.value for cell in cells]
+        for i, cell in enumerate(cells):
+            if cell.formula is None:
+                continue
+            if self._columns[i] == COL_PERIOD:
+                m = PERIOD_FORMULA.match(cell.formula)
+                if m and int(m.group(1)) == row_num and PERIODS_SHEET in self._xl.sheetnames:
+                    values[i] = self._period(values[self._i_date], int(m.group(2)), int(m.group(3)))
+                    continue
+            if values[i] is None:
+                values[i] = self._evaluate(cell.formula, row_num, self._columns[i])
+        return tuple(values)
+
+    def _period(self, value, first: int, last: int) -> Optional[int]:
+        # MATCH(value, Periods!$C$first:$C$last, 1) as formula_eval computes
+        # it, with the IFERROR's "" for #N/A
+        if (first, last) not in self._ranges:
+            positions, keys = [], []
+            cells = self._xl.iter_rows(PERIODS_SHEET, (COL_PERIOD_START,), first, last)
+            for pos, (start,) in enumerate(cells):
+                key = _serial(start)
+                if key is not None:
+                    positions.append(pos)
+                    keys.append(key)
+            self._ranges[(first, last)] = (positions, keys)
+        positions, keys = self._ranges[(first, last)]
+        x = _serial(value)
+        found = 0 if x is None else bisect_right(keys, x)
+        return positions[found - 1] + 1 if found else None
+
+    def _evaluate(self, formula: str, row_num: int, col: int):
+        from formula_eval import ERRORS, UnsupportedFormula, WorkbookEvaluator, column_letter
+
+        if self._evaluator is None:
+            self._evaluator = WorkbookEvaluator(self._path)
+        cell = f'{self._sheet_name}!{column_letter(col)}{row_num}'
+        try:
+            value = self._evaluator.evaluate(self._sheet_name, formula, row_num)
+        except UnsupportedFormula as e:
+            warnings.warn(f'{cell} {formula} has no cached value and cannot be evaluated ({e}); read as blank')
+            return None
+        if isinstance(value, str) and value in ERRORS:
+            warnings.warn(f'{cell} {formula} has no cached value and evaluates to {value}')
+        return value
+
+
+def records_from_rows(rows: Iterable[tuple], first_row: int = 2,
+                      columns: Optional[Sequence[int]] = None) -> Iterator[TransactionRecord]:
+    """Turn raw Transactions value rows (header excluded) into records.
+
+    Rows are full sheet rows from column A, or with columns (e.g.
+    TRANSACTION_COLUMNS) just those sheet columns in that order.
+
+    Rows where columns A-E are all blank (the pre-filled Period formula rows
+    at the bottom of the sheet) are skipped. Dates (datetimes, serials,
+    dd/mm/yyyy text) are decoded DATE_CHUNK rows at a time by excel_dates;
+    a date that does not parse is None.
+    """
+    from excel_dates import decode_dates  # NumPy: only once rows are read
+
+    columns = range(COL_PERIOD + 1) if columns is None else columns
+    pos = {col: i for i, col in enumerate(columns)}
+    i_date, i_type, i_category, i_description, i_amount, i_notes, i_period = (
+        pos[c] for c in TRANSACTION_COLUMNS)
+    key_cols = [pos[c] for c in range(COL_DATE, COL_AMOUNT + 1)]
+    width = len(columns)
+
+    def flush(batch):
+        dates = decode_dates([row[i_date] for _, row in batch]).as_dates()
+        for (row_num, row), row_date in zip(batch, dates):
+            yield TransactionRecord(
+                row=row_num,
+                date=row_date,
+                type=_to_text(row[i_type]),
+                category=_to_text(row[i_category]),
+                description=_to_text(row[i_description]),
+                amount=_to_amount(row[i_amount]),
+                notes=_to_text(row[i_notes]),
+                period=_to_period(row[i_period]),
+            )
+
+    batch = []
+    for row_num, row in enumerate(rows, first_row):
+        if len(row) < width:
+            row = tuple(row) + (None,) * (width - len(row))
+        if all(row[i] is None for i in key_cols):
+            continue
+        batch.append((row_num, row))
+        if len(batch) == DATE_CHUNK:
+            yield from flush(batch)
+            batch = []
+    yield from flush(batch)
+
+
+def iter_transactions(path: str = WORKBOOK_PATH,
+                      sheet_name: str = TRANSACTIONS_SHEET,
+                      evaluate: bool = False) -> Iterator[TransactionRecord]:
+    """Yield one TransactionRecord per non-empty row, in sheet order.
+
+    Streams the sheet, recomputing Period and any formula without a
+    cached value (see the module docstring). evaluate=True recomputes the
+    formula columns with formula_eval instead, loading the whole sheet.
+    """
+    if evaluate:
+        from formula_eval import WorkbookEvaluator
+
+        with WorkbookEvaluator(path) as wb:
+            rows = wb.rows(sheet_name, TRANSACTION_COLUMNS, min_row=2)
+            yield from records_from_rows(rows, columns=TRANSACTION_COLUMNS)
+        return
+    with XlsxReader(path) as xl:
+        values = _FormulaValues(xl, path, sheet_name, TRANSACTION_COLUMNS)
+        try:
+            cells = xl.iter_rows(sheet_name, TRANSACTION_COLUMNS, min_row=2, formulas=True)
+            rows = (values.row(row_num, row) for row_num, row in enumerate(cells, 2))
+            yield from records_from_rows(rows, columns=TRANSACTION_COLUMNS)
+        finally:
+            values.close()
+
+
+def in_range(record: TransactionRecord, start: date, end: date) -> bool:
+    """True when the record has a date within [start, end] inclusive."""
+    return record.date is not None and start <= record.date <= end
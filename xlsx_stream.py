@@ -0,0 +1,377 @@
+"""
+Constant-memory xlsx reader that bypasses openpyxl's object model.
+
+Opens the workbook zip directly, indexes xl/sharedStrings.xml once, and
+stream-parses a worksheet part with ElementTree.iterparse, clearing each
+<row> as soon as it has been read. Only the requested columns are decoded,
+and each row comes out as a plain tuple of cached values, so memory stays
+flat however many rows the sheet has.
+
+Cell values follow openpyxl's data_only conventions: shared/inline strings
+as str, numbers as int or float, booleans as bool, error cells as their
+'#N/A'-style text, and numbers in a date-formatted cell as datetime.
+
+With formulas=True every cell comes back as a FormulaCell(formula, value)
+pair from the same pass: the formula text as openpyxl's formula mode shows
+it (shared formulas expanded per cell) and the cached value a data_only
+load would give, so one parse replaces loading the workbook twice.
+
+Usage:
+    with XlsxReader(WORKBOOK_PATH) as xl:
+        for row in xl.iter_rows('Transactions', columns='A:E,H,I', min_row=2):
+            ...
+        for (cell,) in xl.iter_rows('Transactions', columns='I', formulas=True):
+            print(cell.formula, cell.value)
+"""
+
+import posixpath
+import re
+import zipfile
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+from xml.etree.ElementTree import iterparse
+
+_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_PKG_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+_DIMENSION = f'{{{_MAIN_NS}}}dimension'
+_SHEET_DATA = f'{{{_MAIN_NS}}}sheetData'
+_ROW = f'{{{_MAIN_NS}}}row'
+_CELL = f'{{{_MAIN_NS}}}c'
+_VALUE = f'{{{_MAIN_NS}}}v'
+_FORMULA = f'{{{_MAIN_NS}}}f'
+_INLINE = f'{{{_MAIN_NS}}}is'
+_TEXT = f'{{{_MAIN_NS}}}t'
+_SI = f'{{{_MAIN_NS}}}si'
+_RPH = f'{{{_MAIN_NS}}}rPh'
+
+# Built-in number formats that are dates/times (ECMA-376 18.8.30)
+_BUILTIN_DATE_FORMATS = set(range(14, 23)) | set(range(45, 48))
+# Strip quoted text, escapes and [colour]/[$-locale] blocks before looking for d/m/y/h/s
+_FORMAT_NOISE_RE = re.compile(r'"[^"]*"|\\.|\[[^\]]*\]')
+
+_EPOCH_1900 = datetime(1899, 12, 30)
+_EPOCH_1904 = datetime(1904, 1, 1)
+
+Columns = Union[str, Sequence[Union[int, str]], None]
+
+
+class FormulaCell(NamedTuple):
+    formula: Optional[str]  # '=...' as entered, None for a plain value
+    value: object           # cached result (the data_only value)
+
+
+BLANK_FORMULA_CELL = FormulaCell(None, None)
+
+
+def column_index(letters: str) -> int:
+    """0-based index of a column letter reference ('A' -> 0, 'AA' -> 26)."""
+    index = 0
+    for ch in letters.upper():
+        index = index * 26 + (ord(ch) - 64)
+    return index - 1
+
+
+def parse_columns(columns: Columns) -> Optional[List[int]]:
+    """'A:E,H,I' / ['A', 'C'] / [0, 2] -> list of 0-based indices (None: all)."""
+    if columns is None:
+        return None
+    parts = columns.split(',') if isinstance(columns, str) else columns
+    indices: List[int] = []
+    for part in parts:
+        if isinstance(part, int):
+            indices.append(part)
+            continue
+        part = part.strip()
+        if ':' in part:
+            first, last = part.split(':')
+            indices.extend(range(column_index(first), column_index(last) + 1))
+        else:
+            indices.append(column_index(part))
+    return indices
+
+
+_COLUMN_CACHE: Dict[str, int] = {}
+
+
+def _ref_column(ref: str) -> int:
+    """Column index of a cell reference ('AB12' -> 27), memoised by letters."""
+    letters = ref.rstrip('0123456789')
+    col = _COLUMN_CACHE.get(letters)
+    if col is None:
+        col = _COLUMN_CACHE[letters] = column_index(letters)
+    return col
+
+
+def is_date_format(code: str) -> bool:
+    cleaned = _FORMAT_NOISE_RE.sub('', code).lower()
+    return any(ch in cleaned for ch in 'dmyhs') and 'general' not in cleaned
+
+
+class XlsxReader:
+    def __init__(self, path: str):
+        self.path = path
+        self._zip = zipfile.ZipFile(path)
+        self._shared: Optional[List[str]] = None
+        self._date_styles: Optional[frozenset] = None
+        self._sheets, self._epoch = self._read_workbook()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._zip.close()
+
+    @property
+    def sheetnames(self) -> List[str]:
+        return list(self._sheets)
+
+    # -- workbook metadata -------------------------------------------------
+
+    def _read_workbook(self) -> Tuple[Dict[str, str], datetime]:
+        targets = {}
+        with self._zip.open('xl/_rels/workbook.xml.rels') as f:
+            for _, elem in iterparse(f):
+                if elem.tag == f'{{{_PKG_REL_NS}}}Relationship':
+                    target = elem.get('Target')
+                    if target.startswith('/'):
+                        target = target[1:]
+                    else:
+                        target = posixpath.normpath(posixpath.join('xl', target))
+                    targets[elem.get('Id')] = target
+
+        sheets: Dict[str, str] = {}
+        epoch = _EPOCH_1900
+        with self._zip.open('xl/workbook.xml') as f:
+            for _, elem in iterparse(f):
+                if elem.tag == f'{{{_MAIN_NS}}}sheet':
+                    sheets[elem.get('name')] = targets[elem.get(f'{{{_REL_NS}}}id')]
+                elif elem.tag == f'{{{_MAIN_NS}}}workbookPr':
+                    if elem.get('date1904') in ('1', 'true'):
+                        epoch = _EPOCH_1904
+        return sheets, epoch
+
+    def shared_strings(self) -> List[str]:
+        """The shared string table, read once on first use."""
+        if self._shared is None:
+            strings: List[str] = []
+            if 'xl/sharedStrings.xml' in self._zip.namelist():
+                with self._zip.open('xl/sharedStrings.xml') as f:
+                    for _, elem in iterparse(f):
+                        if elem.tag == _SI:
+                            strings.append(_string_item(elem))
+                            elem.clear()
+            self._shared = strings
+        return self._shared
+
+    def date_styles(self) -> frozenset:
+        """Indices of cell formats (the 's' attribute) that display dates."""
+        if self._date_styles is None:
+            custom: Dict[int, str] = {}
+            styles = set()
+            if 'xl/styles.xml' in self._zip.namelist():
+                with self._zip.open('xl/styles.xml') as f:
+                    in_cell_xfs = False
+                    xf_index = 0
+                    for event, elem in iterparse(f, events=('start', 'end')):
+                        tag = elem.tag
+                        if tag == f'{{{_MAIN_NS}}}numFmt' and event == 'end':
+                            custom[int(elem.get('numFmtId'))] = elem.get('formatCode', '')
+                        elif tag == f'{{{_MAIN_NS}}}cellXfs':
+                            in_cell_xfs = event == 'start'
+                        elif tag == f'{{{_MAIN_NS}}}xf' and in_cell_xfs and event == 'start':
+                            fmt = int(elem.get('numFmtId', 0))
+                            if fmt in _BUILTIN_DATE_FORMATS or (fmt in custom and is_date_format(custom[fmt])):
+                                styles.add(xf_index)
+                            xf_index += 1
+            self._date_styles = frozenset(styles)
+        return self._date_styles
+
+    # -- cell decoding -----------------------------------------------------
+
+    def _from_serial(self, value):
+        # Same as openpyxl.utils.datetime.from_excel: millisecond rounding,
+        # time-only serials below 1, and the phantom 29 Feb 1900
+        day, fraction = divmod(value, 1)
+        diff = timedelta(milliseconds=round(fraction * 86400000))
+        if 0 <= value < 1 and diff.days == 0:
+            return (datetime.min + diff).time()
+        if 0 < value < 60 and self._epoch is _EPOCH_1900:
+            day += 1
+        return self._epoch + timedelta(days=day) + diff
+
+    def _decode(self, cell, shared: List[str], date_styles: frozenset):
+        t = cell.get('t', 'n')
+        if t == 'inlineStr':
+            inline = cell.find(_INLINE)
+            return None if inline is None else ''.join(x.text or '' for x in inline.iter(_TEXT))
+        v = cell.find(_VALUE)
+        if v is None or v.text is None:
+            return None
+        text = v.text
+        if t == 's':
+            return shared[int(text)]
+        if t == 'n':
+            if '.' in text or 'E' in text or 'e' in text:
+                number = float(text)
+            else:
+                number = int(text)
+            style = cell.get('s')
+            if style is not None and int(style) in date_styles:
+                return self._from_serial(number)
+            return number
+        if t == 'b':
+            return text == '1'
+        if t == 'd':
+            return datetime.fromisoformat(text.rstrip('Z'))
+        # 'str' (formula text result) and 'e' (error)
+        return text
+
+    # -- rows --------------------------------------------------------------
+
+    def _sheet_part(self, sheet_name: str) -> str:
+        try:
+            return self._sheets[sheet_name]
+        except KeyError:
+            raise KeyError(f'Worksheet {sheet_name} does not exist.') from None
+
+    def dimension(self, sheet_name: str) -> Optional[str]:
+        """The sheet's stored used range ('A1:I1200'), read from the part header only."""
+        with self._zip.open(self._sheet_part(sheet_name)) as f:
+            for _, elem in iterparse(f, events=('start',)):
+                if elem.tag == _DIMENSION:
+                    return elem.get('ref')
+                if elem.tag == _SHEET_DATA:
+                    return None
+        return None
+
+    def iter_cells(self, sheet_name: str, columns: Columns = None,
+                   min_row: int = 1, max_row: Optional[int] = None,
+                   formulas: bool = False) -> Iterator[Tuple[int, Dict[int, object]]]:
+        """Yield (row number, {column index: value}) for each stored row.
+
+        With formulas=True each value is a FormulaCell.
+        """
+        wanted = parse_columns(columns)
+        wanted_set = None if wanted is None else set(wanted)
+        shared = self.shared_strings()
+        date_styles = self.date_styles()
+        decode = self._decode
+        shared_formulas = _SharedFormulas()
+
+        with self._zip.open(self._sheet_part(sheet_name)) as f:
+            sheet_data = None
+            row_num = 0
+            for event, elem in iterparse(f, events=('start', 'end')):
+                if event == 'start':
+                    if elem.tag == _SHEET_DATA:
+                        sheet_data = elem
+                    continue
+                if elem.tag != _ROW:
+                    continue
+                r = elem.get('r')
+                row_num = int(r) if r is not None else row_num + 1
+                if max_row is not None and row_num > max_row:
+                    break
+                if row_num < min_row:
+                    if formulas:
+                        # Followers from min_row on may be written from a master up here
+                        for cell in elem:
+                            f_elem = cell.find(_FORMULA)
+                            if f_elem is not None:
+                                shared_formulas.register(f_elem, cell.get('r'))
+                    sheet_data.clear()
+                    continue
+
+                values: Dict[int, object] = {}
+                col = -1
+                for cell in elem:
+                    ref = cell.get('r')
+                    col = _ref_column(ref) if ref is not None else col + 1
+                    f_elem = cell.find(_FORMULA) if formulas else None
+                    if wanted_set is not None and col not in wanted_set:
+                        if f_elem is not None:
+                            # Shared-formula masters are kept even when their column
+                            # is not wanted: followers elsewhere are written from them
+                            shared_formulas.register(f_elem, ref)
+                        continue
+                    value = decode(cell, shared, date_styles)
+                    if formulas:
+                        formula = None if f_elem is None else shared_formulas.formula(f_elem, ref)
+                        value = FormulaCell(formula, value)
+                    values[col] = value
+                # The parser keeps appending rows to <sheetData>; drop the ones
+                # already read so memory stays flat
+                sheet_data.clear()
+                yield row_num, values
+
+    def iter_rows(self, sheet_name: str, columns: Columns = None,
+                  min_row: int = 1, max_row: Optional[int] = None,
+                  formulas: bool = False) -> Iterator[tuple]:
+        """Yield one tuple per row from min_row, like openpyxl's values_only rows.
+
+        With columns, tuples hold just those columns in the given order;
+        otherwise they run from column A to the row's last stored cell.
+        Rows missing from the XML come out as all-None tuples, so row
+        numbers can be recovered with enumerate(..., min_row).
+        """
+        wanted = parse_columns(columns)
+        blank = BLANK_FORMULA_CELL if formulas else None
+        expected = min_row
+        for row_num, values in self.iter_cells(sheet_name, wanted, min_row, max_row, formulas):
+            while expected < row_num:
+                yield tuple(blank for _ in (wanted or ()))
+                expected += 1
+            if wanted is not None:
+                yield tuple(values.get(c, blank) for c in wanted)
+            else:
+                width = max(values) + 1 if values else 0
+                yield tuple(values.get(c, blank) for c in range(width))
+            expected = row_num + 1
+
+
+def _string_item(si) -> str:
+    """Text of a shared-string <si>: plain <t>, or rich-text runs minus phonetics."""
+    return ''.join(t.text or '' for child in si if child.tag != _RPH for t in child.iter(_TEXT))
+
+
+class _SharedFormulas:
+    """Formula text per cell, expanding shared formulas like openpyxl does.
+
+    A shared formula is written once on its first cell (t="shared", ref,
+    si) and every other cell in the range carries only t="shared" si; their
+    text is the master's with relative references moved by the offset.
+    """
+
+    def __init__(self):
+        self._masters: Dict[str, Tuple[str, str]] = {}  # si -> (formula, origin cell)
+
+    def register(self, f_elem, ref: str):
+        """Record a master without expanding anything (for cells not read)."""
+        if f_elem.get('t') == 'shared' and f_elem.text is not None:
+            self._masters[f_elem.get('si')] = ('=' + f_elem.text, ref)
+
+    def formula(self, f_elem, ref: str) -> Optional[str]:
+        text = None if f_elem.text is None else '=' + f_elem.text
+        if f_elem.get('t') != 'shared':
+            return text
+        si = f_elem.get('si')
+        if text is not None:
+            self._masters[si] = (text, ref)
+            return text
+        if si not in self._masters:
+            return None
+        from openpyxl.formula.translate import Translator
+
+        master, origin = self._masters[si]
+        return Translator(master, origin).translate_formula(ref)
+
+
+def read_rows(path: str, sheet_name: str, columns: Columns = None, min_row: int = 1) -> List[tuple]:
+    """All rows of one sheet (convenience wrapper that closes the zip)."""
+    with XlsxReader(path) as xl:
+        return list(xl.iter_rows(sheet_name, columns, min_row))